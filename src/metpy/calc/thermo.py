@@ -10,7 +10,7 @@ import scipy.optimize as so
 import xarray as xr
 
 from .tools import (_greater_or_close, _less_or_close, _remove_nans, find_bounding_indices,
-                    find_intersections, first_derivative, get_layer)
+                    find_intersections, first_derivative, get_layer, make_take)
 from .. import constants as mpconsts
 from ..cbook import broadcast_indices
 from ..interpolate.one_dimension import interpolate_1d
@@ -224,12 +224,13 @@ def dry_lapse(pressure, temperature, reference_pressure=None, vertical_dim=0):
 
 
 @exporter.export
+@add_vertical_dim_from_xarray
 @preprocess_and_wrap(
     wrap_like='temperature',
     broadcast=('pressure', 'temperature', 'reference_pressure')
 )
 @check_units('[pressure]', '[temperature]', '[pressure]')
-def moist_lapse(pressure, temperature, reference_pressure=None):
+def moist_lapse(pressure, temperature, reference_pressure=None, vertical_dim=0):
     r"""Calculate the temperature at a level assuming liquid saturation processes.
 
     This function lifts a parcel starting at `temperature`. The starting pressure can
@@ -239,12 +240,19 @@ def moist_lapse(pressure, temperature, reference_pressure=None):
     Parameters
     ----------
     pressure : `pint.Quantity`
-        The atmospheric pressure level(s) of interest
+        The atmospheric pressure level(s) of interest. If multi-dimensional, this gives the
+        levels for each column of a grid, and a parcel is lifted within every column.
     temperature : `pint.Quantity`
-        The starting temperature
+        The starting temperature. For 1D `pressure`, this can be an array of temperatures
+        for which to lift parcels to the same levels. Otherwise, this gives the temperature
+        for each column, with the shape of `pressure` without the vertical dimension (or the
+        full shape of `pressure`, in which case the first level is used).
     reference_pressure : `pint.Quantity`, optional
-        The reference pressure. If not given, it defaults to the first element of the
-        pressure array.
+        The reference pressure, which may vary between columns like `temperature`. If not
+        given, it defaults to the first level of the pressure array.
+    vertical_dim : int, optional
+        The axis corresponding to vertical for multi-dimensional `pressure`, defaults to 0.
+        Automatically parsed from input if using `xarray.DataArray`.
 
     Returns
     -------
@@ -266,10 +274,27 @@ def moist_lapse(pressure, temperature, reference_pressure=None):
 
     This equation comes from [Bakhshaii2013]_.
 
-    Only reliably functions on 1D profiles (not higher-dimension vertical cross sections or
-    grids).
+    For 1D `pressure`, the equation is integrated with :func:`scipy.integrate.odeint`. For
+    grids, it is instead integrated in the logarithm of pressure using a fixed-step
+    fourth-order Runge-Kutta scheme, which steps the parcels in all columns at once.
 
     """
+    if pressure.ndim > 1:
+        vertical_dim = vertical_dim % pressure.ndim
+        first_level = make_take(pressure.ndim, vertical_dim)(0)
+        if reference_pressure is None:
+            reference_pressure = pressure[first_level]
+        elif np.ndim(reference_pressure) == pressure.ndim:
+            reference_pressure = reference_pressure[first_level]
+        if np.ndim(temperature) == pressure.ndim:
+            temperature = temperature[first_level]
+
+        ret_temperatures = _moist_lapse_columns(
+            np.moveaxis(pressure.m_as('hPa'), vertical_dim, 0), temperature.m_as('kelvin'),
+            reference_pressure.m_as('hPa'))
+        ret_temperatures = np.moveaxis(ret_temperatures, 0, vertical_dim)
+        return units.Quantity(ret_temperatures, 'kelvin').to(temperature.units)
+
     def dt(t, p):
         t = units.Quantity(t, temperature.units)
         p = units.Quantity(p, pressure.units)
@@ -316,6 +341,112 @@ def moist_lapse(pressure, temperature, reference_pressure=None):
     return units.Quantity(ret_temperatures.T.squeeze(), temperature.units)
 
 
+def _moist_lapse_columns(pressure, temperature, reference_pressure, max_step=0.02):
+    """Integrate moist pseudo-adiabats for many columns at once.
+
+    Works with plain arrays: `pressure` in hPa has its levels along the first axis, while
+    `temperature` in kelvin and `reference_pressure` in hPa give the starting point of the
+    parcel in each column. Returns the parcel temperature, in kelvin, at every level.
+    """
+    rd = mpconsts.Rd.m_as('J / (kg K)')
+    lv = mpconsts.Lv.m_as('J / kg')
+    cp_d = mpconsts.Cp_d.m_as('J / (kg K)')
+    epsilon = mpconsts.epsilon.m_as('dimensionless')
+    es_0c = sat_pressure_0c.m_as('hPa')
+
+    def dt_dlogp(t, log_p):
+        es = es_0c * np.exp(17.67 * (t - 273.15) / (t - 29.65))
+        rs = epsilon * es / (np.exp(log_p) - es)
+        return (rd * t + lv * rs) / (cp_d + lv * lv * rs * epsilon / (rd * t * t))
+
+    def integrate(t, log_p, log_p_end):
+        # Use the same number of steps for every column, enough to keep the largest
+        # step in log-pressure below max_step
+        span = np.abs(log_p_end - log_p)
+        span = span[np.isfinite(span)]
+        num_steps = int(np.ceil(span.max() / max_step)) if span.size else 0
+        if num_steps:
+            h = (log_p_end - log_p) / num_steps
+            for _ in range(num_steps):
+                k1 = dt_dlogp(t, log_p)
+                k2 = dt_dlogp(t + 0.5 * h * k1, log_p + 0.5 * h)
+                k3 = dt_dlogp(t + 0.5 * h * k2, log_p + 0.5 * h)
+                k4 = dt_dlogp(t + h * k3, log_p + h)
+                t = t + h * (k1 + 2 * k2 + 2 * k3 + k4) / 6
+                log_p = log_p + h
+        return t
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_pressure = np.log(pressure)
+        log_ref = np.log(reference_pressure)
+        shape = np.broadcast(log_pressure, log_ref, temperature).shape
+        log_pressure = np.broadcast_to(log_pressure, shape)
+        ret_temperatures = np.full(shape, np.nan)
+
+        # Integrate away from the reference pressure, first upward through the levels in
+        # order of decreasing pressure, then downward through those in increasing order
+        upward = np.arange(shape[0])
+        if np.nansum(log_pressure[0] - log_pressure[-1]) < 0:
+            upward = upward[::-1]
+        for levels, on_side in ((upward, np.less_equal), (upward[::-1], np.greater)):
+            t = np.broadcast_to(temperature, shape[1:])
+            log_p = np.broadcast_to(log_ref, shape[1:])
+            for level in levels:
+                active = on_side(log_pressure[level], log_ref)
+                log_p_end = np.where(active, log_pressure[level], log_p)
+                t = integrate(t, log_p, log_p_end)
+                log_p = log_p_end
+                ret_temperatures[level] = np.where(active, t, ret_temperatures[level])
+
+    return ret_temperatures
+
+
+def _as_columns(vertical_dim, *profiles):
+    """Arrange profiles on a grid as columns of plain arrays.
+
+    The profiles are broadcast against each other, with any 1D profile taken to lie along
+    `vertical_dim`. Returns them with levels along the first axis and all other dimensions
+    flattened into the second, along with the shape of the grid of columns.
+    """
+    ndim = max(np.ndim(prof) for prof in profiles)
+    vertical_dim = vertical_dim % ndim
+    vertical_shape = [-1 if dim == vertical_dim else 1 for dim in range(ndim)]
+    profiles = np.broadcast_arrays(*(np.reshape(prof, vertical_shape) if np.ndim(prof) == 1
+                                     else prof for prof in profiles))
+    shape = profiles[0].shape[:vertical_dim] + profiles[0].shape[vertical_dim + 1:]
+    columns = [np.moveaxis(prof, vertical_dim, 0).reshape(prof.shape[vertical_dim], -1)
+               for prof in profiles]
+    return columns, shape
+
+
+def _compress_levels(*profiles):
+    """Move the levels of each column where any of the profiles is missing to the end.
+
+    This is the column-wise equivalent of `_remove_nans`, leaving the missing levels as NaN
+    at the end of each column.
+    """
+    missing = np.zeros(np.shape(profiles[0]), dtype=bool)
+    for prof in profiles:
+        missing |= np.isnan(prof)
+    order = np.argsort(missing, axis=0, kind='stable')
+    missing = np.take_along_axis(missing, order, axis=0)
+    return [np.where(missing, np.nan, np.take_along_axis(prof, order, axis=0))
+            for prof in profiles]
+
+
+def _by_column_chunks(func, *columns, chunk_size=65536):
+    """Apply a calculation to blocks of columns at a time.
+
+    This bounds the memory used for intermediate arrays when working with large grids. The
+    columns are split along their last axis, and the results of `func` for each block are
+    joined back together along theirs.
+    """
+    num_columns = columns[0].shape[-1]
+    results = [func(*(col[..., start:start + chunk_size] for col in columns))
+               for start in range(0, max(num_columns, 1), chunk_size)]
+    return [np.concatenate(parts, axis=-1) for parts in zip(*results)]
+
+
 @exporter.export
 @preprocess_and_wrap()
 @check_units('[pressure]', '[temperature]', '[temperature]')
@@ -384,11 +515,27 @@ def lcl(pressure, temperature, dewpoint, max_iters=50, eps=1e-5):
     return lcl_p, globals()['dewpoint'](vapor_pressure(lcl_p, w)).to(temperature.units)
 
 
+def _lcl_columns(pressure, temperature, dewpoint):
+    """Calculate the LCL for many parcels given as plain arrays in hPa and kelvin.
+
+    Parcels with missing values give a missing LCL, rather than keeping the others from
+    converging.
+    """
+    valid = ~(np.isnan(pressure) | np.isnan(temperature) | np.isnan(dewpoint))
+    lcl_pressure, lcl_temperature = lcl(
+        units.Quantity(np.where(valid, pressure, 1000.), 'hPa'),
+        units.Quantity(np.where(valid, temperature, 273.15), 'kelvin'),
+        units.Quantity(np.where(valid, dewpoint, 273.15), 'kelvin'))
+    return (np.where(valid, lcl_pressure.m_as('hPa'), np.nan),
+            np.where(valid, lcl_temperature.m_as('kelvin'), np.nan))
+
+
 @exporter.export
+@add_vertical_dim_from_xarray
 @preprocess_and_wrap()
 @check_units('[pressure]', '[temperature]', '[temperature]', '[temperature]')
 def lfc(pressure, temperature, dewpoint, parcel_temperature_profile=None, dewpoint_start=None,
-        which='top'):
+        which='top', vertical_dim=0):
     r"""Calculate the level of free convection (LFC).
 
     This works by finding the first intersection of the ideal parcel path and
@@ -417,6 +564,9 @@ def lfc(pressure, temperature, dewpoint, parcel_temperature_profile=None, dewpoi
         'bottom' returns the highest-pressure LFC.
         'wide' returns the LFC whose corresponding EL is farthest away.
         'most_cape' returns the LFC that results in the most CAPE in the profile.
+    vertical_dim : int, optional
+        The axis corresponding to vertical for a grid of soundings, defaults to 0.
+        Automatically parsed from input if using `xarray.DataArray`.
 
     Returns
     -------
@@ -431,11 +581,22 @@ def lfc(pressure, temperature, dewpoint, parcel_temperature_profile=None, dewpoi
 
     Notes
     -----
-    Only functions on 1D profiles (not higher-dimension vertical cross sections or grids).
+    Given multi-dimensional `pressure` or `temperature`, this calculates the LFC for each
+    sounding along `vertical_dim` of a grid, ignoring missing values within each one. A 1D
+    `pressure` is taken to give the levels of every sounding, and `dewpoint_start` can vary
+    between soundings. Only 'top' and 'bottom' are supported for `which` on grids.
+
     Since this function returns scalar values when given a profile, this will return Pint
     Quantities even when given xarray DataArray profiles.
 
     """
+    if pressure.ndim > 1 or temperature.ndim > 1:
+        lfc_pressure, lfc_temperature = _parcel_calc_on_grid(
+            _lfc_columns, pressure, temperature, dewpoint, parcel_temperature_profile,
+            dewpoint_start, vertical_dim=vertical_dim, which=which)
+        return (units.Quantity(lfc_pressure, 'hPa').to(pressure.units),
+                units.Quantity(lfc_temperature, 'kelvin').to(temperature.units))
+
     pressure, temperature, dewpoint = _remove_nans(pressure, temperature, dewpoint)
     # Default to surface parcel if no profile or starting pressure level is given
     if parcel_temperature_profile is None:
@@ -566,9 +727,11 @@ def _most_cape_option(intersect_type, p_list, t_list, pressure, temperature, dew
 
 
 @exporter.export
+@add_vertical_dim_from_xarray
 @preprocess_and_wrap()
 @check_units('[pressure]', '[temperature]', '[temperature]', '[temperature]')
-def el(pressure, temperature, dewpoint, parcel_temperature_profile=None, which='top'):
+def el(pressure, temperature, dewpoint, parcel_temperature_profile=None, which='top',
+       vertical_dim=0):
     r"""Calculate the equilibrium level.
 
     This works by finding the last intersection of the ideal parcel path and
@@ -592,6 +755,9 @@ def el(pressure, temperature, dewpoint, parcel_temperature_profile=None, which='
         'bottom' returns the highest-pressure EL.
         'wide' returns the EL whose corresponding LFC is farthest away.
         'most_cape' returns the EL that results in the most CAPE in the profile.
+    vertical_dim : int, optional
+        The axis corresponding to vertical for a grid of soundings, defaults to 0.
+        Automatically parsed from input if using `xarray.DataArray`.
 
     Returns
     -------
@@ -606,11 +772,22 @@ def el(pressure, temperature, dewpoint, parcel_temperature_profile=None, which='
 
     Notes
     -----
-    Only functions on 1D profiles (not higher-dimension vertical cross sections or grids).
+    Given multi-dimensional `pressure` or `temperature`, this calculates the EL for each
+    sounding along `vertical_dim` of a grid, ignoring missing values within each one. A 1D
+    `pressure` is taken to give the levels of every sounding. Only 'top' and 'bottom' are
+    supported for `which` on grids.
+
     Since this function returns scalar values when given a profile, this will return Pint
     Quantities even when given xarray DataArray profiles.
 
     """
+    if pressure.ndim > 1 or temperature.ndim > 1:
+        el_pressure, el_temperature = _parcel_calc_on_grid(
+            _el_columns, pressure, temperature, dewpoint, parcel_temperature_profile,
+            vertical_dim=vertical_dim, which=which)
+        return (units.Quantity(el_pressure, 'hPa').to(pressure.units),
+                units.Quantity(el_temperature, 'kelvin').to(temperature.units))
+
     pressure, temperature, dewpoint = _remove_nans(pressure, temperature, dewpoint)
     # Default to surface parcel if no profile or starting pressure level is given
     if parcel_temperature_profile is None:
@@ -637,9 +814,10 @@ def el(pressure, temperature, dewpoint, parcel_temperature_profile=None, which='
 
 
 @exporter.export
+@add_vertical_dim_from_xarray
 @preprocess_and_wrap(wrap_like='pressure')
 @check_units('[pressure]', '[temperature]', '[temperature]')
-def parcel_profile(pressure, temperature, dewpoint):
+def parcel_profile(pressure, temperature, dewpoint, vertical_dim=0):
     r"""Calculate the profile a parcel takes through the atmosphere.
 
     The parcel starts at `temperature`, and `dewpoint`, lifted up
@@ -650,11 +828,17 @@ def parcel_profile(pressure, temperature, dewpoint):
     ----------
     pressure : `pint.Quantity`
         The atmospheric pressure level(s) of interest. This array must be from
-        high to low pressure.
+        high to low pressure. If multi-dimensional, this gives the levels for each column
+        of a grid, and a parcel is lifted within every column.
     temperature : `pint.Quantity`
-        The starting temperature
+        The starting temperature. For a grid, this gives the temperature for each column,
+        either with the shape of `pressure` without the vertical dimension, or as a full
+        profile.
     dewpoint : `pint.Quantity`
-        The starting dewpoint
+        The starting dewpoint, given like `temperature`
+    vertical_dim : int, optional
+        The axis corresponding to vertical for multi-dimensional `pressure`, defaults to 0.
+        Automatically parsed from input if using `xarray.DataArray`.
 
     Returns
     -------
@@ -667,9 +851,33 @@ def parcel_profile(pressure, temperature, dewpoint):
 
     Notes
     -----
-    Only functions on 1D profiles (not higher-dimension vertical cross sections or grids).
+    On a grid, the parcel in each column starts from the first level where the pressure,
+    temperature and dewpoint are all present. Levels below that, or without a pressure,
+    give NaN.
 
     """
+    if pressure.ndim > 1:
+        vertical_dim = vertical_dim % pressure.ndim
+        profiles = [prof if np.ndim(prof) == pressure.ndim
+                    else np.expand_dims(prof, vertical_dim)
+                    for prof in (pressure.m_as('hPa'), temperature.m_as('kelvin'),
+                                 dewpoint.m_as('kelvin'))]
+        columns, shape = _as_columns(vertical_dim, *profiles)
+
+        def calc(pressure, temperature, dewpoint):
+            start = np.argmax(~(np.isnan(pressure) | np.isnan(temperature)
+                                | np.isnan(dewpoint)), axis=0)
+            pressure_from_start = np.where(
+                np.arange(pressure.shape[0])[:, np.newaxis] >= start, pressure, np.nan)
+            start_values = [np.take_along_axis(prof, start[np.newaxis], axis=0)[0]
+                            for prof in (temperature, dewpoint, pressure)]
+            profile, _, _ = _parcel_profile_columns(pressure_from_start, *start_values)
+            return profile,
+
+        profile, = _by_column_chunks(calc, *columns)
+        profile = np.moveaxis(profile.reshape(profile.shape[:1] + shape), 0, vertical_dim)
+        return units.Quantity(profile, 'kelvin').to(temperature.units)
+
     _, _, _, t_l, _, t_u = _parcel_profile_helper(pressure, temperature, dewpoint)
     return concatenate((t_l, t_u))
 
@@ -840,6 +1048,63 @@ def _insert_lcl_level(pressure, temperature, lcl_pressure):
     return temperature.units * np.insert(temperature.m, loc, interp_temp.m)
 
 
+def _parcel_profile_columns(pressure, temperature, dewpoint, start_pressure):
+    """Calculate parcel profiles for many columns at once.
+
+    Works with plain arrays: `pressure` in hPa has its levels along the first axis, and the
+    parcel in each column starts from `temperature` and `dewpoint` in kelvin at
+    `start_pressure`. Returns the parcel temperatures, along with the LCL pressure and
+    temperature.
+    """
+    lcl_pressure, lcl_temperature = _lcl_columns(start_pressure, temperature, dewpoint)
+    kappa = mpconsts.kappa.m_as('dimensionless')
+    with np.errstate(invalid='ignore'):
+        dry = temperature * (pressure / start_pressure)**kappa
+        moist = _moist_lapse_columns(np.where(pressure < lcl_pressure, pressure, np.nan),
+                                     temperature * (lcl_pressure / start_pressure)**kappa,
+                                     lcl_pressure)
+        profile = np.where(pressure >= lcl_pressure, dry, moist)
+    return profile, lcl_pressure, lcl_temperature
+
+
+def _parcel_profile_with_lcl_columns(pressure, temperature, dewpoint):
+    """Calculate surface-based parcel profiles, including the LCL, for many columns at once.
+
+    The column-wise equivalent of `parcel_profile_with_lcl`, working with plain arrays in hPa
+    and kelvin with levels along the first axis, in order of decreasing pressure. Returns the
+    pressure, temperature, dewpoint and parcel temperature with a level added for the LCL.
+    """
+    profile, lcl_pressure, lcl_temperature = _parcel_profile_columns(
+        pressure, temperature[0], dewpoint[0], pressure[0])
+
+    # Find where the LCL goes among the levels, and which old level fills each new one
+    num_levels = pressure.shape[0]
+    lcl_index = np.sum(pressure >= lcl_pressure, axis=0)
+    new_levels = np.arange(num_levels + 1)[:, np.newaxis]
+    source = np.minimum(new_levels - (new_levels > lcl_index), num_levels - 1)
+    at_lcl = new_levels == lcl_index
+
+    # Interpolate the environment linearly in pressure to the LCL, as _insert_lcl_level does
+    below = np.maximum(lcl_index - 1, 0)[np.newaxis]
+    above = np.minimum(lcl_index, num_levels - 1)[np.newaxis]
+    pressure_below = np.take_along_axis(pressure, below, axis=0)[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = ((lcl_pressure - pressure_below)
+                  / (np.take_along_axis(pressure, above, axis=0)[0] - pressure_below))
+    weight = np.where((lcl_index > 0) & (lcl_index < num_levels), weight, np.nan)
+
+    def interpolate(values):
+        values_below = np.take_along_axis(values, below, axis=0)[0]
+        return values_below + weight * (np.take_along_axis(values, above, axis=0)[0]
+                                        - values_below)
+
+    def insert(values, lcl_values):
+        return np.where(at_lcl, lcl_values, np.take_along_axis(values, source, axis=0))
+
+    return (insert(pressure, lcl_pressure), insert(temperature, interpolate(temperature)),
+            insert(dewpoint, interpolate(dewpoint)), insert(profile, lcl_temperature))
+
+
 @exporter.export
 @preprocess_and_wrap(wrap_like='mixing_ratio', broadcast=('pressure', 'mixing_ratio'))
 @check_units('[pressure]', '[dimensionless]')
@@ -1583,10 +1848,11 @@ def relative_humidity_from_specific_humidity(pressure, temperature, specific_hum
 
 
 @exporter.export
+@add_vertical_dim_from_xarray
 @preprocess_and_wrap()
 @check_units('[pressure]', '[temperature]', '[temperature]', '[temperature]')
 def cape_cin(pressure, temperature, dewpoint, parcel_profile, which_lfc='bottom',
-             which_el='top'):
+             which_el='top', vertical_dim=0):
     r"""Calculate CAPE and CIN.
 
     Calculate the convective available potential energy (CAPE) and convective inhibition (CIN)
@@ -1611,6 +1877,9 @@ def cape_cin(pressure, temperature, dewpoint, parcel_profile, which_lfc='bottom'
     which_el : str
         Choose which EL to integrate to. Valid options are 'top', 'bottom', 'wide',
         and 'most_cape'. Default is 'top'.
+    vertical_dim : int, optional
+        The axis corresponding to vertical for a grid of soundings, defaults to 0.
+        Automatically parsed from input if using `xarray.DataArray`.
 
     Returns
     -------
@@ -1639,7 +1908,11 @@ def cape_cin(pressure, temperature, dewpoint, parcel_profile, which_lfc='bottom'
     * :math:`T_{env}` Environment temperature
     * :math:`p` Atmospheric pressure
 
-    Only functions on 1D profiles (not higher-dimension vertical cross sections or grids).
+    Given multi-dimensional `pressure` or `temperature`, this calculates CAPE and CIN for each
+    sounding along `vertical_dim` of a grid, working on all soundings at once and ignoring
+    missing values within each one. A 1D `pressure` is taken to give the levels of every
+    sounding. Only 'top' and 'bottom' are supported for `which_lfc` and `which_el` on grids.
+
     Since this function returns scalar values when given a profile, this will return Pint
     Quantities even when given xarray DataArray profiles.
 
@@ -1648,6 +1921,12 @@ def cape_cin(pressure, temperature, dewpoint, parcel_profile, which_lfc='bottom'
     lfc, el
 
     """
+    if pressure.ndim > 1 or temperature.ndim > 1:
+        cape, cin = _parcel_calc_on_grid(_cape_cin_columns, pressure, temperature, dewpoint,
+                                         parcel_profile, vertical_dim=vertical_dim,
+                                         which_lfc=which_lfc, which_el=which_el)
+        return units.Quantity(cape, 'J/kg'), units.Quantity(cin, 'J/kg')
+
     pressure, temperature, dewpoint, parcel_profile = _remove_nans(pressure, temperature,
                                                                    dewpoint, parcel_profile)
     # Calculate LFC limit of integration
@@ -1736,6 +2015,193 @@ def _find_append_zero_crossings(x, y):
     return x, y
 
 
+def _column_intersections(pressure, a, b, first_interval=0):
+    """Find where two profiles cross between each pair of adjacent levels in many columns.
+
+    The column-wise equivalent of `find_intersections` with ``log_x=True``, working with
+    plain arrays with levels along the first axis. Crossings are only looked for from the
+    pair of levels starting at `first_interval` on, which can vary between columns. Returns,
+    for each pair of levels, the pressure and value of `a` at the crossing, the sign of
+    ``a - b`` at the upper level, and whether the profiles cross there.
+    """
+    diff = a - b
+    sign = np.sign(diff)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_p = np.log(pressure)
+        x = (diff[1:] * log_p[:-1] - diff[:-1] * log_p[1:]) / (diff[1:] - diff[:-1])
+        y = (x - log_p[:-1]) / (log_p[1:] - log_p[:-1]) * (a[1:] - a[:-1]) + a[:-1]
+        x = np.exp(x)
+
+    found = (sign[:-1] != sign[1:]) & ~np.isnan(diff[:-1]) & ~np.isnan(diff[1:])
+    found &= np.arange(found.shape[0])[:, np.newaxis] >= first_interval
+
+    # Of two crossings found at the same point, only keep the second
+    found[:-1] &= ~(found[1:] & (x[:-1] == x[1:]))
+    return x, y, sign[1:], found
+
+
+def _pick_crossing(x, y, found, which):
+    """Pick the bottom or top crossing found in each column.
+
+    Returns the pressure and value at the crossing, and whether any crossing was found.
+    """
+    if which == 'bottom':
+        index = np.argmax(found, axis=0)
+    else:
+        index = found.shape[0] - 1 - np.argmax(found[::-1], axis=0)
+    index = index[np.newaxis]
+    return (np.take_along_axis(x, index, axis=0)[0], np.take_along_axis(y, index, axis=0)[0],
+            np.any(found, axis=0))
+
+
+def _lfc_columns(pressure, temperature, dewpoint, parcel_profile, dewpoint_start=None,
+                 which='top'):
+    """Calculate the LFC for many columns at once.
+
+    The column-wise equivalent of `lfc`, working with plain arrays in hPa and kelvin with
+    levels along the first axis, in order of decreasing pressure and with any missing
+    levels at the end.
+    """
+    if dewpoint_start is None:
+        dewpoint_start = dewpoint[0]
+    lcl_pressure, lcl_temperature = _lcl_columns(pressure[0], parcel_profile[0],
+                                                 dewpoint_start)
+
+    # Skip the first level when the parcel starts at the environmental temperature
+    first = np.isclose(parcel_profile[0], temperature[0]).astype(int)
+    x, y, sign, found = _column_intersections(pressure, parcel_profile, temperature, first)
+    increasing = found & (sign > 0)
+    with np.errstate(invalid='ignore'):
+        lfc_pressure, lfc_temperature, above_lcl = _pick_crossing(
+            x, y, increasing & (x < lcl_pressure), which)
+
+    # Otherwise, the LFC is at the LCL if there is any positive area above the LCL or, when
+    # the parcel only becomes warmer below the LCL, if it does not become cooler again there
+    x, _, sign, found = _column_intersections(pressure, parcel_profile, temperature, 1)
+    decreasing = found & (sign < 0)
+    with np.errstate(invalid='ignore'):
+        positive = ~_less_or_close(parcel_profile, temperature) & (pressure < lcl_pressure)
+        cooler_below_lcl = np.any(decreasing, axis=0) & np.all(~decreasing
+                                                               | (x > lcl_pressure), axis=0)
+    at_lcl = np.where(np.any(increasing, axis=0), ~cooler_below_lcl, np.any(positive, axis=0))
+
+    return (np.where(above_lcl, lfc_pressure, np.where(at_lcl, lcl_pressure, np.nan)),
+            np.where(above_lcl, lfc_temperature, np.where(at_lcl, lcl_temperature, np.nan)))
+
+
+def _el_columns(pressure, temperature, dewpoint, parcel_profile, which='top'):
+    """Calculate the EL for many columns at once.
+
+    The column-wise equivalent of `el`, working with plain arrays in hPa and kelvin with
+    levels along the first axis, in order of decreasing pressure and with any missing
+    levels at the end.
+    """
+    lcl_pressure, _ = _lcl_columns(pressure[0], temperature[0], dewpoint[0])
+    x, y, sign, found = _column_intersections(pressure, parcel_profile, temperature, 1)
+    decreasing = found & (sign < 0)
+    with np.errstate(invalid='ignore'):
+        el_pressure, el_temperature, _ = _pick_crossing(
+            x, y, decreasing & (x < lcl_pressure), which)
+        top_pressure, _, any_decreasing = _pick_crossing(x, y, decreasing, 'top')
+
+        # There is no EL if the top of the sounding is warmer than the environment, or if the
+        # parcel last becomes cooler than the environment below the LCL
+        top = np.maximum(np.sum(~np.isnan(pressure), axis=0) - 1, 0)[np.newaxis]
+        warm_top = (np.take_along_axis(parcel_profile, top, axis=0)[0]
+                    > np.take_along_axis(temperature, top, axis=0)[0])
+        has_el = any_decreasing & (top_pressure < lcl_pressure) & ~warm_top
+
+    return (np.where(has_el, el_pressure, np.nan), np.where(has_el, el_temperature, np.nan))
+
+
+def _cape_cin_columns(pressure, temperature, dewpoint, parcel_profile, which_lfc='bottom',
+                      which_el='top'):
+    """Calculate CAPE and CIN for many columns at once.
+
+    The column-wise equivalent of `cape_cin`, working with plain arrays in hPa and kelvin with
+    levels along the first axis, in order of decreasing pressure and with any missing
+    levels at the end. Columns with fewer than two levels give NaN.
+    """
+    lfc_pressure, _ = _lfc_columns(pressure, temperature, dewpoint, parcel_profile,
+                                   which=which_lfc)
+    el_pressure, _ = _el_columns(pressure, temperature, dewpoint, parcel_profile,
+                                 which=which_el)
+
+    # Without an EL, integrate to the top of the sounding
+    top = np.maximum(np.sum(~np.isnan(pressure), axis=0) - 1, 0)[np.newaxis]
+    el_pressure = np.where(np.isnan(el_pressure),
+                           np.take_along_axis(pressure, top, axis=0)[0], el_pressure)
+
+    # Interleave the levels with the zero crossings of the difference between the parcel and
+    # environment, then drop points too close to the one below, as in
+    # _find_append_zero_crossings
+    diff = parcel_profile - temperature
+    cross_pressure, cross_diff, _, found = _column_intersections(pressure, diff,
+                                                                 np.zeros_like(diff), 1)
+    points_pressure = np.empty((2 * pressure.shape[0] - 1,) + pressure.shape[1:])
+    points_pressure[::2] = pressure
+    points_pressure[1::2] = np.where(found, cross_pressure, np.nan)
+    points_diff = np.empty_like(points_pressure)
+    points_diff[::2] = diff
+    points_diff[1::2] = cross_diff
+    points_pressure, points_diff = _compress_levels(points_pressure, points_diff)
+    with np.errstate(invalid='ignore'):
+        too_close = np.zeros(points_pressure.shape, dtype=bool)
+        too_close[1:] = points_pressure[:-1] - points_pressure[1:] <= 1e-6
+    points_pressure, points_diff = _compress_levels(
+        np.where(too_close, np.nan, points_pressure), points_diff)
+
+    rd = mpconsts.Rd.m_as('J / (kg K)')
+    log_pressure = np.log(points_pressure)
+
+    def integrate(mask):
+        # Trapezoidal rule in log-pressure between consecutive points within the layer
+        area = ((log_pressure[:-1] - log_pressure[1:])
+                * (points_diff[:-1] + points_diff[1:]) / 2)
+        return rd * np.sum(np.where(mask[:-1] & mask[1:], area, 0), axis=0)
+
+    with np.errstate(invalid='ignore'):
+        cape = integrate(_less_or_close(points_pressure, lfc_pressure)
+                         & _greater_or_close(points_pressure, el_pressure))
+        cin = np.minimum(integrate(_greater_or_close(points_pressure, lfc_pressure)), 0)
+
+    # No LFC gives no CAPE or CIN
+    valid = ~np.isnan(pressure[1])
+    no_lfc = np.isnan(lfc_pressure)
+    return (np.where(valid, np.where(no_lfc, 0, cape), np.nan),
+            np.where(valid, np.where(no_lfc, 0, cin), np.nan))
+
+
+def _parcel_calc_on_grid(func, pressure, temperature, dewpoint, parcel_profile=None,
+                         dewpoint_start=None, vertical_dim=0, **kwargs):
+    """Apply a column-wise parcel calculation to a grid of soundings.
+
+    Without `parcel_profile`, the surface-based parcel profile is used, with the LCL added to
+    the levels as `parcel_profile_with_lcl` does. Returns the results of `func`, which give a
+    value for each column, shaped like the grid of columns.
+    """
+    for option in ('which', 'which_lfc', 'which_el'):
+        if kwargs.get(option, 'top') not in ('top', 'bottom'):
+            raise ValueError(f'Invalid option for "{option}". Valid options for grids are '
+                             '"top" and "bottom".')
+
+    profiles = [pressure.m_as('hPa'), temperature.m_as('kelvin'), dewpoint.m_as('kelvin')]
+    if parcel_profile is not None:
+        profiles.append(parcel_profile.m_as('kelvin'))
+    num_profiles = len(profiles)
+    columns, shape = _as_columns(vertical_dim, *profiles)
+    if dewpoint_start is not None:
+        columns.append(np.broadcast_to(dewpoint_start.m_as('kelvin'), shape).reshape(-1))
+
+    def calc(*columns):
+        profiles = _compress_levels(*columns[:num_profiles])
+        if parcel_profile is None:
+            profiles = _compress_levels(*_parcel_profile_with_lcl_columns(*profiles))
+        return func(*profiles, *columns[num_profiles:], **kwargs)
+
+    return [result.reshape(shape) for result in _by_column_chunks(calc, *columns)]
+
+
 @exporter.export
 @preprocess_and_wrap()
 @check_units('[pressure]', '[temperature]', '[temperature]')
@@ -2053,9 +2519,10 @@ def isentropic_interpolation_as_dataset(
 
 
 @exporter.export
+@add_vertical_dim_from_xarray
 @preprocess_and_wrap()
 @check_units('[pressure]', '[temperature]', '[temperature]')
-def surface_based_cape_cin(pressure, temperature, dewpoint):
+def surface_based_cape_cin(pressure, temperature, dewpoint, vertical_dim=0):
     r"""Calculate surface-based CAPE and CIN.
 
     Calculate the convective available potential energy (CAPE) and convective inhibition (CIN)
@@ -2073,6 +2540,9 @@ def surface_based_cape_cin(pressure, temperature, dewpoint):
         Temperature profile corresponding to the `pressure` profile.
     dewpoint : `pint.Quantity`
         Dewpoint profile corresponding to the `pressure` profile.
+    vertical_dim : int, optional
+        The axis corresponding to vertical for a grid of soundings, defaults to 0.
+        Automatically parsed from input if using `xarray.DataArray`.
 
     Returns
     -------
@@ -2087,11 +2557,19 @@ def surface_based_cape_cin(pressure, temperature, dewpoint):
 
     Notes
     -----
-    Only functions on 1D profiles (not higher-dimension vertical cross sections or grids).
+    Given multi-dimensional `pressure` or `temperature`, this calculates CAPE and CIN for each
+    sounding along `vertical_dim` of a grid, with the parcel starting from the lowest level
+    with data in each one.
+
     Since this function returns scalar values when given a profile, this will return Pint
     Quantities even when given xarray DataArray profiles.
 
     """
+    if pressure.ndim > 1 or temperature.ndim > 1:
+        cape, cin = _parcel_calc_on_grid(_cape_cin_columns, pressure, temperature, dewpoint,
+                                         vertical_dim=vertical_dim)
+        return units.Quantity(cape, 'J/kg'), units.Quantity(cin, 'J/kg')
+
     pressure, temperature, dewpoint = _remove_nans(pressure, temperature, dewpoint)
     p, t, td, profile = parcel_profile_with_lcl(pressure, temperature, dewpoint)
     return cape_cin(p, t, td, profile)
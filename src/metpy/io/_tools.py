@@ -6,9 +6,12 @@
 import bz2
 from collections import namedtuple
 import gzip
+import io
 from io import BytesIO
 import logging
-from struct import Struct
+import mmap
+import re
+from struct import calcsize, Struct
 import zlib
 
 import numpy as np
@@ -74,6 +77,9 @@ class NamedStruct(Struct):
             elif not i[0]:  # Skip items with no name
                 conv_off += 1
         self._tuple = namedtuple(tuple_name, ' '.join(n for n in names if n))
+        self._info = info
+        self._prefmt = prefmt
+        self._dtype = None
         super().__init__(prefmt + ''.join(f for f in fmts if f))
 
     def _create(self, items):
@@ -106,6 +112,112 @@ class NamedStruct(Struct):
         t = self.make_tuple(**kwargs)
         return super().pack(*t)
 
+    @property
+    def dtype(self):
+        """Get a NumPy structured dtype equivalent to the structure.
+
+        Only the fields with names are included in the dtype, at the offsets given by the
+        structure, with the same total size.
+        """
+        if self._dtype is None:
+            self._dtype = _struct_dtype(self._info, self._prefmt, self.size)
+        return self._dtype
+
+    def unpack_array(self, buff, count=-1, offset=0):
+        """Unpack consecutive records from a buffer all at once.
+
+        Returns a namedtuple with an array for each field, with the converters applied to
+        each of the arrays.
+        """
+        return self.convert_array(np.frombuffer(buff, dtype=self.dtype, count=count,
+                                                offset=offset))
+
+    def convert_array(self, records, names=None):
+        """Convert an array of records with `dtype` into a namedtuple of arrays.
+
+        If `names` is given, only those fields are converted, with the rest left as `None`.
+        """
+        columns = []
+        for ind, name in enumerate(self._tuple._fields):
+            selected = name in records.dtype.names and (names is None or name in names)
+            col = records[name] if selected else None
+            if col is not None and ind in self.converters:
+                col = convert_array(self.converters[ind], col)
+            columns.append(col)
+        return self.make_tuple(*columns)
+
+
+_struct_codes = re.compile(r'(\d*)([a-zA-Z?])')
+
+
+def _struct_dtype(info, prefmt, size):
+    """Create a structured dtype for the named fields of a structure specification."""
+    order = {'>': '>', '!': '>', '<': '<'}.get(prefmt[:1], '=')
+    names, formats, offsets = [], [], []
+    fmt = prefmt
+    for name, field_fmt, *_ in info:
+        if not field_fmt:
+            continue
+
+        if name:
+            # Offset from the size of what precedes, aligned (if native) for this field
+            count, code = _struct_codes.fullmatch(field_fmt).groups()
+            offsets.append(calcsize(fmt + '0' + code))
+            if code in 'sp':
+                formats.append(f'S{count or 1}')
+            elif count and count != '1':
+                raise ValueError(f'Unable to convert format {field_fmt} to a dtype.')
+            elif code == '?':
+                formats.append(np.bool_)
+            elif code in 'efd':
+                formats.append(f'{order}f{calcsize(prefmt + code)}')
+            elif code == 'c':
+                formats.append('S1')
+            else:
+                kind = 'u' if code.isupper() else 'i'
+                formats.append(f'{order}{kind}{calcsize(prefmt + code)}')
+            names.append(name)
+        fmt += field_fmt
+
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets,
+                     'itemsize': size})
+
+
+def vectorized(func):
+    """Mark a converter function as working directly on arrays of values."""
+    func.vectorized = True
+    return func
+
+
+def convert_array(converter, values):
+    """Apply a converter to an array of values.
+
+    Converters marked with `vectorized` are called with the whole array. Others (e.g.
+    `Enum`, `Bits`, `BitField`, or functions like `version`) map each value to a Python
+    object, so the result is an object array. These are only called once for each distinct
+    value, since the fields using them typically take only a few values, leaving a cost of
+    sorting the values to find those that are distinct. Any lists returned are copied for
+    each value, so that they are not shared between elements.
+    """
+    if getattr(converter, 'vectorized', False):
+        return converter(values)
+
+    distinct, inverse = np.unique(values, return_inverse=True)
+    items = distinct.tolist()
+    if values.dtype.kind == 'S':
+        # NumPy drops trailing nulls from byte strings, so restore them to match Struct
+        items = [item.ljust(values.dtype.itemsize, b'\x00') for item in items]
+
+    converted = np.empty(len(items), dtype=object)
+    for ind, item in enumerate(items):
+        converted[ind] = converter(item)
+    ret = converted[inverse]
+
+    is_list = np.array([isinstance(item, list) for item in converted], dtype=bool)
+    for ind in np.flatnonzero(is_list[inverse]):
+        ret[ind] = list(ret[ind])
+    return ret
+
 
 # This works around times when we have more than 255 items and can't use
 # NamedStruct. This is a CPython limit for arguments.
@@ -198,18 +310,58 @@ class Array:
 
 
 class IOBuffer:
-    """Holds bytes from a buffer to simplify parsing and random access."""
+    """Holds bytes from a buffer to simplify parsing and random access.
+
+    The source data are used directly, without copying, if they are a `bytearray` or a
+    `memoryview` (e.g. of a memory-mapped file); anything else is copied into a `bytearray`.
+    """
 
     def __init__(self, source):
         """Initialize the IOBuffer with the source data."""
-        self._data = bytearray(source)
+        if isinstance(source, (bytearray, memoryview)):
+            self._data = source
+        else:
+            self._data = bytearray(source)
+        self._mmap = None
         self.reset()
 
     @classmethod
     def fromfile(cls, fobj):
-        """Initialize the IOBuffer with the contents of the file object."""
+        """Initialize the IOBuffer with the contents of the file object.
+
+        Uncompressed files on disk are memory-mapped (copy-on-write) rather than read into
+        memory, so that structures and arrays are read directly from the mapped file. The
+        mapping is released by `close`.
+        """
+        if isinstance(fobj, io.BufferedReader):
+            try:
+                if fobj.tell() == 0:
+                    mapped = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_COPY)
+                    buf = cls(memoryview(mapped))
+                    buf._mmap = mapped
+                    return buf
+            except (OSError, ValueError):
+                # Handles empty files as well as those that do not support mapping
+                log.debug('Unable to memory-map file. Reading instead.')
         return cls(fobj.read())
 
+    def close(self):
+        """Release the memory-mapped file holding the data, if any.
+
+        Arrays read from the buffer may still refer to the mapped file, in which case it is
+        only unmapped once they are no longer in use. The buffer is left empty.
+        """
+        mapped, self._mmap = self._mmap, None
+        data, self._data = self._data, bytearray()
+        self.reset()
+        if mapped is not None:
+            try:
+                if isinstance(data, memoryview):
+                    data.release()
+                mapped.close()
+            except BufferError:
+                log.debug('Memory-mapped file still in use. Leaving it to be unmapped later.')
+
     def reset(self):
         """Reset buffer back to initial state."""
         self._offset = 0
@@ -228,14 +380,24 @@ class IOBuffer:
         """Calculate the current offset relative to a marked location."""
         return self._offset - self._bookmarks[mark]
 
+    def tell(self):
+        """Return the current offset within the buffer."""
+        return self._offset
+
     def clear_marks(self):
         """Clear all marked locations."""
         self._bookmarks = []
 
+    def append(self, data):
+        """Add the specified data to the end of the buffer."""
+        if not isinstance(self._data, bytearray):
+            self._data = bytearray(self._data)
+        self._data.extend(data)
+
     def splice(self, mark, newdata):
         """Replace the data after the marked location with the specified data."""
         self.jump_to(mark)
-        self._data = self._data[:self._offset] + bytearray(newdata)
+        self._data = bytearray(self._data[:self._offset]) + bytearray(newdata)
 
     def read_struct(self, struct_class):
         """Parse and return a structure from the current buffer offset."""
@@ -277,6 +439,16 @@ class IOBuffer:
         self.skip(ret.nbytes)
         return ret
 
+    def read_array_at(self, offsets, dtype):
+        """Read a single value of the specified type from each of the offsets in the buffer.
+
+        This does not modify the current offset.
+        """
+        dtype = np.dtype(dtype)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        data = np.frombuffer(self._data, dtype=np.uint8)
+        return data[offsets[:, None] + np.arange(dtype.itemsize)].view(dtype)[:, 0]
+
     def read(self, num_bytes=None):
         """Read and return the specified bytes from the buffer."""
         res = self.get_next(num_bytes)
@@ -286,9 +458,12 @@ class IOBuffer:
     def get_next(self, num_bytes=None):
         """Get the next bytes in the buffer without modifying the offset."""
         if num_bytes is None:
-            return self._data[self._offset:]
+            data = self._data[self._offset:]
         else:
-            return self._data[self._offset:self._offset + num_bytes]
+            data = self._data[self._offset:self._offset + num_bytes]
+
+        # Slices of memoryviews need to be copied to give the usual bytes operations
+        return data if isinstance(data, bytearray) else bytearray(data)
 
     def skip(self, num_bytes):
         """Jump the ahead the specified bytes in the buffer."""
@@ -299,7 +474,7 @@ class IOBuffer:
 
     def check_remains(self, num_bytes):
         """Check that the number of bytes specified remains in the buffer."""
-        return len(self._data[self._offset:]) == num_bytes
+        return max(len(self._data) - self._offset, 0) == num_bytes
 
     def truncate(self, num_bytes):
         """Remove the specified number of bytes from the end of the buffer."""
@@ -311,7 +486,8 @@ class IOBuffer:
 
     def __getitem__(self, item):
         """Return the data at the specified location."""
-        return self._data[item]
+        data = self._data[item]
+        return bytes(data) if isinstance(data, memoryview) else data
 
     def __str__(self):
         """Return a string representation of the IOBuffer."""
@@ -322,7 +498,12 @@ class IOBuffer:
         return len(self._data)
 
 
-def zlib_decompress_all_frames(data):
+def has_zlib_header(data):
+    """Check whether bytes begin with a valid zlib stream header."""
+    return len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+
+
+def zlib_decompress_all_frames(data, size_hint=None):
     """Decompress all frames of zlib-compressed bytes.
 
     Repeatedly tries to decompress `data` until all data are decompressed, or decompression
@@ -332,26 +513,80 @@ def zlib_decompress_all_frames(data):
     ----------
     data : bytearray or bytes
         Binary data compressed using zlib.
+    size_hint : int, optional
+        The expected size of the decompressed data. If given, the output is allocated once
+        with this size and the data are decompressed into it, growing it only if needed.
 
     Returns
     -------
         bytearray
             All decompressed bytes
 
+    See Also
+    --------
+    zlib_iter_frames
+
+    """
+    out = bytearray(size_hint or 0)
+    pos = 0
+    for parts in _zlib_frame_parts(data):
+        for part in parts:
+            # Assigning past the end of the output extends it
+            out[pos:pos + len(part)] = part
+            pos += len(part)
+    del out[pos:]
+    return out
+
+
+def zlib_iter_frames(data, chunk_size=8192):
+    """Iterate over the decompressed frames of zlib-compressed bytes.
+
+    Frames are decompressed one at a time as they are requested, walking through `data`
+    without copying it. Once decompression fails, the remaining bytes, which are not
+    compressed with zlib, are returned as the final item.
+
+    Parameters
+    ----------
+    data : bytearray or bytes or memoryview
+        Binary data compressed using zlib.
+    chunk_size : int, optional
+        The number of bytes passed to the decompressor at a time. This bounds the amount of
+        data copied when finding where one frame ends and the next begins.
+
+    Yields
+    ------
+        bytes
+            The decompressed bytes of each frame
+
+    """
+    for parts in _zlib_frame_parts(data, chunk_size):
+        yield b''.join(parts)
+
+
+def _zlib_frame_parts(data, chunk_size=8192):
+    """Decompress zlib frames one at a time, yielding the pieces of output for each frame.
+
+    Once decompression fails, the remaining bytes are yielded as the final frame.
     """
-    frames = bytearray()
-    data = bytes(data)
-    while data:
+    view = memoryview(data).cast('B')
+    offset = 0
+    while offset < len(view):
         decomp = zlib.decompressobj()
+        parts = []
+        pos = offset
         try:
-            frames.extend(decomp.decompress(data))
-            data = decomp.unused_data
-            log.debug('Decompressed zlib frame. %d bytes remain.', len(data))
+            while not decomp.eof and pos < len(view):
+                parts.append(decomp.decompress(view[pos:pos + chunk_size]))
+                pos += min(chunk_size, len(view) - pos)
         except zlib.error:
-            log.debug('Remaining %d bytes are not zlib compressed.', len(data))
-            frames.extend(data)
-            break
-    return frames
+            log.debug('Remaining %d bytes are not zlib compressed.', len(view) - offset)
+            yield [view[offset:]]
+            return
+
+        # Back up to the start of the data past the end of the frame
+        offset = pos - len(decomp.unused_data)
+        log.debug('Decompressed zlib frame. %d bytes remain.', len(view) - offset)
+        yield parts
 
 
 def bits_to_code(val):
@@ -6,6 +6,7 @@
 import contextlib
 from datetime import datetime
 from enum import Enum
+import functools
 from io import BytesIO
 from itertools import repeat  # noqa: I202
 import logging
@@ -13,12 +14,19 @@ import re
 
 import numpy as np
 from xarray import Variable
-from xarray.backends.common import AbstractDataStore
+from xarray.backends.common import AbstractDataStore, BackendArray
+from xarray.core import indexing
 from xarray.core.utils import FrozenDict
 
-from ._tools import Bits, IOBuffer, NamedStruct, open_as_needed, zlib_decompress_all_frames
+from ._tools import (Bits, has_zlib_header, IOBuffer, NamedStruct, open_as_needed,
+                     zlib_iter_frames)
 from ..package_tools import Exporter
 
+try:
+    from xarray.core.indexing import LazilyIndexedArray
+except ImportError:  # Can remove when we require xarray >= 0.18
+    from xarray.core.indexing import LazilyOuterIndexedArray as LazilyIndexedArray
+
 exporter = Exporter(globals())
 log = logging.getLogger(__name__)
 
@@ -65,7 +73,9 @@ class GiniProjection(Enum):
 class GiniFile(AbstractDataStore):
     """A class that handles reading the GINI format satellite images from the NWS.
 
-    This class attempts to decode every byte that is in a given GINI file.
+    This class attempts to decode every byte that is in a given GINI file. The image itself
+    is only decoded (and decompressed) when it is accessed, and when used as an xarray
+    data store, only as many rows as are needed for the requested subset are decoded.
 
     Notes
     -----
@@ -154,10 +164,14 @@ class GiniFile(AbstractDataStore):
         self._process_wmo_header()
         log.debug('First wmo code: %s', self.wmo_code)
 
-        # Decompress the data if necessary, and if so, pop off new header
-        log.debug('Length before decompression: %s', len(self._buffer))
-        self._buffer = IOBuffer(self._buffer.read_func(zlib_decompress_all_frames))
-        log.debug('Length after decompression: %s', len(self._buffer))
+        # Set up decompressing the data if necessary. Frames are only decompressed as the data
+        # are needed, so for now just get enough for the headers.
+        self._frames = None
+        if has_zlib_header(self._buffer.get_next(2)):
+            log.debug('Length before decompression: %s', len(self._buffer))
+            self._frames = zlib_iter_frames(self._buffer.read())
+            self._buffer = IOBuffer(bytearray())
+            self._decompress_to(self._header_size)
 
         # Process WMO header inside compressed data if necessary
         self._process_wmo_header()
@@ -207,8 +221,51 @@ class GiniFile(AbstractDataStore):
         # Jump past the remaining empty bytes in the product description block
         self._buffer.jump_to(start, self.prod_desc2.pdb_size)
 
+        # Leave reading the raster until it's needed
+        self._data_start = self._buffer.set_mark()
+        self._image = None
+
+    # Enough data to hold the WMO header and product description block
+    _header_size = 1024
+
+    @property
+    def data(self):
+        """The image as a 2D array of raw (packed) values."""
+        if self._image is None:
+            self._image = self._read_image()
+        return self._image
+
+    def _decompress_to(self, num_bytes=None):
+        """Decompress frames until the buffer holds `num_bytes`, or all if `None`."""
+        while self._frames is not None and (num_bytes is None
+                                            or len(self._buffer) < num_bytes):
+            frame = next(self._frames, None)
+            if frame is None:
+                self._frames = None
+                log.debug('Length after decompression: %s', len(self._buffer))
+            else:
+                self._buffer.append(frame)
+
+    def _read_rows(self, num_rows):
+        """Read the first `num_rows` rows of the image, decompressing only as needed."""
+        if self._image is not None or not self.prod_desc.num_records:
+            return self.data[:num_rows]
+
+        self._buffer.jump_to(self._data_start)
+        self._decompress_to(self._buffer.tell() + num_rows * self.prod_desc.nx)
+
+        # Copy out the rows since the buffer's memory can be expanded with more frames
+        return self._buffer.read_array(num_rows * self.prod_desc.nx,
+                                       np.uint8).reshape(num_rows, self.prod_desc.nx).copy()
+
+    def _read_image(self):
+        """Read the full raster from the buffer."""
+        self._decompress_to()
+        self._buffer.jump_to(self._data_start)
+
         # Read the actual raster--unless it's PNG compressed, in which case that happens later
-        blob = self._buffer.read(self.prod_desc.num_records * self.prod_desc.record_len)
+        blob = self._buffer.read_array(self.prod_desc.num_records * self.prod_desc.record_len,
+                                       np.uint8)
 
         # Check for end marker
         end = self._buffer.read(self.prod_desc.record_len)
@@ -217,7 +274,7 @@ class GiniFile(AbstractDataStore):
 
         # Check to ensure that we processed all of the data
         if not self._buffer.at_end():
-            if not blob:
+            if not blob.size:
                 log.debug('No data read yet, trying to decompress remaining data as an image.')
                 from matplotlib.image import imread
                 blob = (imread(BytesIO(self._buffer.read())) * 255).astype('uint8')
@@ -225,8 +282,7 @@ class GiniFile(AbstractDataStore):
                 log.warning('Leftover unprocessed data beyond EOF marker: %s',
                             self._buffer.get_next(10))
 
-        self.data = np.array(blob).reshape((self.prod_desc.ny,
-                                            self.prod_desc.nx))
+        return blob.reshape((self.prod_desc.ny, self.prod_desc.nx))
 
     def _process_wmo_header(self):
         """Read off the WMO header from the file, if necessary."""
@@ -247,29 +303,10 @@ class GiniFile(AbstractDataStore):
         return '\n\t'.join(parts).format(self.prod_desc, self.prod_desc2)
 
     def _make_proj_var(self):
-        proj_info = self.proj_info
-        prod_desc2 = self.prod_desc2
-        attrs = {'earth_radius': 6371200.0}
-        if self.prod_desc.projection == GiniProjection.lambert_conformal:
-            attrs['grid_mapping_name'] = 'lambert_conformal_conic'
-            attrs['standard_parallel'] = prod_desc2.lat_in
-            attrs['longitude_of_central_meridian'] = proj_info.lov
-            attrs['latitude_of_projection_origin'] = prod_desc2.lat_in
-        elif self.prod_desc.projection == GiniProjection.polar_stereographic:
-            attrs['grid_mapping_name'] = 'polar_stereographic'
-            attrs['straight_vertical_longitude_from_pole'] = proj_info.lov
-            attrs['latitude_of_projection_origin'] = -90 if proj_info.proj_center else 90
-            attrs['standard_parallel'] = 60.0  # See Note 2 for Table 4.4A in ICD
-        elif self.prod_desc.projection == GiniProjection.mercator:
-            attrs['grid_mapping_name'] = 'mercator'
-            attrs['longitude_of_projection_origin'] = self.prod_desc.lo1
-            attrs['latitude_of_projection_origin'] = self.prod_desc.la1
-            attrs['standard_parallel'] = prod_desc2.lat_in
-        else:
-            raise NotImplementedError(
-                f'Unhandled GINI Projection: {self.prod_desc.projection}')
-
-        return 'projection', Variable((), 0, attrs)
+        # Only a shallow copy of the cached variable is returned, so that changing its
+        # attributes does not alter the cached variable.
+        proj_var = self._get_navigation()[0]
+        return 'projection', proj_var.copy(deep=False)
 
     def _make_time_var(self):
         base_time = self.prod_desc.datetime.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -279,9 +316,7 @@ class GiniFile(AbstractDataStore):
 
         return 'time', time_var
 
-    def _get_proj_and_res(self):
-        import pyproj
-
+    def _get_proj_params(self):
         proj_info = self.proj_info
         prod_desc2 = self.prod_desc2
 
@@ -310,31 +345,28 @@ class GiniFile(AbstractDataStore):
             kwargs['y_0'] = False  # Northing
             dx, dy = prod_desc2.resolution, prod_desc2.resolution
 
-        return pyproj.Proj(**kwargs), dx, dy
+        return kwargs, dx, dy
 
-    def _make_coord_vars(self):
-        proj, dx, dy = self._get_proj_and_res()
+    def _get_navigation(self):
+        # Images from the same sector share navigation, so the projection variable and
+        # the coordinates are cached
+        kwargs, dx, dy = self._get_proj_params()
+        return _navigation(self.prod_desc.projection, self.proj_info, self.prod_desc2.lat_in,
+                           tuple(sorted(kwargs.items())), self.prod_desc.lo1,
+                           self.prod_desc.la1, self.prod_desc.nx, self.prod_desc.ny, dx, dy)
 
-        # Get projected location of lower left point
-        x0, y0 = proj(self.prod_desc.lo1, self.prod_desc.la1)
+    def _make_coord_vars(self):
+        _, xlocs, ylocs, lon, lat = self._get_navigation()
 
         # Coordinate variable for x
-        xlocs = x0 + np.arange(self.prod_desc.nx) * (1000. * dx)
         attrs = {'units': 'm', 'long_name': 'x coordinate of projection',
                  'standard_name': 'projection_x_coordinate'}
         x_var = Variable(('x',), xlocs, attrs)
 
-        # Now y--Need to flip y because we calculated from the lower left corner,
-        # but the raster data is stored with top row first.
-        ylocs = (y0 + np.arange(self.prod_desc.ny) * (1000. * dy))[::-1]
         attrs = {'units': 'm', 'long_name': 'y coordinate of projection',
                  'standard_name': 'projection_y_coordinate'}
         y_var = Variable(('y',), ylocs, attrs)
 
-        # Get the two-D lon,lat grid as well
-        x, y = np.meshgrid(xlocs, ylocs)
-        lon, lat = proj(x, y, inverse=True)
-
         lon_var = Variable(('y', 'x'), data=lon,
                            attrs={'long_name': 'longitude', 'units': 'degrees_east'})
         lat_var = Variable(('y', 'x'), data=lat,
@@ -361,9 +393,7 @@ class GiniFile(AbstractDataStore):
         missing_val = self.missing
         attrs = {'long_name': self.prod_desc.channel, 'missing_value': missing_val,
                  'coordinates': 'y x time', 'grid_mapping': proj_var_name}
-        data_var = Variable(('y', 'x'),
-                            data=np.ma.array(self.data,
-                                             mask=self.data == missing_val),
+        data_var = Variable(('y', 'x'), data=LazilyIndexedArray(GiniImageArray(self)),
                             attrs=attrs)
         variables.append((name, data_var))
 
@@ -377,3 +407,89 @@ class GiniFile(AbstractDataStore):
         """
         return FrozenDict(satellite=self.prod_desc.creating_entity,
                           sector=self.prod_desc.sector_id)
+
+    def close(self):
+        """Release the file's data, including any memory-mapping of the file.
+
+        This is used by `xarray.Dataset.close`.
+        """
+        if self._frames is not None:
+            self._frames.close()
+            self._frames = None
+        self._buffer.close()
+
+
+def _projection_variable(projection, proj_info, lat_in, lo1, la1):
+    """Create the variable describing the projection of a GINI image."""
+    attrs = {'earth_radius': 6371200.0}
+    if projection == GiniProjection.lambert_conformal:
+        attrs['grid_mapping_name'] = 'lambert_conformal_conic'
+        attrs['standard_parallel'] = lat_in
+        attrs['longitude_of_central_meridian'] = proj_info.lov
+        attrs['latitude_of_projection_origin'] = lat_in
+    elif projection == GiniProjection.polar_stereographic:
+        attrs['grid_mapping_name'] = 'polar_stereographic'
+        attrs['straight_vertical_longitude_from_pole'] = proj_info.lov
+        attrs['latitude_of_projection_origin'] = -90 if proj_info.proj_center else 90
+        attrs['standard_parallel'] = 60.0  # See Note 2 for Table 4.4A in ICD
+    elif projection == GiniProjection.mercator:
+        attrs['grid_mapping_name'] = 'mercator'
+        attrs['longitude_of_projection_origin'] = lo1
+        attrs['latitude_of_projection_origin'] = la1
+        attrs['standard_parallel'] = lat_in
+    else:
+        raise NotImplementedError(f'Unhandled GINI Projection: {projection}')
+
+    return Variable((), 0, attrs)
+
+
+@functools.lru_cache(maxsize=8)
+def _navigation(projection, proj_info, lat_in, proj_kwargs, lo1, la1, nx, ny, dx, dy):
+    """Create the projection variable and calculate the coordinates for a GINI image.
+
+    The returned arrays are shared by all images with the same navigation, so they are made
+    read-only.
+    """
+    import pyproj
+
+    proj = pyproj.Proj(**dict(proj_kwargs))
+
+    # Get projected location of lower left point
+    x0, y0 = proj(lo1, la1)
+    xlocs = x0 + np.arange(nx) * (1000. * dx)
+
+    # Need to flip y because we calculated from the lower left corner,
+    # but the raster data is stored with top row first.
+    ylocs = (y0 + np.arange(ny) * (1000. * dy))[::-1]
+
+    # Get the two-D lon,lat grid as well
+    x, y = np.meshgrid(xlocs, ylocs)
+    lon, lat = proj(x, y, inverse=True)
+
+    for arr in (xlocs, ylocs, lon, lat):
+        arr.flags.writeable = False
+
+    proj_var = _projection_variable(projection, proj_info, lat_in, lo1, la1)
+    return proj_var, xlocs, ylocs, lon, lat
+
+
+class GiniImageArray(BackendArray):
+    """Lazily read the image from a `GiniFile`, decoding only the rows that are needed."""
+
+    def __init__(self, gini):
+        """Wrap the image from the `GiniFile`."""
+        self._gini = gini
+        self.shape = (gini.prod_desc.ny, gini.prod_desc.nx)
+        self.dtype = np.dtype(np.uint8)
+
+    def __getitem__(self, key):
+        """Get the values for a subset of the image."""
+        return indexing.explicit_indexing_adapter(key, self.shape,
+                                                  indexing.IndexingSupport.BASIC,
+                                                  self._getitem)
+
+    def _getitem(self, key):
+        # Only need to read up through the last row that was requested
+        rows = np.arange(self.shape[0])[key[0]]
+        num_rows = rows.max() + 1 if rows.size else 0
+        return self._gini._read_rows(num_rows)[key]
@@ -4,7 +4,12 @@
 """Parse METAR-formatted data."""
 # Import the necessary libraries
 from collections import namedtuple
+import concurrent.futures
 from datetime import datetime
+import functools
+import itertools
+import re
+from types import SimpleNamespace
 import warnings
 
 import numpy as np
@@ -21,7 +26,7 @@ from ..units import units
 exporter = Exporter(globals())
 
 # Configure the named tuple used for storing METAR data
-Metar = namedtuple('metar', ['station_id', 'latitude', 'longitude', 'elevation',
+Metar = namedtuple('Metar', ['station_id', 'latitude', 'longitude', 'elevation',
                              'date_time', 'wind_direction', 'wind_speed', 'current_wx1',
                              'current_wx2', 'current_wx3', 'skyc1', 'skylev1', 'skyc2',
                              'skylev2', 'skyc3', 'skylev3', 'skyc4', 'skylev4',
@@ -29,6 +34,11 @@ Metar = namedtuple('metar', ['station_id', 'latitude', 'longitude', 'elevation',
                              'current_wx1_symbol', 'current_wx2_symbol',
                              'current_wx3_symbol'])
 
+# Fields decoded from the text of a METAR report, before deriving the weather symbols and
+# converting the altimeter setting, which is kept as encoded (hundredths of inches of mercury
+# or hectopascals)
+_MetarFields = namedtuple('_MetarFields', Metar._fields[:-3])
+
 # Create a dictionary for attaching units to the different variables
 col_units = {'station_id': None,
              'latitude': 'degrees',
@@ -60,6 +70,89 @@ col_units = {'station_id': None,
              'past_weather2': None}
 
 
+# Build a regular expression equivalent to the METAR grammar in metar_parse.peg for the
+# common case of reports ending in well-formed remarks. PEG parsers never backtrack into an
+# element once it has matched, so every element is wrapped in an atomic group--emulated with
+# a captured lookahead--to make the expression accept exactly the same splits of the report.
+_atomic_names = (f'_a{i}' for i in itertools.count())
+
+
+def _atomic(pattern):
+    """Wrap a regular expression so that it is not backtracked into once matched."""
+    name = next(_atomic_names)
+    return f'(?=(?P<{name}>{pattern}))(?P={name})'
+
+
+def _opt(pattern):
+    """Match a regular expression atomically if possible, otherwise match nothing."""
+    return _atomic(f'(?:{pattern})?')
+
+
+def _sep():
+    """Build the expression for the spaces separating groups."""
+    return _atomic(' +')
+
+
+def _wx():
+    """Build the expression for a present weather group."""
+    return (_opt('[-+]|VC') + '(?:MI|PR|DR|BL|SH|TS|FG|TS|FZ|RA|BR|HZ|SN)' + _opt('[-+]')
+            + _opt('RA|BR|DZ|FG|FU|VA|DU|SA|SA|HZ|PY'))
+
+
+def _cover():
+    """Build the expression for a sky cover group."""
+    return ('(?:' + _atomic('FEW|SCT|BKN|OVC|VV|///') + _opt(_atomic(r'\d*'))
+            + _opt('TCU|CB|///') + '|CLR|SKC|NSC|NCD|' + _wx() + '|//)')
+
+
+_metar_fast = re.compile(
+    _opt('METAR|SPECI') + _opt(' AUTO| COR')
+    + '(?P<siteid>' + _opt(_sep()) + '[0-9A-Z]{4})'
+    + '(?P<datetime>' + _sep() + _atomic(r'\d+') + 'Z)'
+    + '(?P<auto>' + _sep() + _opt('AUTO|COR') + ')'
+    + '(?P<wind>' + _opt(_opt(_sep()) + '(?P<wind_dir>' + _opt(r'\d{3}|VAR|VRB|///') + ')'
+                         + '(?P<wind_spd>' + _opt(r'\d\d' + _opt(r'\d') + '|//') + ')'
+                         + _opt('G' + _atomic(r'\d+')) + '(?:KT|MPS)'
+                         + _opt(_sep() + r'\d{3}V\d{3}')) + ')'
+    + _opt(_sep() + _atomic(r'\d{4}' + _opt('NDV') + r'|\d'
+                            + _opt(r'\d|' + _opt(r' \d') + r'/\d') + 'SM|CAVOK'))
+    + _opt(_sep() + 'R' + _opt('[LRC]') + r'\d\d' + _opt('[LRC]') + '/' + _opt(r'\d{4}V')
+           + _opt('["M" / "P"]') + r'\d{4}FT')
+    + '(?P<curwx>' + _atomic(f'(?:{_sep()}{_atomic(_wx())})*') + ')'
+    + '(?P<skyc>' + _atomic(f'(?:{_sep()}{_atomic(_cover())})*') + ')'
+    + '(?P<temp_dewp>' + _opt(_sep() + _opt('//') + '(?P<temp>' + _opt('M') + _opt(r'\d')
+                              + _opt(r'\d') + ')/(?P<dewp>' + _opt('M') + _opt(r'\d')
+                              + _opt(r'\d') + ')' + _opt('//')) + ')'
+    + '(?P<altim>' + _opt(_opt(_sep()) + r'["Q" / "A"]\d{4}' + _opt('=')) + ')'
+    + _opt(_opt(_sep()) + '(?:RMK|NOSIG).*') + _opt(_opt(_sep()) + '='),
+    re.DOTALL)
+
+
+def _fast_parse(metar_text):
+    """Split a METAR report into its groups without building a full parse tree.
+
+    Returns an object with the same attributes as the tree from `metar_parser.parse` that
+    are used for decoding the report, or `None` if the report needs the full parser.
+    """
+    match = _metar_fast.fullmatch(metar_text)
+    if match is None:
+        return None
+
+    def node(group, **children):
+        return SimpleNamespace(text=match.group(group), **children)
+
+    # Only look at the nested groups when the enclosing group matched something
+    wind = match.group('wind')
+    temp_dewp = match.group('temp_dewp')
+    return SimpleNamespace(
+        siteid=node('siteid'), datetime=node('datetime'), curwx=node('curwx'),
+        skyc=node('skyc'), altim=node('altim'),
+        wind=node('wind', wind_dir=node('wind_dir' if wind else 'wind'),
+                  wind_spd=node('wind_spd' if wind else 'wind')),
+        temp_dewp=node('temp_dewp', temp=node('temp' if temp_dewp else 'temp_dewp'),
+                       dewp=node('dewp' if temp_dewp else 'temp_dewp')))
+
+
 @exporter.export
 def parse_metar_to_dataframe(metar_text, *, year=None, month=None):
     """Parse a single METAR report into a Pandas DataFrame.
@@ -233,20 +326,39 @@ def parse_metar_to_named_tuple(metar_text, station_metadata, year, month):
     and altimeter value, float
 
     """
-    # Decode the data using the parser (built using Canopy) the parser utilizes a grammar
+    fields = _decode_metar(metar_text, station_metadata, year, month)
+    altim = _altimeter_to_inhg(np.array([fields.altimeter]))[0]
+    symbols = [_wx_symbols([wx])[0] for wx in (fields.current_wx1, fields.current_wx2,
+                                                 fields.current_wx3)]
+    return Metar(*fields._replace(altimeter=altim), *symbols)
+
+
+def _decode_metar(metar_text, station_metadata, year, month):
+    """Decode the fields of a METAR report in text form into a `_MetarFields` tuple.
+
+    If `station_metadata` is `None`, the station location is left missing so that it can be
+    looked up for many reports at once.
+    """
+    # Most reports can be split into their groups with a regular expression. Otherwise,
+    # decode the data using the parser (built using Canopy) the parser utilizes a grammar
     # file which follows the format structure dictated by the WMO Handbook, but has the
     # flexibility to decode the METAR text when there are missing or incorrectly
     # encoded values
-    tree = parse(metar_text)
+    tree = _fast_parse(metar_text)
+    if tree is None:
+        tree = parse(metar_text)
 
     # Station ID which is used to find the latitude, longitude, and elevation
     station_id = tree.siteid.text.strip()
 
     # Extract the latitude and longitude values from 'master' dictionary
     try:
-        lat = station_metadata[tree.siteid.text.strip()].latitude
-        lon = station_metadata[tree.siteid.text.strip()].longitude
-        elev = station_metadata[tree.siteid.text.strip()].altitude
+        if station_metadata is None:
+            raise KeyError(station_id)
+        station = station_metadata[station_id]
+        lat = station.latitude
+        lon = station.longitude
+        elev = station.altitude
     except KeyError:
         lat = np.nan
         lon = np.nan
@@ -282,34 +394,18 @@ def parse_metar_to_named_tuple(metar_text, station_metadata, year, month):
         wind_dir = np.nan
         wind_spd = np.nan
 
-    # Set the weather symbols
-    # If the weather symbol is missing, set values to nan
+    # Set the weather
+    # If the weather is missing, set values to nan
     if tree.curwx.text == '':
         current_wx1 = np.nan
         current_wx2 = np.nan
         current_wx3 = np.nan
-        current_wx1_symbol = 0
-        current_wx2_symbol = 0
-        current_wx3_symbol = 0
     else:
         wx = [np.nan, np.nan, np.nan]
-        # Loop through symbols and assign according WMO codes
         wx[0:len((tree.curwx.text.strip()).split())] = tree.curwx.text.strip().split()
         current_wx1 = wx[0]
         current_wx2 = wx[1]
         current_wx3 = wx[2]
-        try:
-            current_wx1_symbol = int(wx_code_map[wx[0]])
-        except (IndexError, KeyError):
-            current_wx1_symbol = 0
-        try:
-            current_wx2_symbol = int(wx_code_map[wx[1]])
-        except (IndexError, KeyError):
-            current_wx2_symbol = 0
-        try:
-            current_wx3_symbol = int(wx_code_map[wx[3]])
-        except (IndexError, KeyError):
-            current_wx3_symbol = 0
 
     # Set the sky conditions
     if tree.skyc.text[1:3] == 'VV':
@@ -417,24 +513,21 @@ def parse_metar_to_named_tuple(metar_text, station_metadata, year, month):
         except ValueError:
             dewp = np.nan
 
-    # Set the altimeter value and sea level pressure
+    # Set the altimeter value as encoded, which is converted to inches of mercury later
     if tree.altim.text == '':
         altim = np.nan
     else:
-        if (float(tree.altim.text.strip()[1:5])) > 1100:
-            altim = float(tree.altim.text.strip()[1:5]) / 100
-        else:
-            altim = (int(tree.altim.text.strip()[1:5]) * units.hPa).to('inHg').magnitude
+        altim = float(tree.altim.text.strip()[1:5])
 
     # Returns a named tuple with all the relevant variables
-    return Metar(station_id, lat, lon, elev, date_time, wind_dir, wind_spd,
-                 current_wx1, current_wx2, current_wx3, skyc1, skylev1, skyc2,
-                 skylev2, skyc3, skylev3, skyc4, skylev4, cloudcover, temp, dewp,
-                 altim, current_wx1_symbol, current_wx2_symbol, current_wx3_symbol)
+    return _MetarFields(station_id, lat, lon, elev, date_time, wind_dir, wind_spd,
+                        current_wx1, current_wx2, current_wx3, skyc1, skylev1, skyc2,
+                        skylev2, skyc3, skylev3, skyc4, skylev4, cloudcover, temp, dewp,
+                        altim)
 
 
 @exporter.export
-def parse_metar_file(filename, *, year=None, month=None):
+def parse_metar_file(filename, *, year=None, month=None, workers=None, errors=None):
     """Parse a text file containing multiple METAR reports and/or text products.
 
     Parameters
@@ -446,6 +539,12 @@ def parse_metar_file(filename, *, year=None, month=None):
         Year in which observation was taken, defaults to current year. Keyword-only argument.
     month : int, optional
         Month in which observation was taken, defaults to current month. Keyword-only argument.
+    workers : int, optional
+        Number of processes across which the reports are partitioned for parsing. Defaults
+        to `None`, which parses all reports in the current process. Keyword-only argument.
+    errors : list, optional
+        If given, a ``(report, exception)`` tuple is appended for every report that could not
+        be parsed; these reports are otherwise skipped silently. Keyword-only argument.
 
     Returns
     -------
@@ -489,7 +588,169 @@ def parse_metar_file(filename, *, year=None, month=None):
         year = now.year if year is None else year
         month = now.month if month is None else month
 
-    # Function to merge METARs
+    # Open the file and split it into the METAR reports it contains
+    myfile = open_as_needed(filename, 'rt')
+    metars = _split_reports(myfile.read().rstrip().split('\n'))
+
+    parsed = _parse_metar_reports(metars, year, month, workers, errors)
+    df = _metars_to_dataframe(parsed)
+
+    # Drop duplicate values
+    df = df.drop_duplicates(subset=['date_time', 'latitude', 'longitude'], keep='last')
+
+    # Set the units for the dataframe--filter out warning from Pandas
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        df.units = col_units
+
+    return df
+
+
+@exporter.export
+class MetarIngester:
+    r"""Incrementally parse METAR reports from a growing feed of text bulletins.
+
+    Text is passed to :meth:`add_text` as it arrives, and only the reports that have not been
+    seen before are parsed and returned. Observations are identified by their station and
+    time, so that repeated reports are skipped, while corrected (``COR``) reports are returned
+    again so that they can replace the original observation.
+
+    """
+
+    def __init__(self, *, year=None, month=None, workers=None, max_age=None):
+        """Create an ingester with no reports seen.
+
+        Parameters
+        ----------
+        year : int, optional
+            Year in which observations were taken, defaults to the current year at the time
+            text is added. Keyword-only argument.
+        month : int, optional
+            Month in which observations were taken, defaults to the current month at the time
+            text is added. Keyword-only argument.
+        workers : int, optional
+            Number of processes across which each batch of reports is partitioned for
+            parsing. Defaults to `None`, which parses all reports in the current process.
+            Keyword-only argument.
+        max_age : `datetime.timedelta`, optional
+            How long to remember an observation, relative to the newest observation seen,
+            before a report for it is treated as new. Defaults to `None`, which remembers all
+            observations. Keyword-only argument.
+
+        """
+        self.year = year
+        self.month = month
+        self.workers = workers
+        self.max_age = max_age
+        self._seen = {}
+        self._newest = None
+        self._pending = ''
+
+    def __len__(self):
+        """Return the number of observations remembered."""
+        return len(self._seen)
+
+    def add_text(self, text, *, errors=None):
+        """Parse the new reports in the next piece of text from the feed.
+
+        A report at the end of the text that is not terminated by ``=`` may still be
+        continued by the next piece of text, so it is held back until more text is added
+        or :meth:`flush` is called.
+
+        Parameters
+        ----------
+        text : str
+            The text, containing any number of METAR reports and/or text products
+        errors : list, optional
+            If given, a ``(report, exception)`` tuple is appended for every report that could
+            not be parsed. Keyword-only argument.
+
+        Returns
+        -------
+        `pandas.DataFrame`
+            The observations not seen before, with the same columns as from
+            `parse_metar_file`. Corrections of earlier observations are included.
+
+        """
+        lines = (self._pending + text).split('\n')
+
+        # Hold back the lines of the last report, unless it is complete. Blank lines, as well
+        # as a last line that may be the start of an indented continuation line, belong to
+        # the report before them.
+        start = len(lines)
+        while start > 0 and (lines[start - 1].startswith('     ')
+                             or '     '.startswith(lines[start - 1])):
+            start -= 1
+        start = max(start - 1, 0)
+        if lines[start:] and ' '.join(lines[start:]).rstrip().endswith('='):
+            start = len(lines)
+        self._pending = '\n'.join(lines[start:])
+
+        return self._ingest(_split_reports(lines[:start]), errors)
+
+    def flush(self, *, errors=None):
+        """Parse any report held back waiting for more text.
+
+        Parameters
+        ----------
+        errors : list, optional
+            If given, a ``(report, exception)`` tuple is appended for every report that could
+            not be parsed. Keyword-only argument.
+
+        Returns
+        -------
+        `pandas.DataFrame`
+            The observations not seen before, as from :meth:`add_text`
+
+        """
+        lines = self._pending.split('\n')
+        self._pending = ''
+        return self._ingest(_split_reports(lines), errors)
+
+    def _ingest(self, metars, errors):
+        """Parse reports and return only those for new or corrected observations."""
+        year, month = self.year, self.month
+        if year is None or month is None:
+            now = datetime.now()
+            year = now.year if year is None else year
+            month = now.month if month is None else month
+
+        parsed = _parse_metar_reports(metars, year, month, self.workers, errors,
+                                      with_reports=True)
+
+        # Keep only the last report for each observation unless it has been corrected, in
+        # which case later uncorrected copies of the original are skipped.
+        new = {}
+        for report, metar in parsed:
+            key = (metar.station_id, metar.date_time)
+            corrected = _is_correction(report)
+            if key in self._seen and (self._seen[key] or not corrected):
+                continue
+            self._seen[key] = corrected
+            new[key] = metar
+            if isinstance(metar.date_time, datetime) and (self._newest is None
+                                                          or metar.date_time > self._newest):
+                self._newest = metar.date_time
+
+        self._forget_old()
+
+        df = _metars_to_dataframe(list(new.values()))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            df.units = col_units
+        return df
+
+    def _forget_old(self):
+        """Remove observations older than the maximum age from those remembered."""
+        if self.max_age is None or self._newest is None:
+            return
+        oldest = self._newest - self.max_age
+        self._seen = {key: corrected for key, corrected in self._seen.items()
+                      if not isinstance(key[1], datetime) or key[1] >= oldest}
+
+
+def _split_reports(lines):
+    """Merge continuation lines and return the individual reports from lines of text."""
     def merge(x, key='     '):
         tmp = []
         for i in x:
@@ -502,124 +763,103 @@ def parse_metar_file(filename, *, year=None, month=None):
         if len(tmp):
             yield ' '.join(tmp)
 
-    # Open the file
-    myfile = open_as_needed(filename, 'rt')
+    # Remove the short lines that do not contain METAR observations or contain
+    # METAR observations that lack a robust amount of data
+    return [metar for metar in merge(filter(None, lines)) if len(metar) > 25]
 
-    # Clean up the file and take out the next line (\n)
-    value = myfile.read().rstrip()
-    list_values = value.split('\n')
-    list_values = list(filter(None, list_values))
 
-    # Call the merge function and assign the result to the list of metars
-    list_values = list(merge(list_values))
+def _is_correction(report):
+    """Determine whether a METAR report is flagged as a correction."""
+    return _correction_flag.match(report) is not None
 
-    # Remove the short lines that do not contain METAR observations or contain
-    # METAR observations that lack a robust amount of data
-    metars = []
-    for metar in list_values:
-        if len(metar) > 25:
-            metars.append(metar)
-        else:
-            continue
-
-    # Create a dictionary with all the station name, locations, and elevations
-    master = station_info
-
-    # Setup lists to append the data to
-    station_id = []
-    lat = []
-    lon = []
-    elev = []
-    date_time = []
-    wind_dir = []
-    wind_spd = []
-    current_wx1 = []
-    current_wx2 = []
-    current_wx3 = []
-    skyc1 = []
-    skylev1 = []
-    skyc2 = []
-    skylev2 = []
-    skyc3 = []
-    skylev3 = []
-    skyc4 = []
-    skylev4 = []
-    cloudcover = []
-    temp = []
-    dewp = []
-    altim = []
-    current_wx1_symbol = []
-    current_wx2_symbol = []
-    current_wx3_symbol = []
-
-    # Loop through the different metars within the text file
-    for metar in metars:
+
+_correction_flag = re.compile(r'(?:(?:METAR|SPECI) +)?(?:COR +\w{4}|\w{4} +\d+Z +COR\b)')
+
+
+def _parse_metar_reports(reports, year, month, workers=None, errors=None, with_reports=False):
+    """Parse METAR reports, either here or partitioned across a pool of processes."""
+    if workers is None or workers <= 1:
+        parsed, failed = _parse_metar_chunk(reports, year, month)
+    else:
+        parsed, failed = [], []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            parse_chunk = functools.partial(_parse_metar_chunk, year=year, month=month)
+            for chunk_parsed, chunk_failed in pool.map(parse_chunk,
+                                                       _partition_reports(reports, workers)):
+                parsed.extend(chunk_parsed)
+                failed.extend(chunk_failed)
+
+    if errors is not None:
+        errors.extend(failed)
+
+    if with_reports:
+        return parsed
+    return [metar for _, metar in parsed]
+
+
+def _parse_metar_chunk(reports, year, month):
+    """Parse a sequence of METAR reports, returning the parsed reports and any failures."""
+    parsed = []
+    failed = []
+    for report in reports:
         try:
-            # Parse the string of text and assign to values within the named tuple
-            metar = parse_metar_to_named_tuple(metar, master, year=year, month=month)
-
-            # Append the different variables to their respective lists
-            station_id.append(metar.station_id)
-            lat.append(metar.latitude)
-            lon.append(metar.longitude)
-            elev.append(metar.elevation)
-            date_time.append(metar.date_time)
-            wind_dir.append(metar.wind_direction)
-            wind_spd.append(metar.wind_speed)
-            current_wx1.append(metar.current_wx1)
-            current_wx2.append(metar.current_wx2)
-            current_wx3.append(metar.current_wx3)
-            skyc1.append(metar.skyc1)
-            skylev1.append(metar.skylev1)
-            skyc2.append(metar.skyc2)
-            skylev2.append(metar.skylev2)
-            skyc3.append(metar.skyc3)
-            skylev3.append(metar.skylev3)
-            skyc4.append(metar.skyc4)
-            skylev4.append(metar.skylev4)
-            cloudcover.append(metar.cloudcover)
-            temp.append(metar.temperature)
-            dewp.append(metar.dewpoint)
-            altim.append(metar.altimeter)
-            current_wx1_symbol.append(metar.current_wx1_symbol)
-            current_wx2_symbol.append(metar.current_wx2_symbol)
-            current_wx3_symbol.append(metar.current_wx3_symbol)
-
-        except ParseError:
-            continue
-
-    df = pd.DataFrame({'station_id': station_id,
-                       'latitude': lat,
-                       'longitude': lon,
-                       'elevation': elev,
-                       'date_time': date_time,
-                       'wind_direction': wind_dir,
-                       'wind_speed': wind_spd,
-                       'current_wx1': current_wx1,
-                       'current_wx2': current_wx2,
-                       'current_wx3': current_wx3,
-                       'low_cloud_type': skyc1,
-                       'low_cloud_level': skylev1,
-                       'medium_cloud_type': skyc2,
-                       'medium_cloud_level': skylev2,
-                       'high_cloud_type': skyc3,
-                       'high_cloud_level': skylev3,
-                       'highest_cloud_type': skyc4,
-                       'highest_cloud_level': skylev4,
-                       'cloud_coverage': cloudcover,
-                       'air_temperature': temp,
-                       'dew_point_temperature': dewp,
-                       'altimeter': altim,
-                       'present_weather': current_wx1_symbol,
-                       'past_weather': current_wx2_symbol,
-                       'past_weather2': current_wx3_symbol},
-                      index=station_id)
+            parsed.append((report, _decode_metar(report, None, year, month)))
+        except ParseError as e:
+            failed.append((report, e))
+    return parsed, failed
+
+
+def _partition_reports(reports, workers):
+    """Split reports into contiguous chunks, several per worker to balance the load."""
+    size = max(1, -(-len(reports) // (4 * workers)))
+    return [reports[i:i + size] for i in range(0, len(reports), size)]
+
+
+def _metars_to_dataframe(metars):
+    """Assemble decoded `_MetarFields` tuples column-wise into a `pandas.DataFrame`.
+
+    The station locations are looked up together, and the weather symbols, altimeter
+    setting, sea-level pressure, and wind components are derived once for each whole column.
+    """
+    if metars:
+        columns = dict(zip(_MetarFields._fields, map(list, zip(*metars))))
+    else:
+        columns = dict.fromkeys(_MetarFields._fields, np.array([]))
+    columns['latitude'], columns['longitude'], columns['elevation'] = station_info.coordinates(
+        columns['station_id'])
+    df = pd.DataFrame({'station_id': columns['station_id'],
+                       'latitude': columns['latitude'],
+                       'longitude': columns['longitude'],
+                       'elevation': columns['elevation'],
+                       'date_time': columns['date_time'],
+                       'wind_direction': columns['wind_direction'],
+                       'wind_speed': columns['wind_speed'],
+                       'current_wx1': columns['current_wx1'],
+                       'current_wx2': columns['current_wx2'],
+                       'current_wx3': columns['current_wx3'],
+                       'low_cloud_type': columns['skyc1'],
+                       'low_cloud_level': columns['skylev1'],
+                       'medium_cloud_type': columns['skyc2'],
+                       'medium_cloud_level': columns['skylev2'],
+                       'high_cloud_type': columns['skyc3'],
+                       'high_cloud_level': columns['skylev3'],
+                       'highest_cloud_type': columns['skyc4'],
+                       'highest_cloud_level': columns['skylev4'],
+                       'cloud_coverage': columns['cloudcover'],
+                       'air_temperature': columns['temperature'],
+                       'dew_point_temperature': columns['dewpoint'],
+                       'altimeter': _altimeter_to_inhg(np.asarray(columns['altimeter'],
+                                                                  dtype=float)),
+                       'present_weather': _wx_symbols(columns['current_wx1']),
+                       'past_weather': _wx_symbols(columns['current_wx2']),
+                       'past_weather2': _wx_symbols(columns['current_wx3'])},
+                      index=columns['station_id'])
 
     # Calculate sea-level pressure from function in metpy.calc
     df['air_pressure_at_sea_level'] = altimeter_to_sea_level_pressure(
-        altim * units('inHg'),
-        elev * units('meters'),
-        temp * units('degC')).to('hPa').magnitude
+        df.altimeter.values * units('inHg'),
+        df.elevation.values * units('meters'),
+        df.air_temperature.values * units('degC')).to('hPa').magnitude
 
     # Use get wind components and assign them to eastward and northward winds
     df['eastward_wind'], df['northward_wind'] = wind_components((df.wind_speed.values
@@ -627,16 +867,26 @@ def parse_metar_file(filename, *, year=None, month=None):
                                                                 df.wind_direction.values
                                                                 * units.degree)
 
-    # Drop duplicate values
-    df = df.drop_duplicates(subset=['date_time', 'latitude', 'longitude'], keep='last')
-
     # Round altimeter and sea-level pressure values
     df['altimeter'] = df.altimeter.round(2)
     df['air_pressure_at_sea_level'] = df.air_pressure_at_sea_level.round(2)
 
-    # Set the units for the dataframe--filter out warning from Pandas
-    with warnings.catch_warnings():
-        warnings.simplefilter('ignore', UserWarning)
-        df.units = col_units
-
     return df
+
+
+def _wx_symbols(wx):
+    """Look up the numeric weather symbols for a column of present weather codes."""
+    # Only map each distinct code once; missing and unknown codes get no symbol (0), which
+    # the appended code handles for missing values since their category code is -1.
+    wx = pd.Categorical(wx)
+    symbols = [wx_code_map.get(code, 0) for code in wx.categories] + [0]
+    return np.array(symbols, dtype=int)[wx.codes]
+
+
+def _altimeter_to_inhg(altim):
+    """Convert encoded altimeter settings to inches of mercury.
+
+    Settings over 1100 are in hundredths of inches of mercury, otherwise in hectopascals.
+    """
+    hpa_to_inhg = units.Quantity(1, 'hPa').to('inHg').magnitude
+    return np.where(altim > 1100, altim / 100, altim * hpa_to_inhg)
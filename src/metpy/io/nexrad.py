@@ -5,20 +5,26 @@
 
 import bz2
 from collections import defaultdict, namedtuple, OrderedDict
+from collections.abc import Sequence
+import concurrent.futures
 import contextlib
 import datetime
+import functools
 import logging
 import pathlib
 import re
 import struct
 from struct import Struct
+import time
 from xdrlib import Unpacker
+import zlib
 
 import numpy as np
 from scipy.constants import day, milli
+import xarray as xr
 
-from ._tools import (Array, BitField, Bits, DictStruct, Enum, IOBuffer, NamedStruct,
-                     open_as_needed, zlib_decompress_all_frames)
+from ._tools import (Array, BitField, Bits, DictStruct, Enum, has_zlib_header, IOBuffer,
+                     NamedStruct, open_as_needed, vectorized, zlib_decompress_all_frames)
 from ..package_tools import Exporter
 
 exporter = Exporter(globals())
@@ -37,45 +43,129 @@ def version(val):
 
 def scaler(scale):
     """Create a function that scales by a specific value."""
+    @vectorized
     def inner(val):
         return val * scale
     return inner
 
 
+@vectorized
 def angle(val):
     """Convert an integer value to a floating point angle."""
     return val * 360. / 2**16
 
 
+@vectorized
 def az_rate(val):
     """Convert an integer value to a floating point angular rate."""
     return val * 90. / 2**16
 
 
-def bzip_blocks_decompress_all(data):
-    """Decompress all of the bzip2-ed blocks.
-
-    Returns the decompressed data as a `bytearray`.
-    """
-    frames = bytearray()
+def _bzip_blocks(data):
+    """Yield the offset and a view of each of the size-prefixed bzip2-ed blocks."""
+    data = memoryview(data)
     offset = 0
     while offset < len(data):
         size_bytes = data[offset:offset + 4]
-        offset += 4
         block_cmp_bytes = abs(Struct('>l').unpack(size_bytes)[0])
-        try:
-            frames.extend(bz2.decompress(data[offset:offset + block_cmp_bytes]))
-            offset += block_cmp_bytes
-        except OSError:
-            # If we've decompressed any frames, this is an error mid-stream, so warn, stop
-            # trying to decompress and let processing proceed
-            if frames:
-                logging.warning('Error decompressing bz2 block stream at offset: %d',
-                                offset - 4)
-                break
-            else:  # Otherwise, this isn't a bzip2 stream, so bail
-                raise ValueError('Not a bz2 stream.')
-    return frames
+        yield offset, data[offset + 4:offset + 4 + block_cmp_bytes]
+        offset += 4 + block_cmp_bytes
+
+
+def _bzip_decompress_block(block):
+    """Decompress a single bzip2-ed block, returning None if it is not valid bzip2 data."""
+    try:
+        return bz2.decompress(block)
+    except OSError:
+        return None
+
+
+def bzip_blocks_decompress_all(data, workers=None, executor='thread'):
+    """Decompress all of the bzip2-ed blocks.
+
+    Each block is prefixed by its compressed size and compressed independently of the others,
+    so the blocks can optionally be decompressed in parallel using a pool of workers. This
+    only helps for very large volumes, or many blocks, with several idle cores available;
+    for a typical volume, decompression is only a small part of the time spent reading the
+    file, and the overhead of the pool cancels out any gain.
+
+    Parameters
+    ----------
+    data : bytes or bytearray
+        The bzip2-ed block stream
+    workers : int, optional
+        The number of workers to use for decompressing blocks concurrently. If `None` (the
+        default) or 1, blocks are decompressed serially.
+    executor : {'thread', 'process'} or `concurrent.futures.Executor`, optional
+        The kind of pool to use for parallel decompression, or an existing executor to
+        submit the blocks to, in which case `workers` is ignored. Defaults to 'thread'.
+
+    Returns
+    -------
+    bytearray
+        The decompressed data
+
+    """
+    blocks = _bzip_blocks(data)
+    if isinstance(executor, concurrent.futures.Executor):
+        return _bzip_join(_bzip_parallel_decompress(data, blocks, executor))
+    elif workers is not None and workers > 1:
+        with _pool_class(executor)(max_workers=workers) as pool:
+            return _bzip_join(_bzip_parallel_decompress(data, blocks, pool))
+    else:
+        # Decompress lazily so that nothing past a failed block is decompressed
+        return _bzip_join((block, _bzip_decompress_block(block[1])) for block in blocks)
+
+
+def _bzip_join(decompressed):
+    """Append the decompressed blocks to the output, stopping at the first that failed."""
+    output = bytearray()
+    with contextlib.closing(decompressed):
+        for (offset, _), frame in decompressed:
+            if frame is None:
+                # If we've decompressed any frames, this is an error mid-stream, so warn,
+                # stop trying to decompress and let processing proceed
+                if output:
+                    logging.warning('Error decompressing bz2 block stream at offset: %d',
+                                    offset)
+                    break
+                else:  # Otherwise, this isn't a bzip2 stream, so bail
+                    raise ValueError('Not a bz2 stream.')
+            output += frame
+    return output
+
+
+def _pool_class(executor):
+    """Get the class of pool to use for a kind of executor."""
+    if executor == 'thread':
+        return concurrent.futures.ThreadPoolExecutor
+    elif executor == 'process':
+        return concurrent.futures.ProcessPoolExecutor
+    else:
+        raise ValueError(f'Unknown executor type: {executor}')
+
+
+def _bzip_parallel_decompress(data, blocks, executor):
+    """Decompress the blocks using an executor, yielding them in order with their info.
+
+    Any blocks not yet decompressed are cancelled once the generator is closed, e.g. after
+    a block fails to decompress.
+    """
+    # Avoid handing blocks to the pool when this clearly isn't a bzip2 stream
+    if data[4:7] != b'BZh':
+        raise ValueError('Not a bz2 stream.')
+
+    # Threads can work directly on views of the data, but other executors need to pickle it
+    copy = not isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+    futures = [(block, executor.submit(_bzip_decompress_block,
+                                       bytes(block[1]) if copy else block[1]))
+               for block in blocks]
+    try:
+        for block, future in futures:
+            yield block, future.result()
+    finally:
+        for _, future in futures:
+            future.cancel()
 
 
 def nexrad_to_datetime(julian_date, ms_midnight):
@@ -113,6 +203,106 @@ LAST_ELEVATION = 0x10
 BAD_DATA = 0x20
 
 
+@exporter.export
+class RawMomentData:
+    r"""Hold raw integer gate codes for a moment along with how to scale them.
+
+    The gate codes are only converted to floating point values when requested, either
+    through :meth:`values`, by indexing, or by converting to an array with
+    :func:`numpy.asarray`. Codes of 0 and 1 flag missing and range-folded data, respectively.
+
+    Attributes
+    ----------
+    raw : `numpy.ndarray`
+        The integer gate codes
+    scale : float or `numpy.ndarray`
+        The scale for converting the codes, broadcastable against `raw`
+    offset : float or `numpy.ndarray`
+        The offset for converting the codes, broadcastable against `raw`
+    missing : float
+        The value given to missing gates. Defaults to `MISSING`.
+    range_fold : float
+        The value given to range-folded gates. Defaults to `RANGE_FOLD`.
+
+    """
+
+    MISSING = float('nan')
+    RANGE_FOLD = float('nan')
+
+    def __init__(self, raw, scale, offset, missing=MISSING, range_fold=RANGE_FOLD):
+        """Initialize the raw data and the scale and offset needed to convert them."""
+        self.raw = raw
+        self.scale = scale
+        self.offset = offset
+        self.missing = missing
+        self.range_fold = range_fold
+
+    @property
+    def shape(self):
+        """Return the shape of the data."""
+        return self.raw.shape
+
+    @property
+    def ndim(self):
+        """Return the number of dimensions of the data."""
+        return self.raw.ndim
+
+    @property
+    def size(self):
+        """Return the number of gates in the data."""
+        return self.raw.size
+
+    def values(self, dtype=np.float64):
+        """Convert the raw gate codes to scaled values.
+
+        Parameters
+        ----------
+        dtype : `numpy.dtype`, optional
+            The floating point type of the returned values. Defaults to `numpy.float64`.
+
+        Returns
+        -------
+        `numpy.ndarray`
+            The scaled values, with missing and range-folded gates set to `missing` and
+            `range_fold`
+
+        """
+        return self._scale(self.raw, self.scale, self.offset, dtype)
+
+    def _scale(self, raw, scale, offset, dtype):
+        """Scale and flag a set of raw codes."""
+        scaled = raw.astype(dtype)
+        scaled -= offset
+        scaled /= scale
+        scaled[raw == 0] = self.missing
+        scaled[raw == 1] = self.range_fold
+        return scaled
+
+    def __getitem__(self, item):
+        """Return scaled values for only the selected gates."""
+        return self._scale(self.raw[item], self._select(self.scale, item),
+                           self._select(self.offset, item), np.float64)
+
+    def _select(self, param, item):
+        """Select the portion of the scale or offset that corresponds to selected gates."""
+        if np.ndim(param):
+            return np.broadcast_to(param, self.raw.shape)[item]
+        return param
+
+    def __array__(self, dtype=None):
+        """Convert to a scaled array."""
+        return self.values(np.float64 if dtype is None else dtype)
+
+    def __len__(self):
+        """Return the length of the data."""
+        return len(self.raw)
+
+    def __repr__(self):
+        """Return a representation of the raw data."""
+        return (f'{self.__class__.__name__}(raw={self.raw!r}, scale={self.scale!r}, '
+                f'offset={self.offset!r})')
+
+
 @exporter.export
 class Level2File:
     r"""Handle reading the NEXRAD Level 2 data and its various messages.
@@ -130,7 +320,14 @@ class Level2File:
     vol_hdr : namedtuple
         The unpacked volume header
     sweeps : list of tuples
-        Data for each of the sweeps found in the file
+        Data for each of the sweeps found in the file. When the file is opened with
+        ``lazy=True``, this is a read-only sequence that decodes each sweep upon first access.
+    sweep_arrays : sequence of `Level2File.Sweep`
+        Data for each of the sweeps, with the azimuth, elevation, and time of the radials
+        as 1D arrays and each moment as a 2D (radial x gate) array, padded with `MISSING`
+        where a radial has fewer gates. Each sweep is decoded directly into these arrays
+        upon first access. When the file is opened with ``raw_moments=True``, each moment is
+        instead a `RawMomentData` holding the 2D array of gate codes.
     rda_status : namedtuple, optional
         Unpacked RDA status information, if found
     maintenance_data : namedtuple, optional
@@ -151,6 +348,9 @@ class Level2File:
     The internal data structure that things are decoded into is still to be
     determined.
 
+    Real-time data, which arrive as a series of chunks, can be read incrementally by opening
+    the first chunk and passing each subsequent chunk to :meth:`add_chunk` as it arrives.
+
     """
 
     # Number of bytes
@@ -160,7 +360,9 @@ class Level2File:
     MISSING = float('nan')
     RANGE_FOLD = float('nan')  # TODO: Need to separate from missing
 
-    def __init__(self, filename, *, has_volume_header=True):
+    def __init__(self, filename, *, has_volume_header=True, decompress_workers=None,
+                 decompress_executor='thread', lazy=False, raw_moments=False,
+                 message_types=None):
         r"""Create instance of `Level2File`.
 
         Parameters
@@ -170,6 +372,25 @@ class Level2File:
             recognized with the extension '.gz', as are bzip2-ed files with
             the extension `.bz2` If `filename` is a file-like object,
             this will be read from directly.
+        has_volume_header : bool, optional
+            Whether the data start with a volume header. Defaults to `True`.
+        decompress_workers : int, optional
+            Number of workers used to decompress the internal bzip2 blocks in parallel.
+            Defaults to `None`, which decompresses the blocks serially.
+        decompress_executor : {'thread', 'process'} or `concurrent.futures.Executor`, optional
+            The kind of pool used for parallel decompression, or an existing executor to
+            use. Defaults to 'thread'.
+        lazy : bool, optional
+            If `True`, only index the locations of the radial messages in each sweep when
+            opening the file, and defer decoding the radials of a sweep until it is accessed.
+            Defaults to `False`.
+        raw_moments : bool, optional
+            If `True`, keep the data for each moment as their raw integer gate codes, using
+            `RawMomentData`, and only convert them to floating point values upon request.
+            This reduces the memory used by a factor of 4 to 8. Defaults to `False`.
+        message_types : collection of int, optional
+            The types of messages to decode (e.g. ``{2, 5, 31}``); all other messages are
+            skipped without being decoded. Defaults to `None`, which decodes all messages.
 
         """
         fobj = open_as_needed(filename)
@@ -188,20 +409,113 @@ class Level2File:
             self._buffer.reset()
 
         # See if we need to apply bz2 decompression
+        self._decompress = functools.partial(bzip_blocks_decompress_all,
+                                             workers=decompress_workers,
+                                             executor=decompress_executor)
         start = self._buffer.set_mark()
         try:
-            self._buffer = IOBuffer(self._buffer.read_func(bzip_blocks_decompress_all))
+            self._buffer = IOBuffer(self._buffer.read_func(self._decompress))
         except ValueError:
             self._buffer.jump_to(start)
 
         # Now we're all initialized, we can proceed with reading in data
+        self._lazy = lazy
+        self._raw_moments = raw_moments
+        self._message_types = message_types
         self._read_data()
 
+    def close(self):
+        """Release the file's data, including any memory-mapping of the file.
+
+        Sweeps that have not yet been decoded when opened with ``lazy=True`` can no longer be
+        read afterwards. This is called upon leaving a ``with`` block.
+        """
+        self._buffer.close()
+
+    def __enter__(self):
+        """Enter the runtime context for the file."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit the runtime context for the file, closing it."""
+        self.close()
+
     vol_hdr_fmt = NamedStruct([('version', '9s'), ('vol_num', '3s'),
                                ('date', 'L'), ('time_ms', 'L'), ('stid', '4s')], '>', 'VolHdr')
 
-    def _read_volume_header(self):
-        self.vol_hdr = self._buffer.read_struct(self.vol_hdr_fmt)
+    def add_chunk(self, chunk):
+        r"""Add the messages from the next chunk of real-time data.
+
+        Only the messages within the new chunk are decoded; radials are appended to the
+        sweeps already read, and any sweeps affected are re-decoded upon next access when
+        the file was opened with ``lazy=True``.
+
+        Parameters
+        ----------
+        chunk : str, file-like object, or bytes
+            The chunk of data, either as the name of a file, a file-like object, or the
+            bytes themselves. A chunk that starts with a volume header begins a new volume,
+            which replaces all of the data and sweeps read so far.
+
+        Returns
+        -------
+        list of int
+            The indices of the sweeps that were completed by the radials in this chunk
+
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            data = bytes(chunk)
+        else:
+            with contextlib.closing(open_as_needed(chunk)) as fobj:
+                data = fobj.read()
+
+        buf = IOBuffer(data)
+        new_volume = data.startswith(b'AR2V')
+        if new_volume:
+            self._read_volume_header(buf)
+
+        start = buf.set_mark()
+        try:
+            data = buf.read_func(self._decompress)
+        except ValueError:
+            buf.jump_to(start)
+            data = buf.read()
+
+        # Radials from a new volume cannot be added to the sweeps of the previous one, so
+        # start over with only the new data.
+        if new_volume:
+            self._buffer.close()
+            self._buffer = IOBuffer(data)
+            self._read_data()
+            return self._completed_sweeps
+
+        # Add the data to the end of our buffer so that previously indexed offsets remain
+        # valid, and only read the new messages.
+        first_sweep = max(len(self._sweep_index) - 1, 0)
+        self._completed_sweeps = []
+        self._buffer.reset()
+        self._buffer.skip(len(self._buffer))
+        mark = self._buffer.set_mark()
+        self._buffer.append(data)
+        self._buffer.jump_to(mark)
+        self._read_messages()
+
+        if self._lazy:
+            self.sweeps.invalidate(first_sweep)
+        else:
+            for ind, index in enumerate(self._sweep_index[first_sweep:], start=first_sweep):
+                if ind < len(self.sweeps):
+                    self.sweeps[ind].extend(self._decode_sweep(index[len(self.sweeps[ind]):]))
+                else:
+                    self.sweeps.append(self._decode_sweep(index))
+        self.sweep_arrays.invalidate(first_sweep)
+
+        return self._completed_sweeps
+
+    def _read_volume_header(self, buf=None):
+        if buf is None:
+            buf = self._buffer
+        self.vol_hdr = buf.read_struct(self.vol_hdr_fmt)
         self.dt = nexrad_to_datetime(self.vol_hdr.date, self.vol_hdr.time_ms)
         self.stid = self.vol_hdr.stid
 
@@ -215,20 +529,50 @@ class Level2File:
 
     def _read_data(self):
         self._msg_buf = {}
-        self.sweeps = []
+        self._sweep_index = []
+        self._completed_sweeps = []
         self.rda_status = []
-        while not self._buffer.at_end():
-            # Clear old file book marks and set the start of message for
-            # easy jumping to the end
-            self._buffer.clear_marks()
-            msg_start = self._buffer.set_mark()
+        self._read_messages()
 
-            # Skip CTM
-            self._buffer.skip(self.CTM_HEADER_SIZE)
+        # Check if we have any message segments still in the buffer
+        if self._msg_buf:
+            log.warning('Remaining buffered messages segments for message type(s): %s',
+                        ' '.join(map(str, self._msg_buf)))
+
+        # Radial messages have only been indexed, so decode them now unless asked to wait
+        # until each sweep is accessed.
+        if self._lazy:
+            self.sweeps = _LazySweeps(self._decode_sweep, self._sweep_index)
+        else:
+            self.sweeps = [self._decode_sweep(index) for index in self._sweep_index]
+        self.sweep_arrays = _LazySweeps(self._decode_sweep_arrays, self._sweep_index)
 
-            # Read the message header
-            msg_hdr = self._buffer.read_struct(self.msg_hdr_fmt)
-            log.debug('Got message: %s (at offset %d)', str(msg_hdr), self._buffer._offset)
+    msg_hdr_dtype = np.dtype([('size_hw', '>u2'), ('rda_channel', 'u1'), ('msg_type', 'u1'),
+                              ('seq_num', '>u2'), ('date', '>u2'), ('time_ms', '>u4'),
+                              ('num_segments', '>u2'), ('segment_num', '>u2')])
+
+    # Just the parts of the message header needed to find the size of the message
+    msg_size_fmt = Struct('>HxB8xHH')
+
+    def _scan_messages(self):
+        """Locate all of the messages from the current offset through the end of the buffer.
+
+        Returns a table (as a structured array) of the offset of the header of each
+        message, the total size of the message, and the decoded message header.
+        """
+        # Since message sizes vary, finding the start of each message requires walking the
+        # messages; do so reading only the minimum needed to find the next message.
+        offsets = []
+        sizes = []
+        offset = self._buffer._offset
+        while not self._buffer.at_end():
+            self._buffer.skip(self.CTM_HEADER_SIZE)
+            try:
+                size_hw, msg_type, num_segments, segment_num = self._buffer.read_struct(
+                    self.msg_size_fmt)
+            except struct.error:
+                log.warning('Incomplete message header at offset %d', offset)
+                break
 
             # The AR2_BLOCKSIZE accounts for the CTM header before the
             # data, as well as the Frame Check Sequence (4 bytes) after
@@ -238,39 +582,266 @@ class Level2File:
             # If the size is 0, this is just padding, which is for certain
             # done in the metadata messages. Let the default block size handle rather
             # than any specific heuristic to skip.
-            if msg_hdr.size_hw:
+            if size_hw:
                 # For new packets, the message size isn't on the fixed size boundaries,
                 # so we use header to figure out. For these, we need to include the
                 # CTM header but not FCS, in addition to the size.
 
                 # As of 2620002P, this is a special value used to indicate that the segment
                 # number/count bytes are used to indicate total size in bytes.
-                if msg_hdr.size_hw == 65535:
-                    msg_bytes = (msg_hdr.num_segments << 16 | msg_hdr.segment_num
-                                 + self.CTM_HEADER_SIZE)
-                elif msg_hdr.msg_type in (29, 31):
-                    msg_bytes = self.CTM_HEADER_SIZE + 2 * msg_hdr.size_hw
-
-                log.debug('Total message size: %d', msg_bytes)
-
-                # Try to handle the message. If we don't handle it, skipping
-                # past it is handled at the end anyway.
-                decoder = f'_decode_msg{msg_hdr.msg_type:d}'
-                if hasattr(self, decoder):
-                    getattr(self, decoder)(msg_hdr)
-                else:
-                    log.warning('Unknown message: %d', msg_hdr.msg_type)
+                if size_hw == 65535:
+                    msg_bytes = (num_segments << 16 | segment_num + self.CTM_HEADER_SIZE)
+                elif msg_type in (29, 31):
+                    msg_bytes = self.CTM_HEADER_SIZE + 2 * size_hw
+
+            offsets.append(offset + self.CTM_HEADER_SIZE)
+            sizes.append(msg_bytes)
 
             # Jump to the start of the next message. This depends on whether
             # the message was legacy with fixed block size or not.
-            self._buffer.jump_to(msg_start, msg_bytes)
+            offset += msg_bytes
+            self._buffer.reset()
+            self._buffer.skip(offset)
+
+        # With the locations known, decode all of the headers at once
+        table = np.empty(len(offsets), dtype=[('offset', np.int64), ('msg_bytes', np.int64),
+                                              *self.msg_hdr_dtype.descr])
+        table['offset'] = offsets
+        table['msg_bytes'] = sizes
+        hdrs = self._buffer.read_array_at(offsets, self.msg_hdr_dtype)
+        for name in self.msg_hdr_dtype.names:
+            table[name] = hdrs[name]
+        return table
+
+    # Status and elevation number locations within the radial message headers
+    _radial_status_dtypes = {1: np.dtype({'names': ['rad_status', 'el_num'],
+                                          'formats': ['>u2', '>u2'], 'offsets': [12, 16]}),
+                             31: np.dtype({'names': ['rad_status', 'el_num'],
+                                           'formats': ['u1', 'u1'], 'offsets': [21, 22]})}
+
+    _remapped_status = np.array([remap_status(val) for val in range(256)])
+
+    def _read_messages(self):
+        table = self._scan_messages()
+        table = table[table['size_hw'] != 0]
+        if self._message_types is not None:
+            table = table[np.isin(table['msg_type'], list(self._message_types))]
+
+        # Pull out the status and elevation for all radials, in bulk, so that we can sort them
+        # into sweeps without decoding them.
+        rad_status = np.zeros(len(table), dtype=np.int64)
+        el_num = np.zeros(len(table), dtype=np.int64)
+        for msg_type, dtype in self._radial_status_dtypes.items():
+            radial = table['msg_type'] == msg_type
+            info = self._buffer.read_array_at(table['offset'][radial] + self.msg_hdr_fmt.size,
+                                              dtype)
+            rad_status[radial] = self._remapped_status[info['rad_status'] & 0xFF]
+            el_num[radial] = info['el_num']
+
+        for ind, (offset, msg_type) in enumerate(zip(table['offset'].tolist(),
+                                                     table['msg_type'].tolist())):
+            if msg_type in (1, 31):
+                self._index_radial(msg_type, offset + self.msg_hdr_fmt.size,
+                                   int(rad_status[ind]), int(el_num[ind]))
+                continue
+
+            # Try to handle the message. If we don't handle it, skipping
+            # past it is handled by the table anyway.
+            decoder = f'_decode_msg{msg_type:d}'
+            if hasattr(self, decoder):
+                self._buffer.reset()
+                self._buffer.skip(offset)
+                msg_hdr = self._buffer.read_struct(self.msg_hdr_fmt)
+                log.debug('Got message: %s (at offset %d)', msg_hdr, offset)
+                getattr(self, decoder)(msg_hdr)
+            else:
+                log.warning('Unknown message: %d', msg_type)
+
+        # Leave the buffer at the end of the data
+        self._buffer.reset()
+        self._buffer.skip(None)
+
+    def _index_radial(self, msg_type, offset, rad_status, el_num):
+        """Record the location of a radial message within its sweep without decoding it."""
+        self._add_sweep(rad_status, el_num)
+        self._sweep_index[-1].append((msg_type, offset))
+        if rad_status & END_ELEVATION:
+            self._completed_sweeps.append(len(self._sweep_index) - 1)
+
+    def _decode_radial(self, msg_type, offset, scale=True):
+        """Decode the radial message found at an indexed location."""
+        self._buffer.reset()
+        self._buffer.skip(offset)
+        return getattr(self, f'_decode_msg{msg_type:d}_radial')(scale)
+
+    def _decode_sweep(self, index):
+        """Decode all of the radial messages for a sweep from their indexed locations."""
+        return [self._decode_radial(msg_type, offset)[1] for msg_type, offset in index]
+
+    Sweep = namedtuple('Sweep', 'azimuth elevation time moments')
+
+    def _sweep_coords(self, index):
+        """Read the azimuth, elevation, and time of all radials in a sweep at once."""
+        msg_types, offsets = np.array(index, dtype=np.int64).reshape(-1, 2).T
+        az = np.empty(len(index))
+        el = np.empty(len(index))
+        time_ms = np.empty(len(index), dtype=np.int64)
+        for msg_type, fmt in ((1, self.msg1_fmt), (31, self.msg31_data_hdr_fmt)):
+            selected = msg_types == msg_type
+            hdrs = fmt.convert_array(self._buffer.read_array_at(offsets[selected], fmt.dtype),
+                                     names=('time_ms', 'date', 'az_angle', 'el_angle'))
+            az[selected] = hdrs.az_angle
+            el[selected] = hdrs.el_angle
+            time_ms[selected] = (hdrs.date.astype(np.int64) - 1) * 86400000 + hdrs.time_ms
+        return az, el, time_ms.astype('datetime64[ms]')
+
+    def _sweep_moment_gates(self, index):
+        """Find the moments in any radial of a sweep, along with their largest number of gates.
+
+        Returns the header of each moment from the first radial containing it, matching the
+        moments of the sweep arrays, paired with the number of gates.
+        """
+        moments = {}
+        for msg_type, offset in index:
+            _, radial = self._decode_radial(msg_type, offset, scale=False)
+            for name, (mom_hdr, vals) in (radial[1] if msg_type == 1
+                                          else radial.moments).items():
+                first_hdr, num_gates = moments.get(name, (mom_hdr, 0))
+                moments[name] = (first_hdr, max(num_gates, vals.size))
+        return moments
+
+    def _decode_sweep_arrays(self, index):
+        """Decode the radial messages for a sweep directly into arrays."""
+        num_radials = len(index)
+        moments = {}
+        for ind, (msg_type, offset) in enumerate(index):
+            hdr, radial = self._decode_radial(msg_type, offset, scale=False)
+            radial_moments = radial[1] if msg_type == 1 else radial.moments
+            for name, (mom_hdr, vals) in radial_moments.items():
+                if name not in moments:
+                    moments[name] = (mom_hdr, np.zeros((num_radials, vals.size),
+                                                       dtype=vals.dtype.newbyteorder('=')),
+                                     np.ones(num_radials), np.zeros(num_radials))
+                first_hdr, raw, scales, offsets = moments[name]
+
+                # Expand the gates if this radial has more than those seen previously
+                if vals.size > raw.shape[1]:
+                    raw = np.pad(raw, ((0, 0), (0, vals.size - raw.shape[1])))
+                    moments[name] = (first_hdr, raw, scales, offsets)
+
+                raw[ind, :vals.size] = vals
+                scales[ind] = mom_hdr.scale
+                offsets[ind] = mom_hdr.offset
+
+        # Radials without a moment were left as 0, which flags them as missing
+        for name, (mom_hdr, raw, scales, offsets) in moments.items():
+            if (scales == scales[0]).all() and (offsets == offsets[0]).all():
+                data = RawMomentData(raw, scales[0], offsets[0], self.MISSING,
+                                     self.RANGE_FOLD)
+            else:
+                data = RawMomentData(raw, scales[:, None], offsets[:, None], self.MISSING,
+                                     self.RANGE_FOLD)
+            moments[name] = (mom_hdr, data if self._raw_moments else data.values())
 
-        # Check if we have any message segments still in the buffer
-        if self._msg_buf:
-            log.warning('Remaining buffered messages segments for message type(s): %s',
-                        ' '.join(map(str, self._msg_buf)))
+        return self.Sweep(*self._sweep_coords(index), moments)
+
+    # CF/Radial standard names and units for the moments
+    moment_info = {'REF': ('equivalent_reflectivity_factor', 'dBZ'),
+                   'VEL': ('radial_velocity_of_scatterers_away_from_instrument', 'm/s'),
+                   'SW': ('doppler_spectrum_width', 'm/s'),
+                   'ZDR': ('log_differential_reflectivity_hv', 'dB'),
+                   'PHI': ('differential_phase_hv', 'degrees'),
+                   'RHO': ('cross_correlation_ratio_hv', 'dimensionless'),
+                   'CFP': ('clutter_filter_power_removed', 'dB')}
 
-        del self._msg_buf
+    def to_dataset(self, sweep, *, use_dask=False):
+        r"""Convert a sweep to an `xarray.Dataset` in polar coordinates.
+
+        The moments are given as 2D variables along the azimuth and range dimensions, with
+        the elevation and time of each radial as additional coordinates along the azimuth
+        dimension. Moments whose gates do not match those of the first moment are given their
+        own range dimension (e.g. ``range_VEL``).
+
+        Parameters
+        ----------
+        sweep : int
+            The index of the sweep to convert
+        use_dask : bool, optional
+            If `True`, the moments are returned as lazy `dask.array.Array` objects, so that
+            the sweep is only decoded when the values are needed. Only the coordinates are
+            decoded immediately. Requires dask. Defaults to `False`.
+
+        Returns
+        -------
+        `xarray.Dataset`
+
+        """
+        index = self._sweep_index[sweep]
+        if not index:
+            raise ValueError(f'Sweep {sweep} does not contain any radials.')
+
+        az, el, times = self._sweep_coords(index)
+        msg_type, offset = index[0]
+        hdr, radial = self._decode_radial(msg_type, offset, scale=False)
+
+        if use_dask:
+            import dask
+            import dask.array as da
+            delayed_sweep = dask.delayed(self.sweep_arrays.__getitem__, pure=True)(sweep)
+            moment_gates = self._sweep_moment_gates(index)
+        else:
+            moment_gates = {name: (mom_hdr, data.shape[1]) for name, (mom_hdr, data)
+                            in self.sweep_arrays[sweep].moments.items()}
+
+        coords = {'azimuth': ('azimuth', az, {'units': 'degrees',
+                                              'standard_name': 'ray_azimuth_angle'}),
+                  'elevation': ('azimuth', el, {'units': 'degrees',
+                                                'standard_name': 'ray_elevation_angle'}),
+                  'time': ('azimuth', times, {'standard_name': 'time'})}
+        data_vars = {}
+        ref_gates = None
+        for name, (mom_hdr, num_gates) in moment_gates.items():
+            str_name = name.decode('ascii') if isinstance(name, bytes) else name
+            if use_dask:
+                data = da.from_delayed(dask.delayed(_sweep_moment_values)(delayed_sweep, name,
+                                                                          num_gates,
+                                                                          self.MISSING),
+                                       shape=(len(index), num_gates), dtype=np.float64)
+            else:
+                data = np.asarray(self.sweep_arrays[sweep].moments[name][1])
+
+            # Use the common range dimension if the gates match, otherwise make a new one
+            gates = (mom_hdr.first_gate, mom_hdr.gate_width, data.shape[1])
+            range_dim = 'range' if ref_gates in (None, gates) else f'range_{str_name}'
+            if ref_gates is None:
+                ref_gates = gates
+            if range_dim not in coords:
+                ranges = 1000. * (mom_hdr.first_gate
+                                  + np.arange(data.shape[1]) * mom_hdr.gate_width)
+                coords[range_dim] = (range_dim, ranges,
+                                     {'units': 'm',
+                                      'standard_name': 'projection_range_coordinate',
+                                      'meters_to_center_of_first_gate': ranges[0],
+                                      'meters_between_gates': 1000. * mom_hdr.gate_width})
+
+            standard_name, units = self.moment_info.get(str_name, (None, None))
+            attrs = {'long_name': str_name}
+            if standard_name is not None:
+                attrs.update(standard_name=standard_name, units=units)
+            data_vars[str_name] = (('azimuth', range_dim), data, attrs)
+
+        attrs = {'Conventions': 'CF/Radial', 'sweep_number': sweep}
+        stid = getattr(self, 'stid', None) or getattr(hdr, 'stid', None)
+        if stid is not None:
+            attrs['instrument_name'] = stid.decode('ascii', 'ignore').strip('\x00 ')
+        vol_consts = getattr(radial, 'vol_consts', None)
+        if vol_consts is not None:
+            coords['latitude'] = ((), vol_consts.lat, {'units': 'degrees_north'})
+            coords['longitude'] = ((), vol_consts.lon, {'units': 'degrees_east'})
+            coords['altitude'] = ((), vol_consts.site_amsl + vol_consts.feedhorn_agl,
+                                  {'units': 'm'})
+
+        return xr.Dataset(data_vars, coords=coords, attrs=attrs)
 
     msg1_fmt = NamedStruct([('time_ms', 'L'), ('date', 'H'),
                             ('unamb_range', 'H', scaler(0.1)), ('az_angle', 'H', angle),
@@ -292,7 +863,7 @@ class Level2File:
     msg1_data_hdr = namedtuple('Msg1DataHdr',
                                'name first_gate gate_width num_gates scale offset')
 
-    def _decode_msg1(self, msg_hdr):
+    def _decode_msg1_radial(self, scale=True):
         msg_start = self._buffer.set_mark()
         hdr = self._buffer.read_struct(self.msg1_fmt)
         data_dict = {}
@@ -323,16 +894,11 @@ class Level2File:
             self._buffer.jump_to(msg_start, ptr)
             vals = self._buffer.read_array(data_hdr.num_gates, 'B')
 
-            # Scale and flag data
-            scaled_vals = (vals - data_hdr.offset) / data_hdr.scale
-            scaled_vals[vals == 0] = self.MISSING
-            scaled_vals[vals == 1] = self.RANGE_FOLD
+            # Store, scaling and flagging the data if requested
+            data_dict[data_hdr.name] = (data_hdr,
+                                        self._moment_data(data_hdr, vals) if scale else vals)
 
-            # Store
-            data_dict[data_hdr.name] = (data_hdr, scaled_vals)
-
-        self._add_sweep(hdr)
-        self.sweeps[-1].append((hdr, data_dict))
+        return hdr, (hdr, data_dict)
 
     msg2_fmt = NamedStruct([
         ('rda_status', 'H', BitField('None', 'Start-Up', 'Standby', 'Restart',
@@ -589,7 +1155,7 @@ class Level2File:
 
     Radial = namedtuple('Radial', 'header vol_consts elev_consts radial_consts moments')
 
-    def _decode_msg31(self, msg_hdr):
+    def _decode_msg31_radial(self, scale=True):
         msg_start = self._buffer.set_mark()
         data_hdr = self._buffer.read_struct(self.msg31_data_hdr_fmt)
         if data_hdr.compression:
@@ -624,16 +1190,11 @@ class Level2File:
                     # TODO: The correctness of this code is not tested
                     vals = self._buffer.read_array(count=hdr.num_gates,
                                                    dtype=f'>u{hdr.data_size // 8}')
-                    scaled_vals = (vals - hdr.offset) / hdr.scale
-                    scaled_vals[vals == 0] = self.MISSING
-                    scaled_vals[vals == 1] = self.RANGE_FOLD
-                    radial.moments[hdr.name.strip()] = (hdr, scaled_vals)
+                    radial.moments[hdr.name.strip()] = (
+                        hdr, self._moment_data(hdr, vals) if scale else vals)
                 else:
                     log.warning('Unknown Message 31 block type: %s', str(info[:4]))
 
-        self._add_sweep(data_hdr)
-        self.sweeps[-1].append(radial)
-
         if data_hdr.num_data_blks != block_count:
             log.warning('Incorrect number of blocks detected -- Got %d'
                         ' instead of %d', block_count, data_hdr.num_data_blks)
@@ -642,6 +1203,14 @@ class Level2File:
             log.info('Padding detected in message. Length encoded as %d but offset when '
                      'done is %d', data_hdr.rad_length, self._buffer.offset_from(msg_start))
 
+        return data_hdr, radial
+
+    def _moment_data(self, hdr, vals):
+        """Convert raw moment values to either scaled values or `RawMomentData`."""
+        data = RawMomentData(vals.astype(vals.dtype.newbyteorder('=')), hdr.scale, hdr.offset,
+                             self.MISSING, self.RANGE_FOLD)
+        return data if self._raw_moments else data.values()
+
     def _buffer_segment(self, msg_hdr):
         # Add to the buffer
         bufs = self._msg_buf.setdefault(msg_hdr.msg_type, {})
@@ -658,18 +1227,18 @@ class Level2File:
             self._msg_buf.pop(msg_hdr.msg_type)
             return b''.join(bytes(item[1]) for item in sorted(bufs.items()))
 
-    def _add_sweep(self, hdr):
-        if not self.sweeps and not hdr.rad_status & START_VOLUME:
+    def _add_sweep(self, rad_status, el_num):
+        if not self._sweep_index and not rad_status & START_VOLUME:
             log.warning('Missed start of volume!')
 
-        if hdr.rad_status & START_ELEVATION:
-            self.sweeps.append([])
+        if rad_status & START_ELEVATION:
+            self._sweep_index.append([])
 
-        if len(self.sweeps) != hdr.el_num:
+        if len(self._sweep_index) != el_num:
             log.warning('Missed elevation -- Have %d but data on %d.'
-                        ' Compensating...', len(self.sweeps), hdr.el_num)
-            while len(self.sweeps) < hdr.el_num:
-                self.sweeps.append([])
+                        ' Compensating...', len(self._sweep_index), el_num)
+            while len(self._sweep_index) < el_num:
+                self._sweep_index.append([])
 
     def _check_size(self, msg_hdr, size):
         hdr_size = msg_hdr.size_hw * 2 - self.msg_hdr_fmt.size
@@ -678,6 +1247,142 @@ class Level2File:
                         msg_hdr.msg_type, size, hdr_size)
 
 
+NexradResult = namedtuple('NexradResult', 'filename data error elapsed')
+NexradResult.__doc__ = """The result of reading a single file with `read_nexrad_files`."""
+
+
+def _timed_read(reader, filename, transform, kwargs):
+    """Read a file, returning the result along with any error and the time taken."""
+    start = time.perf_counter()
+    try:
+        data = reader(filename, **kwargs)
+        if transform is not None:
+            data = transform(data)
+        error = None
+    except Exception as e:  # noqa: B902
+        data, error = None, e
+    return NexradResult(filename, data, error, time.perf_counter() - start)
+
+
+@exporter.export
+def read_nexrad_files(filenames, reader=Level2File, *, transform=None, workers=None,
+                      executor=None, **kwargs):
+    r"""Read many NEXRAD files concurrently using a pool of workers.
+
+    Results are yielded as each file finishes, so they will generally not be in the same
+    order as `filenames`. Failing to read a file does not stop the others from being read;
+    instead, the error is returned in the result for that file.
+
+    Parameters
+    ----------
+    filenames : iterable of str or `pathlib.Path`
+        The files to read
+    reader : callable, optional
+        The class (or function) used to read each file, called as ``reader(filename,
+        **kwargs)``. Defaults to `Level2File`; `Level3File` can also be used.
+    transform : callable, optional
+        Called on each decoded file within the worker, with its return value used as the
+        result. This allows reducing the decoded files to just the needed data, e.g.
+        ``functools.partial(Level2File.to_dataset, sweep=0)``. The decoded file objects
+        themselves cannot be sent between processes, so this is required when using a pool of
+        processes.
+    workers : int, optional
+        The maximum number of workers to use. Defaults to `None`, which uses the default for
+        the pool.
+    executor : {'process', 'thread'} or `concurrent.futures.Executor`, optional
+        The kind of pool to use, or an existing executor to submit the files to, in which case
+        `workers` is ignored. Defaults to `None`, which uses a pool of processes when
+        `transform` is given and a pool of threads otherwise.
+    kwargs
+        Additional keyword arguments passed to `reader`
+
+    Yields
+    ------
+    NexradResult
+        A namedtuple with the `filename`, the decoded `data` (`None` if reading failed), the
+        `error` raised while reading the file (`None` on success), and the `elapsed` time in
+        seconds taken to read the file within the worker
+
+    """
+    if executor is None:
+        executor = 'thread' if transform is None else 'process'
+
+    # Check the arguments now, rather than when the results are first requested
+    if isinstance(executor, concurrent.futures.Executor):
+        return _read_nexrad_files(executor, filenames, reader, transform, kwargs)
+
+    pool_class = _pool_class(executor)
+    if transform is None and executor == 'process':
+        raise ValueError('A transform returning data that can be pickled is required when '
+                         'reading files with a pool of processes.')
+    return _read_nexrad_files_pool(pool_class, workers, filenames, reader, transform, kwargs)
+
+
+def _read_nexrad_files_pool(pool_class, workers, filenames, reader, transform, kwargs):
+    """Read the files with a new pool, which is shut down once all results are yielded."""
+    with pool_class(max_workers=workers) as pool:
+        yield from _read_nexrad_files(pool, filenames, reader, transform, kwargs)
+
+
+def _read_nexrad_files(pool, filenames, reader, transform, kwargs):
+    """Submit files to the pool and yield the results as they are completed."""
+    futures = {pool.submit(_timed_read, reader, filename, transform, kwargs): filename
+               for filename in filenames}
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # noqa: B902
+                # Failures outside of reading, e.g. sending the result back from the worker
+                yield NexradResult(futures[future], None, e, None)
+    finally:
+        # Don't leave pending files to be read if iteration is stopped early
+        for future in futures:
+            future.cancel()
+
+
+def _sweep_moment_values(sweep, name, num_gates, missing):
+    """Get the values of a moment from sweep arrays, with the specified number of gates."""
+    data = np.asarray(sweep.moments[name][1])
+    if data.shape[1] < num_gates:
+        data = np.pad(data, ((0, 0), (0, num_gates - data.shape[1])),
+                      constant_values=missing)
+    return data[:, :num_gates]
+
+
+class _LazySweeps(Sequence):
+    """Provide access to sweeps that are only decoded upon first access."""
+
+    def __init__(self, decoder, index):
+        """Initialize with a function to decode a sweep and the index of each sweep."""
+        self._decoder = decoder
+        self._index = index
+        self._cache = {}
+
+    def __getitem__(self, item):
+        """Return the decoded radials for the sweep(s), decoding as necessary."""
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('sweep index out of range')
+
+        if item not in self._cache:
+            self._cache[item] = self._decoder(self._index[item])
+        return self._cache[item]
+
+    def __len__(self):
+        """Return the number of sweeps."""
+        return len(self._index)
+
+    def invalidate(self, start):
+        """Discard any decoded sweeps starting at the given index, which may have changed."""
+        for item in [item for item in self._cache if item >= start]:
+            del self._cache[item]
+
+
 def reduce_lists(d):
     """Replace single item lists in a dictionary with the single item."""
     for field in d:
@@ -1008,6 +1713,11 @@ class LegacyMapper(DataMapper):
         self.lut = np.array(self.lut)
 
 
+Level3Header = namedtuple('Level3Header', 'filename siteID prod_code product_name vol_time '
+                                          'prod_time el_angle lat lon height metadata')
+Level3Header.__doc__ = """Basic information about a product from `Level3File.read_header`."""
+
+
 @exporter.export
 class Level3File:
     r"""Handle reading the wide array of NEXRAD Level 3 (NIDS) product files.
@@ -1618,7 +2328,7 @@ class Level3File:
                            (('el_angle', scaled_elem(2, 0.1)),
                             ('max', 3)))}
 
-    def __init__(self, filename):
+    def __init__(self, filename, *, apply_mapper=False, arrays=False):
         r"""Create instance of `Level3File`.
 
         Parameters
@@ -1626,15 +2336,22 @@ class Level3File:
         filename : str or file-like object
             If str, the name of the file to be opened. If file-like object,
             this will be read from directly.
+        apply_mapper : bool, optional
+            If `True`, `map_data` is applied to the data of the radial and raster packets
+            while decoding, with the resulting physical values stored under the ``'values'``
+            key of the packets. These are laid out like ``'data'``: a 2D array if `arrays` is
+            `True`, otherwise a list with an array for each radial or row. Defaults to `False`.
+        arrays : bool, optional
+            If `True`, decode the radial and raster packets into NumPy arrays: ``'start_az'``
+            and ``'end_az'`` as 1D arrays, and ``'data'`` as a 2D array of (radials x bins) or
+            (rows x columns), padded with 0. Otherwise, these are lists, with the data for each
+            radial or row as a separate item. Defaults to `False`.
 
         """
+        self._apply_mapper = apply_mapper
+        self._arrays = arrays
         fobj = open_as_needed(filename)
-        if isinstance(filename, str):
-            self.filename = filename
-        elif isinstance(filename, pathlib.Path):
-            self.filename = str(filename)
-        else:
-            self.filename = 'No File'
+        self._set_filename(filename)
 
         # Just read in the entire set of data at once
         with contextlib.closing(fobj):
@@ -1660,11 +2377,12 @@ class Level3File:
             return
 
         # Decompress the data if necessary, and if so, pop off new header
-        self._buffer = IOBuffer(self._buffer.read_func(zlib_decompress_all_frames))
+        if has_zlib_header(self._buffer.get_next(2)):
+            self._buffer = IOBuffer(self._buffer.read_func(zlib_decompress_all_frames))
         self._process_wmo_header()
 
         # Check for empty product
-        if len(self._buffer) == 0:
+        if self._buffer.at_end():
             log.warning('%s: Empty product!', self.filename)
             return
 
@@ -1698,40 +2416,7 @@ class Level3File:
                 assert self.gsm.block_len == 82
             return
 
-        self.prod_desc = self._buffer.read_struct(self.prod_desc_fmt)
-        log.debug('Product description block: %s', self.prod_desc)
-
-        # Convert thresholds and dependent values to lists of values
-        self.thresholds = [getattr(self.prod_desc, f'thr{i}') for i in range(1, 17)]
-        self.depVals = [getattr(self.prod_desc, f'dep{i}') for i in range(1, 11)]
-
-        # Set up some time/location metadata
-        self.metadata['msg_time'] = nexrad_to_datetime(self.header.date,
-                                                       self.header.time * 1000)
-        self.metadata['vol_time'] = nexrad_to_datetime(self.prod_desc.vol_date,
-                                                       self.prod_desc.vol_start_time * 1000)
-        self.metadata['prod_time'] = nexrad_to_datetime(self.prod_desc.prod_gen_date,
-                                                        self.prod_desc.prod_gen_time * 1000)
-        self.lat = self.prod_desc.lat * 0.001
-        self.lon = self.prod_desc.lon * 0.001
-        self.height = self.prod_desc.height
-
-        # Handle product-specific blocks. Default to compression and elevation angle
-        # Also get other product specific information, like name,
-        # maximum range, and how to map data bytes to values
-        default = ('Unknown Product', 230., LegacyMapper,
-                   (('el_angle', scaled_elem(2, 0.1)), ('compression', 7),
-                    ('uncompressed_size', combine_elem(8, 9)), ('defaultVals', 0)))
-        self.product_name, self.max_range, mapper, meta = self.prod_spec_map.get(
-            self.header.code, default)
-        log.debug('Product info--name: %s max_range: %f mapper: %s metadata: %s',
-                  self.product_name, self.max_range, mapper, meta)
-
-        for name, block in meta:
-            if callable(block):
-                self.metadata[name] = block(self.depVals)
-            else:
-                self.metadata[name] = self.depVals[block]
+        mapper = self._read_prod_desc()
 
         # Now that we have the header, we have everything needed to make tables
         # Store as class that can be called
@@ -1777,6 +2462,137 @@ class Level3File:
             log.warning('%s: Using default metadata for product %d',
                         self.filename, self.header.code)
 
+    def close(self):
+        """Release the product's data, including any memory-mapping of the file.
+
+        This is called upon leaving a ``with`` block.
+        """
+        self._buffer.close()
+
+    def __enter__(self):
+        """Enter the runtime context for the product."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit the runtime context for the product, closing it."""
+        self.close()
+
+    # Enough data to hold the WMO header, message header, and product description block
+    _probe_size = 1024
+
+    @classmethod
+    def read_header(cls, filename):
+        r"""Read only the headers at the start of a product.
+
+        This reads just the WMO header, message header, and product description block,
+        decompressing only the start of the product if necessary, which is much faster than
+        decoding the full product when only the basic information is needed, e.g. when
+        building an inventory of many products.
+
+        Parameters
+        ----------
+        filename : str or file-like object
+            If str, the name of the file to be opened. If file-like object,
+            this will be read from directly.
+
+        Returns
+        -------
+        Level3Header
+            A namedtuple with the `filename`, `siteID`, `prod_code`, `product_name`,
+            `vol_time`, `prod_time`, `el_angle`, `lat`, `lon`, and `height` of the product, as
+            well as the product's `metadata`. Values not available for the product (such as
+            the elevation angle of volume products) are `None`.
+
+        """
+        self = cls.__new__(cls)
+        self._set_filename(filename)
+        self.metadata = {}
+        self.product_name = None
+        self.prod_desc = None
+
+        fobj = open_as_needed(filename)
+        with contextlib.closing(fobj):
+            self._buffer = IOBuffer(fobj.read(cls._probe_size))
+            self._process_wmo_header()
+
+            # Decompress only the start of the first zlib frame
+            if self.wmo_code != 'NOUS' and has_zlib_header(self._buffer.get_next(2)):
+                decomp = zlib.decompressobj()
+                data = decomp.decompress(self._buffer.read())
+                while len(data) < cls._probe_size and not decomp.eof:
+                    chunk = fobj.read(cls._probe_size)
+                    if not chunk:
+                        break
+                    data += decomp.decompress(chunk)
+                self._buffer = IOBuffer(data)
+                self._process_wmo_header()
+
+        if self.wmo_code == 'NOUS':
+            self.product_name = 'Free Text Message'
+        elif not self._buffer.at_end():
+            self.header = self._buffer.read_struct(self.header_fmt)
+            if self.header.code == 2:
+                self.product_name = 'General Status Message'
+            else:
+                self._read_prod_desc()
+
+        return Level3Header(self.filename, getattr(self, 'siteID', ''),
+                            self.prod_desc.prod_code if self.prod_desc else None,
+                            self.product_name, self.metadata.get('vol_time'),
+                            self.metadata.get('prod_time'), self.metadata.get('el_angle'),
+                            getattr(self, 'lat', None), getattr(self, 'lon', None),
+                            getattr(self, 'height', None), self.metadata)
+
+    def _set_filename(self, filename):
+        if isinstance(filename, str):
+            self.filename = filename
+        elif isinstance(filename, pathlib.Path):
+            self.filename = str(filename)
+        else:
+            self.filename = 'No File'
+
+    def _read_prod_desc(self):
+        """Read the product description block and the metadata it contains.
+
+        Returns the class of mapper to use for the product's data.
+        """
+        self.prod_desc = self._buffer.read_struct(self.prod_desc_fmt)
+        log.debug('Product description block: %s', self.prod_desc)
+
+        # Convert thresholds and dependent values to lists of values
+        self.thresholds = [getattr(self.prod_desc, f'thr{i}') for i in range(1, 17)]
+        self.depVals = [getattr(self.prod_desc, f'dep{i}') for i in range(1, 11)]
+
+        # Set up some time/location metadata
+        self.metadata['msg_time'] = nexrad_to_datetime(self.header.date,
+                                                       self.header.time * 1000)
+        self.metadata['vol_time'] = nexrad_to_datetime(self.prod_desc.vol_date,
+                                                       self.prod_desc.vol_start_time * 1000)
+        self.metadata['prod_time'] = nexrad_to_datetime(self.prod_desc.prod_gen_date,
+                                                        self.prod_desc.prod_gen_time * 1000)
+        self.lat = self.prod_desc.lat * 0.001
+        self.lon = self.prod_desc.lon * 0.001
+        self.height = self.prod_desc.height
+
+        # Handle product-specific blocks. Default to compression and elevation angle
+        # Also get other product specific information, like name,
+        # maximum range, and how to map data bytes to values
+        default = ('Unknown Product', 230., LegacyMapper,
+                   (('el_angle', scaled_elem(2, 0.1)), ('compression', 7),
+                    ('uncompressed_size', combine_elem(8, 9)), ('defaultVals', 0)))
+        self.product_name, self.max_range, mapper, meta = self.prod_spec_map.get(
+            self.header.code, default)
+        log.debug('Product info--name: %s max_range: %f mapper: %s metadata: %s',
+                  self.product_name, self.max_range, mapper, meta)
+
+        for name, block in meta:
+            if callable(block):
+                self.metadata[name] = block(self.depVals)
+            else:
+                self.metadata[name] = self.depVals[block]
+
+        return mapper
+
     def _process_wmo_header(self):
         # Read off the WMO header if necessary
         data = self._buffer.get_next(64).decode('ascii', 'ignore')
@@ -1797,12 +2613,32 @@ class Level3File:
 
     @staticmethod
     def _unpack_rle_data(data):
-        # Unpack Run-length encoded data
-        unpacked = []
-        for run in data:
-            num, val = run >> 4, run & 0x0F
-            unpacked.extend([val] * num)
-        return unpacked
+        # Unpack Run-length encoded data--each byte holds the run length in the upper nibble
+        # and the value in the lower one
+        runs = np.frombuffer(bytes(data), dtype=np.uint8)
+        return np.repeat(runs & 0x0F, runs >> 4).tolist()
+
+    @staticmethod
+    def _unpack_rle_rows(rows, num_cols=0):
+        """Unpack a collection of run-length encoded rows at once into a 2D array.
+
+        The number of columns is the larger of `num_cols` and the longest row, with any
+        shorter rows padded with 0.
+        """
+        runs = np.frombuffer(b''.join(rows), dtype=np.uint8)
+        counts = runs >> 4
+
+        # Figure out the row of each run and the length of each unpacked row
+        row_ind = np.repeat(np.arange(len(rows)), [len(row) for row in rows])
+        row_lens = np.bincount(row_ind, weights=counts, minlength=len(rows)).astype(np.intp)
+        out = np.zeros((len(rows), max(num_cols, row_lens.max(initial=0))), dtype=np.uint8)
+
+        # Place each unpacked value at its position within its row
+        val_rows = np.repeat(row_ind, counts)
+        row_starts = np.cumsum(row_lens) - row_lens
+        cols = np.arange(val_rows.size) - row_starts[val_rows]
+        out[val_rows, cols] = np.repeat(runs & 0x0F, counts)
+        return out
 
     @staticmethod
     def pos_scale(is_sym_block):
@@ -1940,14 +2776,16 @@ class Level3File:
             rad = self._buffer.read_struct(rad_fmt)
             start_az = rad.start_angle * 0.1
             end_az = start_az + rad.angle_delta * 0.1
-            rads.append((start_az, end_az,
-                         self._unpack_rle_data(
-                             self._buffer.read_binary(2 * rad.num_hwords))))
+            rads.append((start_az, end_az, self._buffer.read_binary(2 * rad.num_hwords)))
         start, end, vals = zip(*rads)
-        return {'start_az': list(start), 'end_az': list(end), 'data': list(vals),
-                'center': (hdr.i_center * self.pos_scale(in_sym_block),
-                           hdr.j_center * self.pos_scale(in_sym_block)),
-                'gate_scale': hdr.scale_factor * 0.001, 'first': hdr.ind_first_bin}
+        return self._finish_packet(
+            {'center': (hdr.i_center * self.pos_scale(in_sym_block),
+                        hdr.j_center * self.pos_scale(in_sym_block)),
+             'gate_scale': hdr.scale_factor * 0.001, 'first': hdr.ind_first_bin},
+            lambda: {'start_az': np.array(start), 'end_az': np.array(end),
+                     'data': self._unpack_rle_rows(vals, hdr.nbins)},
+            lambda: {'start_az': list(start), 'end_az': list(end),
+                     'data': [self._unpack_rle_data(val) for val in vals]})
 
     digital_radial_hdr_fmt = NamedStruct([('ind_first_bin', 'H'), ('nbins', 'H'),
                                           ('i_center', 'h'), ('j_center', 'h'),
@@ -1958,17 +2796,78 @@ class Level3File:
 
     def _unpack_packet_digital_radial(self, code, in_sym_block):
         hdr = self._buffer.read_struct(self.digital_radial_hdr_fmt)
-        rads = []
-        for _ in range(hdr.num_rad):
-            rad = self._buffer.read_struct(self.digital_radial_fmt)
-            start_az = rad.start_angle * 0.1
-            end_az = start_az + rad.angle_delta * 0.1
-            rads.append((start_az, end_az, self._buffer.read_binary(rad.num_bytes)))
-        start, end, vals = zip(*rads)
-        return {'start_az': list(start), 'end_az': list(end), 'data': list(vals),
-                'center': (hdr.i_center * self.pos_scale(in_sym_block),
-                           hdr.j_center * self.pos_scale(in_sym_block)),
-                'gate_scale': hdr.scale_factor * 0.001, 'first': hdr.ind_first_bin}
+
+        # The radials are normally all the same size, which allows reading them all at once
+        rads = self._read_digital_radials(hdr.num_rad)
+        if rads is not None:
+            start_angle = rads['start_angle']
+            angle_delta = rads['angle_delta']
+            rows = rads['data']
+        else:
+            start_angle = np.empty(hdr.num_rad)
+            angle_delta = np.empty(hdr.num_rad)
+            rows = []
+            for ind in range(hdr.num_rad):
+                rad = self._buffer.read_struct(self.digital_radial_fmt)
+                start_angle[ind] = rad.start_angle
+                angle_delta[ind] = rad.angle_delta
+                rows.append(self._buffer.read_binary(rad.num_bytes))
+        start_az = start_angle * 0.1
+        end_az = start_az + angle_delta * 0.1
+
+        def as_arrays():
+            data = np.zeros((hdr.num_rad, hdr.nbins), dtype=np.uint8)
+            if rads is not None:
+                num_bins = min(hdr.nbins, rows.shape[1])
+                data[:, :num_bins] = rows[:, :num_bins]
+            else:
+                for ind, row in enumerate(rows):
+                    vals = np.frombuffer(row, dtype=np.uint8)[:hdr.nbins]
+                    data[ind, :vals.size] = vals
+            return {'start_az': start_az, 'end_az': end_az, 'data': data}
+
+        return self._finish_packet(
+            {'center': (hdr.i_center * self.pos_scale(in_sym_block),
+                        hdr.j_center * self.pos_scale(in_sym_block)),
+             'gate_scale': hdr.scale_factor * 0.001, 'first': hdr.ind_first_bin},
+            as_arrays,
+            lambda: {'start_az': start_az.tolist(), 'end_az': end_az.tolist(),
+                     'data': [bytearray(row) for row in rows]})
+
+    def _read_digital_radials(self, num_rad):
+        """Read all of the digital radials as a structured array, if they are the same size.
+
+        Returns `None`, leaving the buffer unchanged, if they are not.
+        """
+        num_bytes = int.from_bytes(self._buffer.get_next(2), 'big')
+        hdr_dtype = self.digital_radial_fmt.dtype
+        rad_dtype = np.dtype(hdr_dtype.descr + [('data', np.uint8, (num_bytes,))])
+        mark = self._buffer.set_mark()
+        try:
+            rads = self._buffer.read_array(num_rad, rad_dtype)
+        except ValueError:  # Not enough data left for that many radials of this size
+            return None
+
+        if np.any(rads['num_bytes'] != num_bytes):
+            self._buffer.jump_to(mark)
+            return None
+        return rads
+
+    def _finish_packet(self, packet, as_arrays, as_lists):
+        """Add the decoded data to the packet and apply the product's mapper as requested.
+
+        Only one of `as_arrays` and `as_lists` is called, depending on whether decoding into
+        arrays was requested, so that the data are only decoded once. The mapped values take
+        the same form as the data: a 2D array, or a list with an array for each radial or row.
+        """
+        packet = {**(as_arrays() if self._arrays else as_lists()), **packet}
+        if self._apply_mapper:
+            if self._arrays:
+                packet['values'] = self.map_data(packet['data'])
+            else:
+                packet['values'] = [self.map_data(np.asarray(row, dtype=np.uint8))
+                                    for row in packet['data']]
+        return packet
 
     def _unpack_packet_raster_data(self, code, in_sym_block):
         hdr_fmt = NamedStruct([('code', 'L'),
@@ -1982,9 +2881,12 @@ class Level3File:
         rows = []
         for _ in range(hdr.num_rows):
             num_bytes = self._buffer.read_int(2, 'big', signed=False)
-            rows.append(self._unpack_rle_data(self._buffer.read_binary(num_bytes)))
-        return {'start_x': hdr.i_start * hdr.xscale_int,
-                'start_y': hdr.j_start * hdr.yscale_int, 'data': rows}
+            rows.append(self._buffer.read_binary(num_bytes))
+        return self._finish_packet({'start_x': hdr.i_start * hdr.xscale_int,
+                                    'start_y': hdr.j_start * hdr.yscale_int},
+                                   lambda: {'data': self._unpack_rle_rows(rows)},
+                                   lambda: {'data': [self._unpack_rle_data(row)
+                                                     for row in rows]})
 
     def _unpack_packet_uniform_text(self, code, in_sym_block):
         # By not using a struct, we can handle multiple codes
@@ -2242,7 +3144,7 @@ class Level3File:
 
     def _read_trends(self):
         num_vols, latest = self._buffer.read(2)
-        vals = [self._buffer.read_int(2, 'big', signed=True) for _ in range(num_vols)]
+        vals = self._buffer.read_array(num_vols, '>i2').tolist()
 
         # Wrap the circular buffer so that latest is last
         vals = vals[latest:] + vals[:latest]
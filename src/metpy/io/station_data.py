@@ -3,11 +3,18 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Pull out station metadata."""
 from collections import namedtuple
+import contextlib
+import os
+from pathlib import Path
+import zipfile
 
 import numpy as np
 import pandas as pd
+import pooch
+from scipy.spatial import cKDTree
 
 from ..cbook import get_test_data
+from ..constants import earth_avg_radius
 from ..package_tools import Exporter
 from ..units import units
 
@@ -122,19 +129,275 @@ def _read_airports_file(input_file=None):
 
 
 class StationLookup:
-    """Look up station information from multiple sources."""
+    """Look up station information from multiple sources.
 
-    def __init__(self):
-        """Initialize different files."""
-        self._sources = [dict(_read_station_table()), dict(_read_master_text_file()),
-                         dict(_read_station_text_file()), dict(_read_airports_file())]
+    The station tables are only read upon the first lookup. They are merged into a single
+    table, sorted by station ID, which is saved in a binary index within the user cache
+    directory so that later sessions do not need to parse the tables again. The index is
+    rebuilt whenever any of the tables changes.
+
+    Besides looking up stations by ID, stations can be found by location using
+    :meth:`nearest`, :meth:`within_radius`, and :meth:`within_bounds`. These use a KD-tree of
+    the station locations, which is built once for the merged table.
+    """
+
+    # Readers for the station tables, in the order in which they are searched for a station
+    readers = {'sfstns.tbl': _read_station_table, 'master.txt': _read_master_text_file,
+               'stations.txt': _read_station_text_file}
+
+    # Version of the layout of the cached index, to be incremented whenever it changes
+    index_version = 2
+
+    def __init__(self, cache_dir=None):
+        """Initialize the lookup without reading any tables.
+
+        Parameters
+        ----------
+        cache_dir : str or `pathlib.Path`, optional
+            Directory in which the index of stations is saved. Defaults to MetPy's directory
+            within the user cache directory.
+
+        """
+        self.cache_dir = Path(pooch.os_cache('metpy') if cache_dir is None else cache_dir)
+        self._table = None
+        self._sources = None
+        self._tree = None
+
+    @property
+    def table(self):
+        """Return the merged station table as a structured array sorted by station ID."""
+        if self._table is None:
+            self._load()
+        return self._table
+
+    def _load(self):
+        """Load the station index from the cache, or build it from the station tables."""
+        files = [get_test_data(fname, as_file_obj=False) for fname in self.readers]
+        signature = np.array([str(self.index_version)]
+                             + [f'{fname}:{stat.st_size}:{stat.st_mtime_ns}'
+                                for fname, stat in zip(files, map(os.stat, files))])
+        index_file = self.cache_dir / 'station_index.npz'
+        self._sources = files
+        self._tree = None
+
+        try:
+            with np.load(index_file) as index:
+                if np.array_equal(index['signature'], signature):
+                    self._table = index['stations']
+                    return
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+
+        self._table = self._build_table(files)
+
+        # Write to a temporary file first so that other processes never see a partial index.
+        # Not being able to save the index only makes the next session slower.
+        with contextlib.suppress(OSError):
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_dir / f'station_index.{os.getpid()}.npz'
+            np.savez(tmp_file, stations=self._table, signature=signature)
+            os.replace(tmp_file, index_file)
+
+    def _build_table(self, files):
+        """Merge the station tables, preferring the tables that are searched first.
+
+        Within a single table, the last entry for a station ID is kept.
+        """
+        stations = {}
+        for source, (reader, fname) in enumerate(zip(self.readers.values(), files)):
+            for stid, info in dict(reader(fname)).items():
+                if stid not in stations:
+                    stations[stid] = info._replace(synop_id=str(info.synop_id),
+                                                   source=source)
+
+        ids = sorted(stations)
+        columns = {}
+        for field, values in zip(Station._fields, zip(*(stations[stid] for stid in ids))):
+            if field in ('longitude', 'latitude', 'altitude'):
+                columns[field] = np.array(values, dtype=float)
+            elif field == 'source':
+                columns[field] = np.array(values, dtype=np.int8)
+            else:
+                columns[field] = np.array(values, dtype=str)
+
+        table = np.empty(len(ids),
+                         dtype=[(field, col.dtype) for field, col in columns.items()])
+        for field, col in columns.items():
+            table[field] = col
+        return table
+
+    def _station(self, ind):
+        """Create the `Station` for an entry in the merged table."""
+        *info, source = self.table[ind].item()
+        return Station(*info, source=self._sources[source])
+
+    def _find(self, stid):
+        """Find the index of a station ID within the merged table, or -1 if missing."""
+        if not isinstance(stid, str):
+            return -1
+        ids = self.table['id']
+        ind = np.searchsorted(ids, stid)
+        return ind if ind < len(ids) and ids[ind] == stid else -1
+
+    def _find_all(self, stids):
+        """Find the indices of many station IDs within the merged table, -1 where missing."""
+        # Only search for each distinct ID once
+        codes, uniques = pd.factorize(np.asarray(stids, dtype=object).ravel())
+        is_id = np.array([isinstance(stid, str) for stid in uniques], dtype=bool)
+        uniques = np.where(is_id, uniques, '').astype(str)
+
+        ids = self.table['id']
+        inds = np.searchsorted(ids, uniques)
+        found = inds < len(ids)
+        found[found] &= ids[inds[found]] == uniques[found]
+        inds = np.where(found & is_id, inds, -1)
+
+        # Missing values have a code of -1, which picks the appended -1
+        return np.append(inds, -1)[codes].reshape(np.shape(stids))
+
+    def coordinates(self, stids):
+        """Look up the locations of many stations at once.
+
+        Parameters
+        ----------
+        stids : array-like of str
+            The station IDs to look up
+
+        Returns
+        -------
+        latitude, longitude, altitude : `numpy.ndarray`
+            The latitude and longitude (in degrees) and altitude (in meters) of each station,
+            with the same shape as `stids`. These are NaN for stations without information.
+
+        """
+        inds = self._find_all(stids)
+        missing = inds < 0
+        rows = self.table[np.where(missing, 0, inds)]
+        return tuple(np.where(missing, np.nan, rows[field])
+                     for field in ('latitude', 'longitude', 'altitude'))
 
     def __getitem__(self, stid):
         """Lookup station information from the ID."""
-        for table in self._sources:
-            if stid in table:
-                return table[stid]
-        raise KeyError(f'No station information for {stid}')
+        ind = self._find(stid)
+        if ind < 0:
+            raise KeyError(f'No station information for {stid}')
+        return self._station(ind)
+
+    def __contains__(self, stid):
+        """Return whether there is information for a station ID."""
+        return self._find(stid) >= 0
+
+    def __len__(self):
+        """Return the number of stations."""
+        return len(self.table)
+
+    @property
+    def _kdtree(self):
+        """Return a KD-tree of the station locations as points on the unit sphere."""
+        if self._tree is None:
+            self._tree = cKDTree(_unit_vectors(self.table['latitude'],
+                                               self.table['longitude']))
+        return self._tree
+
+    def nearest(self, latitude, longitude, k=1):
+        """Find the stations nearest to many points at once.
+
+        Parameters
+        ----------
+        latitude : array-like
+            The latitude of the points, in degrees
+        longitude : array-like
+            The longitude of the points, in degrees
+        k : int, optional
+            The number of nearest stations to find for each point. Defaults to 1. No more
+            stations than are in `table` are found.
+
+        Returns
+        -------
+        distance : `pint.Quantity`
+            The great circle distance to the stations found, with the shape of the points, plus
+            a trailing dimension of size `k` if `k` is greater than 1
+        stations : `numpy.ndarray`
+            The records from `table` for the stations found, with the same shape as
+            `distance`, ordered from nearest to farthest
+
+        """
+        if k > 1:
+            # Asking for the nearest stations by rank keeps the trailing dimension even when
+            # there are fewer stations than requested
+            k = np.arange(1, min(k, len(self.table)) + 1)
+        chord, inds = self._kdtree.query(_unit_vectors(latitude, longitude), k=k)
+        return _chord_to_distance(chord), self.table[inds]
+
+    def within_radius(self, latitude, longitude, radius):
+        """Find all stations within a distance of many points at once.
+
+        Parameters
+        ----------
+        latitude : array-like
+            The latitude of the points, in degrees
+        longitude : array-like
+            The longitude of the points, in degrees
+        radius : `pint.Quantity`
+            The great circle distance from each point within which to find stations
+
+        Returns
+        -------
+        `numpy.ndarray`
+            The records from `table` for the stations found, sorted by ID, for a single point.
+            For several points, an object array with the shape of the points holding the
+            records found for each point.
+
+        """
+        angle = (radius / earth_avg_radius).m_as('dimensionless')
+        chord = 2 * np.sin(np.minimum(angle, np.pi) / 2)
+        found = self._kdtree.query_ball_point(_unit_vectors(latitude, longitude), chord)
+        if isinstance(found, list):
+            return self.table[sorted(found)]
+
+        stations = np.empty(found.shape, dtype=object)
+        for ind, inds in np.ndenumerate(found):
+            stations[ind] = self.table[sorted(inds)]
+        return stations
+
+    def within_bounds(self, west, south, east, north):
+        """Find all stations within a box of latitude and longitude.
+
+        Parameters
+        ----------
+        west : float
+            The western edge of the box, in degrees longitude
+        south : float
+            The southern edge of the box, in degrees latitude
+        east : float
+            The eastern edge of the box, in degrees longitude. If less than `west`, the box
+            crosses the antimeridian.
+        north : float
+            The northern edge of the box, in degrees latitude
+
+        Returns
+        -------
+        `numpy.ndarray`
+            The records from `table` for the stations found, sorted by ID
+
+        """
+        lat = self.table['latitude']
+        lon = (self.table['longitude'] - west) % 360
+        width = 360 if east - west >= 360 else (east - west) % 360
+        return self.table[(lat >= south) & (lat <= north) & (lon <= width)]
+
+
+def _unit_vectors(latitude, longitude):
+    """Convert latitude and longitude in degrees to points on the unit sphere."""
+    lat = np.radians(latitude)
+    lon = np.radians(longitude)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)],
+                    axis=-1)
+
+
+def _chord_to_distance(chord):
+    """Convert the length of chords of the unit sphere to great circle distances."""
+    return 2 * np.arcsin(np.minimum(chord, 2) / 2) * earth_avg_radius
 
 
 with exporter:
@@ -161,14 +424,5 @@ def add_station_lat_lon(df, stn_var):
     `pandas.DataFrame` that contains original Dataframe now with the latitude and longitude
     values for each location found in `station_info`.
     """
-    df['latitude'] = None
-    df['longitude'] = None
-    for stn in df[stn_var].unique():
-        try:
-            info = station_info[stn]
-            df.loc[df[stn_var] == stn, 'latitude'] = info.latitude
-            df.loc[df[stn_var] == stn, 'longitude'] = info.longitude
-        except KeyError:
-            df.loc[df[stn_var] == stn, 'latitude'] = np.nan
-            df.loc[df[stn_var] == stn, 'longitude'] = np.nan
+    df['latitude'], df['longitude'], _ = station_info.coordinates(df[stn_var].values)
     return df
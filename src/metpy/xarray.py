@@ -1442,9 +1442,10 @@ def add_vertical_dim_from_xarray(func):
             if isinstance(value, xr.DataArray)
         ]
 
-        # Fill in vertical_dim
+        # Fill in vertical_dim; with one dimension, there is nothing to look up
         if (
             len(dataarray_arguments) > 0
+            and dataarray_arguments[0].ndim > 1
             and 'vertical_dim' in bound_args.arguments
         ):
             try:
@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test the `thermo` module."""
 
+import warnings
+
 import numpy as np
 import pytest
 import xarray as xr
@@ -141,6 +143,54 @@ def test_moist_lapse_ref_pres():
     assert_array_almost_equal(temp, true_temp, 2)
 
 
+def test_moist_lapse_grid():
+    """Test moist_lapse lifting a parcel in every column of a grid."""
+    pressure = np.array([1000., 800., 600., 500., 400.])[:, None, None] * units.mbar
+    pressure = pressure * np.linspace(0.9, 1.05, 6).reshape(1, 2, 3)
+    temperature = np.array([[288., 293., 298.], [275., 300., 250.]]) * units.kelvin
+    temp = moist_lapse(pressure, temperature)
+
+    # Grids are integrated with a different scheme than single profiles
+    assert temp.shape == pressure.shape
+    for j, i in np.ndindex(*temperature.shape):
+        assert_array_almost_equal(temp[:, j, i],
+                                  moist_lapse(pressure[:, j, i], temperature[j, i]), 4)
+
+
+def test_moist_lapse_grid_vertical_dim():
+    """Test moist_lapse on a grid with a vertical dimension other than the first."""
+    pressure = np.tile([1000., 800., 600., 500., 400.], (3, 1)) * units.mbar
+    temperature = np.array([290., 293., 300.]) * units.kelvin
+    temp = moist_lapse(pressure, temperature, 1000. * units.mbar, vertical_dim=1)
+
+    true_temp = np.array([293, 284.64, 272.81, 264.42, 252.91]) * units.kelvin
+    assert temp.shape == (3, 5)
+    assert_array_almost_equal(temp[1], true_temp, 2)
+
+
+def test_moist_lapse_grid_ref_pres():
+    """Test moist_lapse on a grid with reference pressures in the middle of the columns."""
+    pressure = np.array([[1050., 800., 600., 500., 400.],
+                         [400., 500., 600., 800., 1050.]]).T * units.mbar
+    temp = moist_lapse(pressure, np.array([19.85, 19.85]) * units.degC,
+                       np.array([1000., 1000.]) * units.mbar)
+
+    true_temp = np.array([294.76, 284.64, 272.81, 264.42, 252.91]) * units.kelvin
+    assert_array_almost_equal(temp[:, 0], true_temp, 2)
+    assert_array_almost_equal(temp[::-1, 1], true_temp, 2)
+
+
+def test_moist_lapse_grid_nan():
+    """Test that missing values in one column do not affect the others."""
+    pressure = np.array([[1000., 800., 600., 500., 400.],
+                         [1000., 800., np.nan, 500., 400.]]).T * units.mbar
+    temp = moist_lapse(pressure, np.array([293., np.nan]) * units.kelvin)
+
+    true_temp = np.array([293, 284.64, 272.81, 264.42, 252.91]) * units.kelvin
+    assert_array_almost_equal(temp[:, 0], true_temp, 2)
+    assert np.all(np.isnan(temp[:, 1]))
+
+
 def test_parcel_profile():
     """Test parcel profile calculation."""
     levels = np.array([1000., 900., 800., 700., 600., 500., 400.]) * units.mbar
@@ -1725,6 +1775,151 @@ def test_cape_cin_value_error():
     assert_almost_equal(cin, expected_cin, 3)
 
 
+@pytest.fixture
+def sounding_grid(multiple_intersections):
+    """Create a grid of soundings of different lengths, padded with missing values."""
+    levels, temperatures, dewpoints = multiple_intersections
+    pressure = np.full((len(levels), 2, 2), np.nan)
+    temperature = np.full_like(pressure, np.nan)
+    dewpoint = np.full_like(pressure, np.nan)
+
+    pressure[:, 0, 0] = levels.m
+    temperature[:, 0, 0] = temperatures.m
+    dewpoint[:, 0, 0] = dewpoints.m
+
+    # A warmer sounding with a missing temperature
+    pressure[:, 0, 1] = levels.m
+    temperature[:, 0, 1] = temperatures.m + 3
+    temperature[10, 0, 1] = np.nan
+    dewpoint[:, 0, 1] = dewpoints.m
+
+    # A short sounding, at the start and end of the column
+    pressure[:6, 1, 0] = pressure[-6:, 1, 1] = [959., 779.2, 751.3, 724.3, 700., 269.]
+    temperature[:6, 1, 0] = temperature[-6:, 1, 1] = [22.2, 14.6, 12., 9.4, 7., -38.]
+    dewpoint[:6, 1, 0] = dewpoint[-6:, 1, 1] = [19., -11.2, -10.8, -10.4, -10., -53.2]
+
+    return pressure * units.mbar, temperature * units.degC, dewpoint * units.degC
+
+
+def test_parcel_profile_grid(sounding_grid):
+    """Test parcel profile calculation for a grid of soundings."""
+    pressure, temperature, dewpoint = sounding_grid
+    prof = parcel_profile(pressure, temperature, dewpoint)
+
+    assert prof.shape == pressure.shape
+    for j, i in np.ndindex(2, 2):
+        valid = ~np.isnan(pressure[:, j, i])
+        assert np.all(np.isnan(prof[~valid, j, i]))
+        assert_array_almost_equal(
+            prof[valid, j, i],
+            parcel_profile(pressure[valid, j, i], temperature[valid, j, i][0],
+                           dewpoint[valid, j, i][0]), 4)
+
+
+def test_parcel_profile_grid_vertical_dim(sounding_grid):
+    """Test parcel profile calculation for a grid with levels along the last dimension."""
+    pressure, temperature, dewpoint = sounding_grid
+    prof = parcel_profile(np.moveaxis(pressure, 0, -1), temperature[0], dewpoint[0],
+                          vertical_dim=-1)
+    assert_array_almost_equal(np.moveaxis(prof, -1, 0)[:, 0],
+                              parcel_profile(pressure[:, 0], temperature[0, 0],
+                                             dewpoint[0, 0]), 4)
+
+
+@pytest.mark.parametrize('which', ['top', 'bottom'])
+def test_lfc_el_grid(sounding_grid, which):
+    """Test that the LFC and EL of a grid of soundings match those of each sounding."""
+    pressure, temperature, dewpoint = sounding_grid
+    lfc_pressure, lfc_temperature = lfc(pressure, temperature, dewpoint, which=which)
+    el_pressure, el_temperature = el(pressure, temperature, dewpoint, which=which)
+
+    # Moist adiabats are integrated differently for grids than for single soundings
+    for j, i in np.ndindex(2, 2):
+        column = pressure[:, j, i], temperature[:, j, i], dewpoint[:, j, i]
+        truth_pressure, truth_temperature = lfc(*column, which=which)
+        assert_almost_equal(lfc_pressure[j, i], truth_pressure, 2)
+        assert_almost_equal(lfc_temperature[j, i], truth_temperature, 2)
+        truth_pressure, truth_temperature = el(*column, which=which)
+        assert_almost_equal(el_pressure[j, i], truth_pressure, 2)
+        assert_almost_equal(el_temperature[j, i], truth_temperature, 2)
+
+
+@pytest.mark.parametrize('which_lfc', ['top', 'bottom'])
+@pytest.mark.parametrize('which_el', ['top', 'bottom'])
+def test_cape_cin_grid(sounding_grid, which_lfc, which_el):
+    """Test that CAPE and CIN for a grid of soundings match those of each sounding."""
+    pressure, temperature, dewpoint = sounding_grid
+    prof = parcel_profile(pressure, temperature, dewpoint)
+    cape, cin = cape_cin(pressure, temperature, dewpoint, prof, which_lfc=which_lfc,
+                         which_el=which_el)
+
+    for j, i in np.ndindex(2, 2):
+        truth_cape, truth_cin = cape_cin(pressure[:, j, i], temperature[:, j, i],
+                                         dewpoint[:, j, i], prof[:, j, i],
+                                         which_lfc=which_lfc, which_el=which_el)
+        assert_almost_equal(cape[j, i], truth_cape, 2)
+        assert_almost_equal(cin[j, i], truth_cin, 2)
+
+
+def test_surface_based_cape_cin_grid(sounding_grid):
+    """Test surface-based CAPE and CIN for a grid with levels along the last dimension."""
+    pressure, temperature, dewpoint = sounding_grid
+    cape, cin = surface_based_cape_cin(*(np.moveaxis(var, 0, -1) for var in sounding_grid),
+                                       vertical_dim=-1)
+
+    assert_array_almost_equal(cape[1], [75.7360, 75.7360] * units('joule / kilogram'), 3)
+    assert_array_almost_equal(cin[1], [-136.6076, -136.6076] * units('joule / kilogram'), 3)
+    for j, i in np.ndindex(2, 2):
+        truth_cape, truth_cin = surface_based_cape_cin(pressure[:, j, i], temperature[:, j, i],
+                                                       dewpoint[:, j, i])
+        assert_almost_equal(cape[j, i], truth_cape, 2)
+        assert_almost_equal(cin[j, i], truth_cin, 2)
+
+
+def test_surface_based_cape_cin_grid_xarray():
+    """Test surface-based CAPE and CIN for a grid given as xarray with 1D pressure."""
+    temperature = xr.DataArray(
+        np.tile([22.2, 14.6, 12., 9.4, 7., -38.], (3, 1)).T,
+        dims=('isobaric', 'x'),
+        coords={'isobaric': ('isobaric', [959., 779.2, 751.3, 724.3, 700., 269.],
+                             {'units': 'hPa'})},
+        attrs={'units': 'degC'}
+    )
+    dewpoint = temperature.copy(data=np.tile([19., -11.2, -10.8, -10.4, -10., -53.2],
+                                             (3, 1)).T)
+    cape, cin = surface_based_cape_cin(temperature.isobaric, temperature, dewpoint)
+    assert_array_almost_equal(cape, [75.7360] * 3 * units('joule / kilogram'), 3)
+    assert_array_almost_equal(cin, [-136.6076] * 3 * units('joule / kilogram'), 3)
+
+
+def test_sounding_xarray_1d_no_warning():
+    """Test that a single sounding as xarray does not warn about the vertical dimension."""
+    pressure = xr.DataArray([959., 779.2, 751.3, 724.3, 700., 269.], attrs={'units': 'hPa'})
+    temperature = pressure.copy(data=[22.2, 14.6, 12., 9.4, 7., -38.])
+    temperature.attrs['units'] = 'degC'
+    dewpoint = temperature.copy(data=[19., -11.2, -10.8, -10.4, -10., -53.2])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', UserWarning)
+        moist_lapse(pressure, 22.2 * units.degC)
+        prof = parcel_profile(pressure, temperature[0], dewpoint[0])
+        lfc(pressure, temperature, dewpoint)
+        el(pressure, temperature, dewpoint)
+        cape_cin(pressure, temperature, dewpoint, prof)
+        cape, cin = surface_based_cape_cin(pressure, temperature, dewpoint)
+
+    assert_almost_equal(cape, 75.7340825 * units('joule / kilogram'), 2)
+    assert_almost_equal(cin, -136.607809 * units('joule / kilogram'), 2)
+
+
+def test_cape_cin_grid_invalid_which(sounding_grid):
+    """Test that unsupported LFC options raise an error for grids."""
+    pressure, temperature, dewpoint = sounding_grid
+    prof = parcel_profile(pressure, temperature, dewpoint)
+    with pytest.raises(ValueError):
+        cape_cin(pressure, temperature, dewpoint, prof, which_lfc='most_cape')
+
+
 def test_lcl_grid_surface_LCLs():
     """Test surface grid where some values have LCLs at the surface."""
     pressure = np.array([1000, 990, 1010]) * units.hPa
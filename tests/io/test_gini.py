@@ -5,6 +5,7 @@
 
 from datetime import datetime
 import logging
+from unittest.mock import patch
 
 import numpy as np
 from numpy.testing import assert_almost_equal
@@ -13,7 +14,7 @@ import xarray as xr
 
 from metpy.cbook import get_test_data
 from metpy.io import GiniFile
-from metpy.io.gini import GiniProjection
+from metpy.io.gini import _navigation, GiniProjection
 
 logging.getLogger('metpy.io.gini').setLevel(logging.ERROR)
 
@@ -179,3 +180,39 @@ def test_percent_normal():
     f = GiniFile(get_test_data('PR-NATIONAL_1km_PCT_20200320_0446.gini'))
 
     assert f.prod_desc.channel == 'Percent Normal TPW'
+
+
+def test_gini_lazy_subset():
+    """Test that subsetting the image only decompresses the rows needed."""
+    f = GiniFile(get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini'))
+    ds = xr.open_dataset(f)
+    assert f._image is None
+
+    subset = ds.variables['WV'][:10, 100:200].values
+    assert f._image is None
+    assert f._frames is not None
+
+    truth = GiniFile(get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini')).data
+    np.testing.assert_array_equal(subset, truth[:10, 100:200])
+    np.testing.assert_array_equal(ds.variables['WV'][-5:].values, truth[-5:])
+
+
+def test_gini_coords_cached():
+    """Test that the coordinates are reused for images with the same navigation."""
+    ds = xr.open_dataset(GiniFile(get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini')))
+    hits = _navigation.cache_info().hits
+
+    # A second image of the same sector must not need to run the projection again
+    with patch('pyproj.Proj.__call__', side_effect=AssertionError('projection called')):
+        ds2 = xr.open_dataset(GiniFile(get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini')))
+
+    assert _navigation.cache_info().hits > hits
+    for name in ('x', 'y', 'lon', 'lat'):
+        np.testing.assert_array_equal(ds[name], ds2[name])
+        assert not ds2[name].values.flags.writeable
+    assert ds['projection'].attrs == ds2['projection'].attrs
+
+    # Changing the attributes of one dataset must not affect the others
+    ds['projection'].attrs['earth_radius'] = 0
+    ds3 = xr.open_dataset(GiniFile(get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini')))
+    assert ds3['projection'].attrs == ds2['projection'].attrs
@@ -2,14 +2,23 @@
 # Distributed under the terms of the BSD 3-Clause License.
 # SPDX-License-Identifier: BSD-3-Clause
 """Test various metars."""
-from datetime import datetime
+from datetime import datetime, timedelta
+from io import StringIO
+import pickle
 
 import numpy as np
 from numpy.testing import assert_almost_equal, assert_equal
+import pandas as pd
+from pandas.testing import assert_frame_equal
 import pytest
 
 from metpy.cbook import get_test_data
-from metpy.io import parse_metar_file, parse_metar_to_dataframe
+from metpy.io import MetarIngester, parse_metar_file, parse_metar_to_dataframe
+from metpy.io.metar import (_fast_parse, _is_correction, _split_reports,
+                             parse_metar_to_named_tuple)
+from metpy.io.metar_parser import parse, ParseError
+from metpy.io.station_data import station_info
+from metpy.plots.wx_symbols import wx_code_map
 
 
 def test_station_id_not_in_dictionary():
@@ -152,3 +161,175 @@ def test_parse_file_object():
     assert test.air_temperature.values == 21
     assert test.dew_point_temperature.values == 21
     assert test.altimeter.values == 30.03
+
+
+def test_parse_file_workers():
+    """Test that parsing a file with a pool of workers matches the serial parse."""
+    input_file = get_test_data('metar_20190701_1200.txt', as_file_obj=False)
+    serial = parse_metar_file(input_file, year=2019, month=7)
+    parallel = parse_metar_file(input_file, year=2019, month=7, workers=2)
+    assert_frame_equal(serial, parallel)
+
+
+def test_named_tuple_pickle():
+    """Test that parsed reports can be pickled, as needed to send them between processes."""
+    metar = parse_metar_to_named_tuple('KDEN 012153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2',
+                                       station_info, 2019, 7)
+    restored = pickle.loads(pickle.dumps(metar))
+    assert type(restored) is type(metar)
+    assert_equal(list(restored), list(metar))
+
+
+def test_parse_file_errors():
+    """Test collecting the reports that could not be parsed."""
+    input_file = StringIO('KDEN 012153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2\n'
+                          'this line is not a METAR report at all\n')
+    errors = []
+    df = parse_metar_file(input_file, year=2019, month=7, errors=errors)
+    assert list(df.station_id) == ['KDEN']
+    assert len(errors) == 1
+    report, err = errors[0]
+    assert report == 'this line is not a METAR report at all'
+    assert isinstance(err, ParseError)
+
+
+@pytest.mark.parametrize('filename', ['metar_20190701_1200.txt', '2020010600_sao.wmo'])
+def test_fast_parse_matches_parser(filename):
+    """Test that the regular expression splits reports exactly like the full parser."""
+    def groups(tree):
+        ret = [tree.siteid.text, tree.datetime.text, tree.wind.text, tree.curwx.text,
+               tree.skyc.text, tree.temp_dewp.text, tree.altim.text]
+        if tree.wind.text:
+            ret.extend([tree.wind.wind_dir.text, tree.wind.wind_spd.text])
+        if tree.temp_dewp.text:
+            ret.extend([tree.temp_dewp.temp.text, tree.temp_dewp.dewp.text])
+        return ret
+
+    with get_test_data(filename, mode='rb') as f:
+        lines = f.read().decode('utf-8', errors='ignore').splitlines()
+
+    num_fast = 0
+    for line in lines:
+        fast = _fast_parse(line)
+        if fast is not None:
+            num_fast += 1
+            assert groups(fast) == groups(parse(line))
+    assert num_fast > len(lines) // 10
+
+
+def test_fast_parse_fallback():
+    """Test that irregular reports are left to the full parser."""
+    assert _fast_parse('KDEN 012153Z 09010KT 10SM -DZ BKN110 27/13 A3010 RMK AO2') is None
+    df = parse_metar_to_dataframe('KDEN 012153Z 09010KT 10SM -DZ BKN110 27/13 A3010 RMK AO2',
+                                  year=2019, month=7)
+    assert df.wind_speed.values == 10
+    assert np.isnan(df.air_temperature.values)
+
+
+def test_ingester_chunks():
+    """Test that ingesting a file in pieces gives the same reports as parsing it whole."""
+    with get_test_data('metar_20190701_1200.txt', mode='rt') as f:
+        text = f.read()
+    ingester = MetarIngester(year=2019, month=7)
+    batches = [ingester.add_text(text[i:i + 100000]) for i in range(0, len(text), 100000)]
+    batches.append(ingester.flush())
+    df = pd.concat(batches)
+
+    whole = parse_metar_file(StringIO(text), year=2019, month=7)
+    assert set(zip(whole.station_id, whole.date_time)) <= set(zip(df.station_id,
+                                                                  df.date_time))
+
+    # An observation is only returned twice when its original report is followed by a
+    # correction in a later piece of text
+    keys = ['station_id', 'date_time']
+    fields = ['wind_direction', 'wind_speed', 'air_temperature', 'dew_point_temperature']
+    repeated = df[df.duplicated(subset=keys, keep=False)]
+    assert not repeated.empty
+
+    def values(obs):
+        return tuple(-999. if np.isnan(float(val)) else float(val) for val in obs)
+
+    originals, corrections = {}, {}
+    for report in _split_reports(text.split('\n')):
+        if not any(stid in report for stid in set(repeated.station_id)):
+            continue
+        try:
+            metar = parse_metar_to_named_tuple(report, station_info, 2019, 7)
+        except ParseError:
+            continue
+        found = corrections if _is_correction(report) else originals
+        found.setdefault((metar.station_id, metar.date_time), set()).add(
+            values([metar.wind_direction, metar.wind_speed, metar.temperature,
+                    metar.dewpoint]))
+
+    for key, group in repeated.groupby(keys, sort=False):
+        assert len(group) == 2
+        original, correction = (values(obs) for obs in group[fields].itertuples(index=False))
+        assert original in originals[key]
+        assert correction in corrections[key]
+
+
+def test_ingester_duplicates_and_corrections():
+    """Test that repeated reports are skipped and corrections returned."""
+    ingester = MetarIngester(year=2019, month=7)
+    df = ingester.add_text('KDEN 012153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2=\n'
+                           'KBOU 012153Z 09008KT 10SM FEW060 26/12 A3011 RMK AO2=\n')
+    assert list(df.station_id) == ['KDEN', 'KBOU']
+
+    df = ingester.add_text('KDEN 012153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2=\n')
+    assert df.empty
+
+    df = ingester.add_text('KDEN 012153Z COR 09010KT 10SM FEW060 28/13 A3010 RMK AO2=\n'
+                           'KDEN 012153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2=\n')
+    assert list(df.station_id) == ['KDEN']
+    assert df.air_temperature.values == 28
+
+    df = ingester.add_text('METAR COR KDEN 012153Z 09010KT 10SM FEW060 28/13 A3010 RMK AO2=')
+    assert df.empty
+    assert len(ingester) == 2
+
+
+def test_ingester_held_report():
+    """Test that an unterminated report waits for its continuation line."""
+    ingester = MetarIngester(year=2019, month=7)
+    df = ingester.add_text('KDEN 012153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2\n')
+    assert df.empty
+
+    df = ingester.add_text('     SLP114=\nKBOU 012153Z 09008KT 10SM FEW060 26/12 A3011')
+    assert list(df.station_id) == ['KDEN']
+
+    df = ingester.flush()
+    assert list(df.station_id) == ['KBOU']
+
+
+def test_ingester_max_age():
+    """Test that old observations are forgotten."""
+    ingester = MetarIngester(year=2019, month=7, max_age=timedelta(hours=1))
+    ingester.add_text('KDEN 011153Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2=\n'
+                      'KDEN 011253Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2=\n')
+    assert len(ingester) == 2
+    ingester.add_text('KDEN 011353Z 09010KT 10SM FEW060 27/13 A3010 RMK AO2=\n')
+    assert len(ingester) == 2
+
+
+def test_parse_file_derived_columns():
+    """Test the columns derived from all of the reports in a file at once."""
+    input_file = StringIO('METAR KBOU 011152Z AUTO 02006KT 9999 -SHRA BR 22/02 Q1004=\n'
+                          'KDEN 012153Z 18010KT 10SM VCSH FEW060 27/13 A3010 RMK AO2=\n'
+                          'KMKE 012153Z 27010KT 10SM FEW060 27/13 RMK AO2=\n')
+    df = parse_metar_file(input_file, year=2019, month=7)
+    assert_almost_equal(df.altimeter.values, [29.65, 30.10, np.nan])
+    assert_equal(df.present_weather.values, [wx_code_map['-SHRA'], wx_code_map['VCSH'], 0])
+    assert_equal(df.past_weather.values, [wx_code_map['BR'], 0, 0])
+    assert_almost_equal(df.eastward_wind.values, [-2.05, 0, 10], decimal=2)
+    assert_almost_equal(df.northward_wind.values, [-5.64, 10, 0], decimal=2)
+
+
+def test_all_weather_symbols():
+    """Test that symbols are found for all three present weather groups."""
+    df = parse_metar_to_dataframe('METAR RJOI 261155Z 00000KT 4000 -SHRA BR VCSH BKN009 '
+                                  'BKN015 OVC030 OVC040 22/21 A2987 RMK SHRAB35E44 SLP114 '
+                                  'VCSH S-NW P0000 60021 70021 T02220206 10256 20211 55000=')
+    assert df.present_weather.values == wx_code_map['-SHRA']
+    assert df.past_weather.values == wx_code_map['BR']
+    assert df.past_weather2.values == wx_code_map['VCSH']
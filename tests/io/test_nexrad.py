@@ -3,16 +3,22 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test the `nexrad` module."""
 
+import bz2
 from datetime import datetime
+import functools
 from io import BytesIO
 import logging
 from pathlib import Path
+import time
 
 import numpy as np
 import pytest
 
 from metpy.cbook import get_test_data, POOCH
-from metpy.io import is_precip_mode, Level2File, Level3File
+from metpy.io import (is_precip_mode, Level2File, Level3File, RawMomentData,
+                      read_nexrad_files)
+import metpy.io.nexrad
+from metpy.io.nexrad import bzip_blocks_decompress_all, nexrad_to_datetime
 
 # Turn off the warnings for tests
 logging.getLogger('metpy.io.nexrad').setLevel(logging.CRITICAL)
@@ -115,6 +121,390 @@ def test_build19_level2_additions():
     assert f.sweeps[0][0].header.az_spacing == 0.5
 
 
+def _ar2v_bz2_blocks():
+    """Return the internally bzip2-ed portion of a Level 2 file."""
+    return get_test_data('Level2_KFTG_20150430_1419.ar2v').read()[24:]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_bzip_blocks_parallel(executor):
+    """Test that parallel decompression of bz2 blocks matches serial decompression."""
+    data = _ar2v_bz2_blocks()
+    serial = bzip_blocks_decompress_all(data)
+    assert bzip_blocks_decompress_all(data, workers=2, executor=executor) == serial
+
+
+def test_bzip_blocks_parallel_executor():
+    """Test decompressing bz2 blocks with an existing executor."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    data = _ar2v_bz2_blocks()
+    serial = bzip_blocks_decompress_all(data)
+    with ThreadPoolExecutor(2) as pool:
+        assert bzip_blocks_decompress_all(data, executor=pool) == serial
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_bzip_blocks_mid_stream_error(workers, caplog):
+    """Test that an error partway through the block stream keeps the preceding blocks."""
+    data = _ar2v_bz2_blocks()
+    first_size = abs(int.from_bytes(data[:4], 'big', signed=True))
+    bad = bytearray(data)
+    bad[12 + first_size:20 + first_size] = b'\x00' * 8
+
+    with caplog.at_level(logging.WARNING):
+        assert bzip_blocks_decompress_all(bad, workers=workers) == bzip_blocks_decompress_all(
+            data[:4 + first_size])
+    assert 'Error decompressing bz2 block stream' in caplog.text
+
+
+def test_bzip_blocks_parallel_error_cancels(monkeypatch):
+    """Test that blocks past one that fails to decompress are cancelled."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    data = _ar2v_bz2_blocks()
+    first_size = abs(int.from_bytes(data[:4], 'big', signed=True))
+    bad = bytearray(data)
+    bad[12 + first_size:20 + first_size] = b'\x00' * 8
+    truth = bzip_blocks_decompress_all(data[:4 + first_size])
+
+    decompressed = []
+
+    def decompress_block(block):
+        # Slow down the blocks following the bad one, so they are still pending
+        if decompressed and decompressed[-1] is None:
+            time.sleep(0.1)
+        try:
+            decompressed.append(bz2.decompress(block))
+        except OSError:
+            decompressed.append(None)
+        return decompressed[-1]
+
+    monkeypatch.setattr(metpy.io.nexrad, '_bzip_decompress_block', decompress_block)
+    with ThreadPoolExecutor(1) as pool:
+        assert bzip_blocks_decompress_all(bad, executor=pool) == truth
+    assert len(decompressed) < 5
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_bzip_blocks_not_bz2(workers):
+    """Test that data that are not bzip2 compressed raise an error."""
+    with pytest.raises(ValueError):
+        bzip_blocks_decompress_all(b'\x00\x00\x00\x10' + b'\x01' * 16, workers=workers)
+
+
+def test_level2_parallel_decompress():
+    """Test reading a Level 2 file with parallel decompression of the bzip2 blocks."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    serial = Level2File(fname)
+    f = Level2File(fname, decompress_workers=2)
+    assert len(f.sweeps) == len(serial.sweeps)
+    np.testing.assert_array_equal(f.sweeps[-1][-1][-1][b'REF'][1],
+                                  serial.sweeps[-1][-1][-1][b'REF'][1])
+
+
+@pytest.mark.parametrize('fname', ['KTLX19990503_235621.gz', 'Level2_KFTG_20150430_1419.ar2v',
+                                   'TDAL20191021021543V08.raw.gz'])
+def test_level2_lazy(fname):
+    """Test that lazily decoded sweeps match those decoded when opening the file."""
+    fname = get_test_data(fname, as_file_obj=False)
+    eager = Level2File(fname)
+    f = Level2File(fname, lazy=True)
+    assert not f.sweeps._cache
+    assert len(f.sweeps) == len(eager.sweeps)
+
+    for ind in (0, -1):
+        sweep, truth = f.sweeps[ind], eager.sweeps[ind]
+        assert len(sweep) == len(truth)
+        assert sweep[0][0] == truth[0][0]
+        for name, (hdr, data) in truth[-1][-1].items():
+            assert sweep[-1][-1][name][0] == hdr
+            np.testing.assert_array_equal(sweep[-1][-1][name][1], data)
+    assert len(f.sweeps._cache) == 2
+    assert f.sweeps[0] is f.sweeps[0]
+
+
+@pytest.mark.parametrize('fname', ['KTLX19990503_235621.gz', 'Level2_KFTG_20150430_1419.ar2v'])
+def test_level2_sweep_arrays(fname):
+    """Test that sweeps decoded into arrays match the individual radials."""
+    f = Level2File(get_test_data(fname, as_file_obj=False))
+    sweep = f.sweep_arrays[0]
+    radials = f.sweeps[0]
+    assert len(sweep.azimuth) == len(radials)
+    assert sweep.time.dtype == np.dtype('datetime64[ms]')
+
+    for ind in (0, len(radials) // 2, -1):
+        hdr = radials[ind][0]
+        assert sweep.azimuth[ind] == hdr.az_angle
+        assert sweep.elevation[ind] == hdr.el_angle
+        assert sweep.time[ind].astype(datetime) == nexrad_to_datetime(hdr.date, hdr.time_ms)
+        for name, (mom_hdr, data) in radials[ind][-1].items():
+            np.testing.assert_array_equal(sweep.moments[name][1][ind, :data.size], data)
+            assert np.isnan(sweep.moments[name][1][ind, data.size:]).all()
+
+
+def test_level2_raw_moments():
+    """Test that keeping raw moment data gives the same values upon scaling."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    scaled = Level2File(fname)
+    f = Level2File(fname, raw_moments=True)
+
+    hdr, data = f.sweeps[0][0].moments[b'REF']
+    truth = scaled.sweeps[0][0].moments[b'REF'][1]
+    assert isinstance(data, RawMomentData)
+    assert data.raw.dtype == np.uint8
+    assert data.scale == hdr.scale and data.offset == hdr.offset
+    np.testing.assert_array_equal(data.values(), truth)
+    np.testing.assert_array_equal(np.asarray(data), truth)
+    np.testing.assert_array_equal(data[100:200], truth[100:200])
+    np.testing.assert_allclose(data.values(np.float32), truth, rtol=1e-6)
+    assert data.values(np.float32).dtype == np.float32
+
+
+def test_level2_raw_sweep_arrays():
+    """Test that sweep arrays with raw moment data match those scaled when decoding."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    truth = Level2File(fname, lazy=True).sweep_arrays[1].moments
+    moments = Level2File(fname, lazy=True, raw_moments=True).sweep_arrays[1].moments
+
+    for name, (_, data) in moments.items():
+        assert isinstance(data, RawMomentData)
+        np.testing.assert_array_equal(data.values(), truth[name][1])
+        np.testing.assert_array_equal(data[5, 10:20], truth[name][1][5, 10:20])
+
+
+def test_level2_missing_range_fold(monkeypatch):
+    """Test that the values for missing and range-folded gates can be changed."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    raw = Level2File(fname, lazy=True, raw_moments=True).sweep_arrays[1].moments[b'VEL'][1].raw
+    monkeypatch.setattr(Level2File, 'MISSING', -999.)
+    monkeypatch.setattr(Level2File, 'RANGE_FOLD', -9999.)
+    f = Level2File(fname, lazy=True)
+
+    radial = np.nonzero((raw == 1).any(axis=1))[0][0]
+    for data, codes in [(f.sweep_arrays[1].moments[b'VEL'][1], raw),
+                        (f.sweeps[1][radial].moments[b'VEL'][1], raw[radial])]:
+        codes = codes[..., :data.shape[-1]]
+        assert np.any(codes == 1)
+        np.testing.assert_array_equal(data[codes == 0], -999.)
+        np.testing.assert_array_equal(data[codes == 1], -9999.)
+        assert not np.isnan(data).any()
+
+
+def _split_chunks(data, num_chunks):
+    """Split the volume header and bz2 blocks of a Level 2 file into real-time chunks."""
+    blocks = []
+    offset = 24
+    while offset < len(data):
+        size = abs(int.from_bytes(data[offset:offset + 4], 'big', signed=True))
+        blocks.append(data[offset:offset + 4 + size])
+        offset += 4 + size
+
+    # First chunk has the volume header and the first block, which holds the metadata
+    chunks = [data[:24] + blocks[0]]
+    step = len(blocks) // (num_chunks - 1) + 1
+    chunks.extend(b''.join(blocks[i:i + step]) for i in range(1, len(blocks), step))
+    return chunks
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_level2_add_chunk(lazy):
+    """Test reading Level 2 data incrementally from chunks."""
+    data = get_test_data('Level2_KFTG_20150430_1419.ar2v').read()
+    truth = Level2File(BytesIO(data))
+    chunks = _split_chunks(data, 20)
+
+    f = Level2File(BytesIO(chunks[0]), lazy=lazy)
+    assert f.dt == truth.dt
+    assert f.vcp_info == truth.vcp_info
+
+    completed = []
+    for chunk in chunks[1:]:
+        num_sweeps = len(f.sweeps)
+        new_completed = f.add_chunk(chunk)
+        assert all(ind >= num_sweeps - 1 for ind in new_completed)
+        completed.extend(new_completed)
+
+        # Make sure we can access sweeps as they are building
+        assert len(f.sweep_arrays[-1].azimuth) == len(f.sweeps[-1])
+
+    assert completed == list(range(len(truth.sweeps)))
+    assert len(f.sweeps) == len(truth.sweeps)
+    for sweep, truth_sweep in zip(f.sweeps, truth.sweeps):
+        assert len(sweep) == len(truth_sweep)
+        np.testing.assert_array_equal(sweep[-1].moments[b'REF'][1],
+                                      truth_sweep[-1].moments[b'REF'][1])
+    np.testing.assert_array_equal(f.sweep_arrays[-1].azimuth, truth.sweep_arrays[-1].azimuth)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_level2_add_chunk_new_volume(lazy):
+    """Test that a chunk with a volume header starts a new volume."""
+    data = get_test_data('Level2_KFTG_20150430_1419.ar2v').read()
+    chunks = _split_chunks(data, 20)
+
+    f = Level2File(BytesIO(chunks[0]), lazy=lazy)
+    for chunk in chunks[1:5]:
+        f.add_chunk(chunk)
+    assert len(f.sweeps[0])
+
+    # Mark the next volume as starting a minute later
+    time_ms = int.from_bytes(chunks[0][16:20], 'big') + 60000
+    new_volume = chunks[0][:16] + time_ms.to_bytes(4, 'big') + chunks[0][20:]
+    assert f.add_chunk(new_volume) == []
+    assert f.dt == Level2File(BytesIO(new_volume)).dt
+    assert f.dt > Level2File(BytesIO(chunks[0])).dt
+    assert not f.sweeps
+
+    # Radials are only added to the new volume's sweeps
+    for chunk in chunks[1:3]:
+        f.add_chunk(chunk)
+    truth = Level2File(BytesIO(b''.join(chunks[:3])))
+    assert len(f.sweeps) == len(truth.sweeps)
+    assert [len(sweep) for sweep in f.sweeps] == [len(sweep) for sweep in truth.sweeps]
+
+
+def test_level2_message_types():
+    """Test skipping the decoding of unwanted message types."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    truth = Level2File(fname)
+    f = Level2File(fname, message_types={5, 31})
+    assert f.vcp_info == truth.vcp_info
+    assert len(f.sweeps) == len(truth.sweeps)
+    assert not f.rda_status
+    assert not hasattr(f, 'rda')
+
+    f = Level2File(fname, message_types={2})
+    assert f.rda_status == truth.rda_status
+    assert not f.sweeps
+
+
+def test_level2_scan_messages():
+    """Test the table of message locations found by scanning the file."""
+    f = Level2File(get_test_data('Level2_KFTG_20150430_1419.ar2v'), lazy=True)
+    f._buffer.reset()
+    table = f._scan_messages()
+    radials = table[table['msg_type'] == 31]
+    assert len(radials) == sum(len(sweep) for sweep in f._sweep_index)
+    assert radials['offset'][0] == f._sweep_index[0][0][1] - f.msg_hdr_fmt.size
+    np.testing.assert_array_equal(np.diff(table['offset']), table['msg_bytes'][:-1])
+
+    f._buffer.reset()
+    f._buffer.skip(table['offset'][0])
+    assert f._buffer.read_struct(f.msg_hdr_fmt).seq_num == table['seq_num'][0]
+
+
+def test_level2_lazy_index_error():
+    """Test that out of range sweeps raise an error with lazy decoding."""
+    f = Level2File(get_test_data('Level2_KFTG_20150430_1419.ar2v'), lazy=True)
+    with pytest.raises(IndexError):
+        f.sweeps[len(f.sweeps)]
+
+
+@pytest.mark.parametrize('fname', ['KTLX19990503_235621.gz', 'Level2_KFTG_20150430_1419.ar2v'])
+def test_level2_to_dataset(fname):
+    """Test converting a Level 2 sweep to an xarray Dataset."""
+    f = Level2File(get_test_data(fname, as_file_obj=False), lazy=True)
+    ds = f.to_dataset(0)
+    truth = f.sweep_arrays[0]
+
+    np.testing.assert_array_almost_equal(ds['azimuth'].values, truth.azimuth)
+    np.testing.assert_array_almost_equal(ds['elevation'].values, truth.elevation)
+    np.testing.assert_array_equal(ds['time'].values, truth.time)
+    for name, (mom_hdr, data) in truth.moments.items():
+        var = ds[name.decode('ascii') if isinstance(name, bytes) else name]
+        np.testing.assert_array_equal(var.values, data)
+        assert var.dims[0] == 'azimuth'
+        range_coord = ds[var.dims[1]]
+        assert range_coord[0] == 1000 * mom_hdr.first_gate
+        np.testing.assert_array_almost_equal(np.diff(range_coord), 1000 * mom_hdr.gate_width)
+
+    assert ds['REF'].attrs['standard_name'] == 'equivalent_reflectivity_factor'
+    assert ds.attrs['Conventions'] == 'CF/Radial'
+
+
+def test_level2_to_dataset_dask():
+    """Test converting a Level 2 sweep to an xarray Dataset backed by dask."""
+    pytest.importorskip('dask')
+    f = Level2File(get_test_data('Level2_KFTG_20150430_1419.ar2v'), lazy=True)
+    ds = f.to_dataset(1, use_dask=True)
+    assert not f.sweep_arrays._cache
+    truth = f.to_dataset(1)
+
+    assert ds['latitude'] == truth['latitude']
+    for name in truth.data_vars:
+        np.testing.assert_array_equal(ds[name].values, truth[name].values)
+
+
+def test_level2_to_dataset_varying_radials():
+    """Test that moments missing from the first radial of a sweep are still converted."""
+    pytest.importorskip('dask')
+    f = Level2File(get_test_data('Level2_KFTG_20150430_1419.ar2v'), lazy=True)
+
+    # Start the sweep with a radial with different moments and fewer gates
+    f._sweep_index[1].insert(0, f._sweep_index[0][0])
+    moments = f.sweep_arrays[1].moments
+    truth = f.to_dataset(1)
+    ds = f.to_dataset(1, use_dask=True)
+
+    assert {b'REF', b'VEL', b'ZDR'} <= set(moments)
+    assert set(ds.data_vars) == set(truth.data_vars) == {name.decode('ascii')
+                                                         for name in moments}
+    for name in truth.data_vars:
+        assert ds[name].shape == truth[name].shape
+        np.testing.assert_array_equal(ds[name].values, truth[name].values)
+    assert truth['VEL'].shape == moments[b'VEL'][1].shape
+
+
+def test_read_nexrad_files_process():
+    """Test reading Level 2 files with a pool of processes."""
+    fnames = [get_test_data(fname, as_file_obj=False)
+              for fname in ('KTLX19990503_235621.gz', 'Level2_KFTG_20150430_1419.ar2v')]
+    to_dataset = functools.partial(Level2File.to_dataset, sweep=0)
+    results = list(read_nexrad_files(fnames, transform=to_dataset, workers=2, lazy=True))
+
+    assert sorted(r.filename for r in results) == sorted(fnames)
+    for result in results:
+        assert result.error is None
+        assert result.elapsed > 0
+        truth = Level2File(result.filename, lazy=True).to_dataset(0)
+        np.testing.assert_array_equal(result.data['REF'], truth['REF'])
+
+
+def test_read_nexrad_files_failures(tmp_path):
+    """Test that failures reading files are reported with the other results."""
+    bad = tmp_path / 'bad.nids'
+    bad.write_bytes(b'\x00' * 100)
+    fnames = [get_test_data('nids/Level3_FFC_N0Q_20140407_1805.nids', as_file_obj=False),
+              str(bad)]
+
+    results = {r.filename: r for r in read_nexrad_files(fnames, Level3File, executor='thread')}
+    assert isinstance(results[fnames[0]].data, Level3File)
+    assert results[fnames[0]].error is None
+    assert results[str(bad)].data is None
+    assert results[str(bad)].error is not None
+
+
+def test_read_nexrad_files_defaults():
+    """Test that reading without a transform uses threads by default."""
+    fname = get_test_data('nids/Level3_FFC_N0Q_20140407_1805.nids', as_file_obj=False)
+    result, = read_nexrad_files([fname], Level3File)
+    assert isinstance(result.data, Level3File)
+    assert result.error is None
+
+
+def test_read_nexrad_files_process_needs_transform():
+    """Test that reading with processes without a transform raises an error immediately."""
+    with pytest.raises(ValueError):
+        read_nexrad_files(['foo'], executor='process')
+
+
+def test_read_nexrad_files_bad_executor():
+    """Test that an unknown kind of executor raises an error immediately."""
+    with pytest.raises(ValueError):
+        read_nexrad_files(['foo'], executor='fibers')
+
+
 #
 # NIDS/Level 3 Tests
 #
@@ -277,6 +667,134 @@ def test_vector_packet():
                 assert len(y2)
 
 
+def test_unpack_rle_rows():
+    """Test unpacking multiple run-length encoded rows into an array."""
+    rows = [b'\x21\x13', b'\x42', b'']
+    data = Level3File._unpack_rle_rows(rows, 3)
+    np.testing.assert_array_equal(data, [[1, 1, 3, 0], [2, 2, 2, 2], [0, 0, 0, 0]])
+    assert data.dtype == np.uint8
+    np.testing.assert_array_equal(Level3File._unpack_rle_data(rows[0]), [1, 1, 3])
+
+
+def test_rle_radial_packet():
+    """Test that legacy run-length encoded radial products can be decoded to an array."""
+    fname = get_test_data('nids/KOUN_SDUS54_N0RTLX_201305202016', as_file_obj=False)
+    f = Level3File(fname, arrays=True)
+    packet = f.sym_block[0][0]
+    assert packet['data'].shape == (len(packet['start_az']), 230)
+    assert packet['data'].dtype == np.uint8
+    assert np.isfinite(f.map_data(packet['data'])).any()
+
+    rads = Level3File(fname).sym_block[0][0]
+    assert isinstance(rads['start_az'], list)
+    assert rads['start_az'] == packet['start_az'].tolist()
+    for rad, row in zip(rads['data'], packet['data']):
+        assert rad == row[:len(rad)].tolist()
+
+
+def test_digital_radial_array():
+    """Test that digital radial packets can be decoded into arrays."""
+    fname = get_test_data('nids/KOUN_SDUS24_N1QTLX_201305202016', as_file_obj=False)
+    packet = Level3File(fname, arrays=True).sym_block[0][0]
+    assert packet['data'].shape == (360, 421)
+    assert packet['data'].dtype == np.uint8
+    assert isinstance(packet['start_az'], np.ndarray)
+    np.testing.assert_array_almost_equal(packet['start_az'][:3], [182., 183., 184.])
+
+    rads = Level3File(fname).sym_block[0][0]
+    assert isinstance(rads['start_az'], list)
+    assert rads['end_az'] == packet['end_az'].tolist()
+    assert len(rads['data']) == 360
+    for rad, row in zip(rads['data'], packet['data']):
+        assert rad[:421] == row.tobytes()
+
+
+@pytest.mark.parametrize('fname', ['nids/KOUN_SDUS54_N0RTLX_201305202016',
+                                   'nids/KOUN_SDUS54_NCRTLX_201305202016'])
+def test_rle_lists_not_unpacked_to_array(monkeypatch, fname):
+    """Test that decoding run-length encoded packets into lists skips the array decoding."""
+    def fail(*args, **kwargs):
+        raise AssertionError('Packet decoded into an array')
+
+    monkeypatch.setattr(Level3File, '_unpack_rle_rows', fail)
+    packet = Level3File(get_test_data(fname, as_file_obj=False)).sym_block[0][0]
+    assert isinstance(packet['data'][0], list)
+
+
+@pytest.mark.parametrize('arrays', [False, True])
+def test_digital_radial_nonuniform(monkeypatch, arrays):
+    """Test decoding digital radials one at a time when they differ in size."""
+    fname = get_test_data('nids/KOUN_SDUS24_N1QTLX_201305202016', as_file_obj=False)
+    truth = Level3File(fname, arrays=arrays).sym_block[0][0]
+    monkeypatch.setattr(Level3File, '_read_digital_radials', lambda self, num_rad: None)
+    packet = Level3File(fname, arrays=arrays).sym_block[0][0]
+
+    np.testing.assert_array_equal(packet['data'], truth['data'])
+    np.testing.assert_array_almost_equal(packet['start_az'], truth['start_az'])
+    np.testing.assert_array_almost_equal(packet['end_az'], truth['end_az'])
+
+
+@pytest.mark.parametrize('fname', ['nids/KOUN_SDUS54_N0UTLX_201305202016',
+                                   'nids/KOUN_SDUS54_N0RTLX_201305202016'])
+def test_level3_apply_mapper(fname):
+    """Test applying the mapper to packets while decoding."""
+    f = Level3File(get_test_data(fname), apply_mapper=True, arrays=True)
+    packet = f.sym_block[0][0]
+    np.testing.assert_array_equal(packet['values'], f.map_data(packet['data']))
+    assert 'values' not in Level3File(get_test_data(fname)).sym_block[0][0]
+
+
+@pytest.mark.parametrize('fname', ['nids/KOUN_SDUS54_N0UTLX_201305202016',
+                                   'nids/KOUN_SDUS54_N0RTLX_201305202016'])
+def test_level3_apply_mapper_lists(fname):
+    """Test that the mapped values are laid out like the data when decoding into lists."""
+    f = Level3File(get_test_data(fname), apply_mapper=True)
+    packet = f.sym_block[0][0]
+    assert len(packet['values']) == len(packet['data'])
+    for values, row in zip(packet['values'], packet['data']):
+        np.testing.assert_array_equal(values, f.map_data(np.array(list(row))))
+
+
+@pytest.mark.parametrize('fname', ['nids/KOUN_SDUS54_N0RTLX_201305202016',
+                                   'nids/KOUN_SDUS24_N1QTLX_201305202016'])
+def test_level3_close(tmp_path, fname):
+    """Test that closing a product releases the memory-mapped file."""
+    path = tmp_path / 'product.nids'
+    path.write_bytes(Path(get_test_data(fname, as_file_obj=False)).read_bytes())
+
+    with Level3File(str(path)) as f:
+        mapped = f._buffer._mmap
+        assert not mapped.closed
+    assert mapped.closed
+    assert f.sym_block
+
+    # The file can be replaced now that nothing refers to it
+    path.write_bytes(b'')
+    path.unlink()
+
+
+@pytest.mark.parametrize('fname', ['nids/Level3_FFC_N0Q_20140407_1805.nids',
+                                   'nids/KOUN_SDUS54_N0RTLX_201305202016',
+                                   'nids/KOUN_SDUS84_DAATLX_201305202016',
+                                   'nids/KDDC-gsm.nids'])
+def test_level3_read_header(fname):
+    """Test reading just the headers of a product."""
+    fname = get_test_data(fname, as_file_obj=False)
+    f = Level3File(fname)
+    hdr = Level3File.read_header(fname)
+
+    assert hdr.filename == fname
+    assert hdr.product_name == f.product_name
+    if f.header.code == 2:
+        assert hdr.prod_code is None
+    else:
+        assert hdr.prod_code == f.prod_desc.prod_code
+        assert hdr.siteID == f.siteID
+        assert hdr.vol_time == f.metadata['vol_time']
+        assert hdr.el_angle == f.metadata.get('el_angle')
+        assert (hdr.lat, hdr.lon, hdr.height) == (f.lat, f.lon, f.height)
+
+
 @pytest.mark.parametrize('fname,truth',
                          [('nids/KEAX_N0Q_20200817_0401.nids', (0, 'MRLE scan')),
                           ('nids/KEAX_N0Q_20200817_0405.nids', (0, 'Non-supplemental scan')),
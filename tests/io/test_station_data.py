@@ -3,10 +3,21 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test station data information."""
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_array_equal
 import pandas as pd
+import pytest
 
 from metpy.io import add_station_lat_lon
+from metpy.io.station_data import StationLookup
+from metpy.units import units
+
+
+@pytest.fixture(autouse=True)
+def station_cache(monkeypatch, tmp_path):
+    """Keep the station index out of the user cache directory."""
+    monkeypatch.setattr('metpy.io.station_data.pooch.os_cache', lambda project: tmp_path)
+    monkeypatch.setattr('metpy.io.station_data.station_info',
+                        StationLookup(cache_dir=tmp_path))
 
 
 def test_add_lat_lon_station_data():
@@ -22,3 +33,112 @@ def test_add_lat_lon_station_data():
     assert_almost_equal(df.loc[df.station == 'KDEN'].longitude.values[0], -104.65)
     assert_almost_equal(df.loc[df.station == 'PAAA'].latitude.values[0], np.nan)
     assert_almost_equal(df.loc[df.station == 'PAAA'].longitude.values[0], np.nan)
+
+
+def test_station_lookup_index(tmp_path):
+    """Test that station information is the same when read from the cached index."""
+    lookup = StationLookup(cache_dir=tmp_path)
+    assert lookup._table is None
+    info = lookup['KDEN']
+    assert (tmp_path / 'station_index.npz').exists()
+
+    cached = StationLookup(cache_dir=tmp_path)
+    assert cached['KDEN'] == info
+    assert len(cached) == len(lookup)
+    assert_almost_equal(info.latitude, 39.85)
+    assert_almost_equal(info.longitude, -104.65)
+
+
+def test_station_lookup_missing(tmp_path):
+    """Test looking up stations that are not in any table."""
+    lookup = StationLookup(cache_dir=tmp_path)
+    assert 'PAAA' not in lookup
+    assert 'KDEN' in lookup
+    with pytest.raises(KeyError, match='PAAA'):
+        lookup['PAAA']
+
+
+def test_station_lookup_duplicate_id(tmp_path):
+    """Test that the last entry for a station ID repeated within a table is used."""
+    info = StationLookup(cache_dir=tmp_path)['KQAZ']
+    assert info.name == 'Agadez'
+    assert_almost_equal(info.latitude, 16.98)
+    assert_almost_equal(info.longitude, 7.98)
+
+
+def test_station_lookup_stale_index(tmp_path):
+    """Test that an index built from different tables is not used."""
+    lookup = StationLookup(cache_dir=tmp_path)
+    table = lookup.table
+    np.savez(tmp_path / 'station_index.npz', stations=table[:10],
+             signature=np.array(['0']))
+    assert len(StationLookup(cache_dir=tmp_path)) == len(table)
+
+
+def test_station_coordinates():
+    """Test looking up the locations of many stations at once."""
+    lat, lon, alt = StationLookup().coordinates(np.array([['KOUN', 'PAAA'],
+                                                          ['KDEN', np.nan]], dtype=object))
+    assert lat.shape == (2, 2)
+    assert_almost_equal(lat, [[35.25, np.nan], [39.85, np.nan]])
+    assert_almost_equal(lon, [[-97.47, np.nan], [-104.65, np.nan]])
+    assert_almost_equal(alt[0, 0], StationLookup()['KOUN'].altitude)
+    assert np.isnan(alt[0, 1])
+
+
+def test_add_lat_lon_repeated_stations():
+    """Test adding locations to a DataFrame with many rows for each station."""
+    df = pd.DataFrame({'station': ['KOUN', 'KDEN', None, 'KOUN', 'PAAA'] * 1000})
+    df = add_station_lat_lon(df, 'station')
+    assert_almost_equal(df.latitude.values[:5], [35.25, 39.85, np.nan, 35.25, np.nan])
+    assert_almost_equal(df.longitude.values[-5:], [-97.47, -104.65, np.nan, -97.47, np.nan])
+
+
+def test_station_nearest():
+    """Test finding the stations nearest to points."""
+    lookup = StationLookup()
+    distance, stations = lookup.nearest([39.85, 35.25], [-104.65, -97.47])
+    assert stations.shape == (2,)
+    assert_array_equal(stations['latitude'], [39.85, 35.25])
+    assert_almost_equal(distance[0].m_as('m'), 0, 3)
+
+    distance, stations = lookup.nearest(39.85, -104.65, k=3)
+    assert stations.shape == (3,)
+    assert np.all(np.diff(distance.m) >= 0)
+
+
+def test_station_nearest_more_than_table(tmp_path):
+    """Test finding more nearest stations than there are in the table."""
+    lookup = StationLookup(cache_dir=tmp_path)
+    lookup._table = lookup.table[:3]
+    distance, stations = lookup.nearest([39.85, 35.25], [-104.65, -97.47], k=5)
+    assert stations.shape == (2, 3)
+    assert distance.shape == (2, 3)
+    assert np.all(np.isfinite(distance.m))
+    for found in stations:
+        assert set(found['id']) == set(lookup.table['id'])
+
+
+def test_station_within_radius():
+    """Test finding the stations within a distance of points."""
+    lookup = StationLookup()
+    stations = lookup.within_radius(39.85, -104.65, 50 * units.km)
+    assert 'KDEN' in stations['id']
+    assert 'KOUN' not in stations['id']
+    assert np.all(np.abs(stations['latitude'] - 39.85) < 0.5)
+
+    stations = lookup.within_radius([39.85, 35.25], [-104.65, -97.47], 50 * units.km)
+    assert stations.shape == (2,)
+    assert 'KOUN' in stations[1]['id']
+
+
+def test_station_within_bounds():
+    """Test finding the stations within a box of latitude and longitude."""
+    lookup = StationLookup()
+    stations = lookup.within_bounds(-105, 39, -104, 40)
+    assert 'KDEN' in stations['id']
+    assert np.all((stations['longitude'] >= -105) & (stations['longitude'] <= -104))
+
+    stations = lookup.within_bounds(179, -90, -179, 90)
+    assert len(stations)
+    assert np.all(np.abs(stations['longitude']) >= 179)
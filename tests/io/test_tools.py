@@ -3,7 +3,14 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test the `_tools` module."""
 
-from metpy.io._tools import NamedStruct
+import zlib
+
+import numpy as np
+import pytest
+
+from metpy.io import GiniFile, Level2File, Level3File
+from metpy.io._tools import (BitField, Bits, convert_array, IOBuffer, NamedStruct, vectorized,
+                             zlib_decompress_all_frames, zlib_iter_frames)
 
 
 def test_unpack():
@@ -21,3 +28,155 @@ def test_pack():
 
     b = struct.pack(field1=8, field2=3)
     assert b == b'\x00\x00\x00\x08\x00\x03'
+
+
+def test_unpack_array():
+    """Test unpacking consecutive records from bytes into arrays."""
+    struct = NamedStruct([('field1', 'i', vectorized(lambda x: x * 2)), (None, '2x'),
+                          ('field2', 'h', BitField('a', 'b')), ('field3', '2s')], '>')
+    data = (struct.pack(field1=1, field2=3, field3=b'a')
+            + struct.pack(field1=2, field2=1, field3=b'bc'))
+
+    arrs = struct.unpack_array(data)
+    np.testing.assert_array_equal(arrs.field1, [2, 4])
+    assert arrs.field2.tolist() == [['a', 'b'], 'a']
+    np.testing.assert_array_equal(arrs.field3, [b'a', b'bc'])
+
+
+def test_convert_array_distinct_values():
+    """Test that converters are only called once for each distinct value in an array."""
+    calls = []
+
+    def converter(val):
+        calls.append(val)
+        return str(val)
+
+    values = np.array([3, 1, 3, 3, 1], dtype='>u2')
+    assert convert_array(converter, values).tolist() == ['3', '1', '3', '3', '1']
+    assert sorted(calls) == [1, 3]
+
+    bits = convert_array(Bits(2), values)
+    assert bits.tolist() == [[True, True], [True, False], [True, True], [True, True],
+                             [True, False]]
+    assert bits[0] is not bits[2]
+
+
+@pytest.mark.parametrize('fmt', [getattr(cls, name)
+                                 for cls in (GiniFile, Level2File, Level3File)
+                                 for name in dir(cls)
+                                 if isinstance(getattr(cls, name), NamedStruct)])
+def test_named_struct_dtype(fmt):
+    """Test that unpacking arrays matches unpacking individual records."""
+    data = bytes(range(256)) * (3 * fmt.size // 256 + 1)
+    try:
+        truths = [fmt.unpack_from(data, ind * fmt.size) for ind in range(3)]
+    except ValueError:
+        pytest.skip('Converters cannot handle the test data.')
+    arrs = fmt.unpack_array(data, count=3)
+    assert fmt.dtype.itemsize == fmt.size
+
+    for ind, truth in enumerate(truths):
+        for name, val in zip(truth._fields, truth):
+            col = getattr(arrs, name)
+            actual = None if col is None else col[ind]
+            if isinstance(val, bytes):
+                val = val.rstrip(b'\x00')
+            if not (isinstance(val, float) and np.isnan(val)):
+                assert actual == val
+
+
+def test_iobuffer_mmap(tmp_path):
+    """Test that a memory-mapped IOBuffer behaves the same as one holding the bytes."""
+    data = bytes(range(256)) * 4
+    path = tmp_path / 'data.bin'
+    path.write_bytes(data)
+
+    with open(path, 'rb') as fobj:
+        mapped = IOBuffer.fromfile(fobj)
+    buf = IOBuffer(data)
+    assert len(mapped) == len(buf)
+
+    for b in (mapped, buf):
+        b.skip(10)
+    assert mapped.get_next(5) == buf.get_next(5) == bytearray(range(10, 15))
+    assert mapped.read_int(2, 'big', False) == buf.read_int(2, 'big', False)
+    assert mapped[-4:-1] == buf[-4:-1] == bytes([252, 253, 254])
+
+    arr = mapped.read_array(100, np.uint8)
+    np.testing.assert_array_equal(arr, buf.read_array(100, np.uint8))
+    assert not arr.flags.owndata
+    assert arr.flags.writeable
+
+    # Modifying the data should not alter the file
+    arr[:] = 0
+    assert path.read_bytes() == data
+
+    for b in (mapped, buf):
+        b.truncate(4)
+    assert mapped.check_remains(len(data) - 116) and buf.check_remains(len(data) - 116)
+
+    for b in (mapped, buf):
+        b.append(b'\x01\x02')
+    assert mapped.read() == buf.read()
+
+
+def test_iobuffer_close(tmp_path):
+    """Test that closing a memory-mapped IOBuffer releases the file."""
+    path = tmp_path / 'data.bin'
+    path.write_bytes(bytes(range(256)))
+
+    with open(path, 'rb') as fobj:
+        buf = IOBuffer.fromfile(fobj)
+    mapped = buf._mmap
+    assert buf.read_int(2, 'big', False) == 1
+
+    # Arrays still using the mapped data keep it from being unmapped
+    arr = buf.read_array(4, np.uint8)
+    buf.close()
+    assert not mapped.closed
+    np.testing.assert_array_equal(arr, [2, 3, 4, 5])
+    assert buf.at_end()
+
+    del arr
+    with open(path, 'rb') as fobj:
+        buf = IOBuffer.fromfile(fobj)
+    mapped = buf._mmap
+    buf.close()
+    assert mapped.closed
+    path.unlink()
+
+
+def test_iobuffer_empty_file(tmp_path):
+    """Test that an empty file, which cannot be mapped, is still read."""
+    path = tmp_path / 'empty.bin'
+    path.write_bytes(b'')
+    with open(path, 'rb') as fobj:
+        assert IOBuffer.fromfile(fobj).at_end()
+
+
+@pytest.mark.parametrize('chunk_size', [5, 8192])
+def test_zlib_iter_frames(chunk_size):
+    """Test iterating over the frames of zlib-compressed data."""
+    frames = [bytes(range(i, 256)) * 10 for i in range(5)]
+    data = b''.join(zlib.compress(frame) for frame in frames) + b'not zlib'
+
+    assert list(zlib_iter_frames(data, chunk_size=chunk_size)) == frames + [b'not zlib']
+    assert zlib_decompress_all_frames(bytearray(data)) == b''.join(frames) + b'not zlib'
+
+
+@pytest.mark.parametrize('size_hint', [None, 0, 100, 6358, 10000])
+def test_zlib_decompress_size_hint(size_hint):
+    """Test decompressing all frames into output allocated from a size hint."""
+    frames = [bytes(range(i, 256)) * 5 for i in range(5)]
+    data = b''.join(zlib.compress(frame) for frame in frames) + b'not zlib'
+
+    out = zlib_decompress_all_frames(data, size_hint=size_hint)
+    assert isinstance(out, bytearray)
+    assert out == b''.join(frames) + b'not zlib'
+
+
+def test_zlib_truncated():
+    """Test decompressing zlib data that is cut off in the middle of a frame."""
+    frame = bytes(range(256)) * 10
+    data = zlib.compress(frame) * 2
+    assert zlib_decompress_all_frames(data[:-10]).startswith(frame)